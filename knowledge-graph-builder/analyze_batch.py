@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Phase 1 for many repositories: analyze every repo in a manifest.
+
+Runs RepoAnalyzer on each repository of a manifest in a pool of worker
+processes and writes one analysis per repository, plus a JSONL report with
+the status and timings of each one. A failing repository does not stop the
+batch.
+
+Usage:
+  python analyze_batch.py repos.txt -o results/nightly
+  python analyze_batch.py repos.json -o results/nightly --workers 8 --incremental
+
+Manifest (repos.txt): one repository path or URL per line, optionally
+followed by an artifact name; blank lines and # comments are ignored.
+"""
+
+import argparse
+import logging
+import sys
+
+from analyzer.mirror import DEFAULT_MAX_BYTES as DEFAULT_MIRROR_MAX_BYTES
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(processName)s %(name)s: %(message)s",
+    datefmt="%H:%M:%S",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Analyze every repository in a manifest (Phase 1 only)"
+    )
+    parser.add_argument(
+        "manifest",
+        help="Manifest file: repo paths/URLs, one per line (or a .json list)"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        help="Output directory for per-repo analyses and batch_report.jsonl"
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=None,
+        help="Repositories analyzed at once (default: min(4, CPU count))"
+    )
+    parser.add_argument(
+        "--clone-dir",
+        default=None,
+        help="Directory to clone URLs into (reused across runs). Default: temporary directories"
+    )
+    parser.add_argument(
+        "--keep-clones",
+        action="store_true",
+        help="Keep temporary clones after analysis"
+    )
+    parser.add_argument(
+        "--no-checkout",
+        action="store_true",
+        help="Clone without checking out files; sources are read from git objects"
+    )
+    parser.add_argument(
+        "--blobless",
+        action="store_true",
+        help="Clone without file contents and check out only the paths each analyzer reads"
+    )
+    parser.add_argument(
+        "--mirror-cache",
+        action="store_true",
+        help="Clone through persistent local mirrors, so later runs only fetch new commits"
+    )
+    parser.add_argument(
+        "--mirror-cache-max-gb",
+        type=float,
+        default=DEFAULT_MIRROR_MAX_BYTES / 1024**3,
+        help="Size above which least-recently-used mirrors are evicted (default: %(default)g)"
+    )
+    parser.add_argument(
+        "--max-commits",
+        type=int,
+        default=2000,
+        help="Maximum number of commits to scan per repo (default: 2000)"
+    )
+    parser.add_argument(
+        "--fast-mode",
+        action="store_true",
+        help="Enable fast mode (limited commit scan)"
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Parse processes per repo (default: CPU count / --workers)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse each repo's previous result and only re-scan what changed"
+    )
+    parser.add_argument(
+        "--sectioned",
+        action="store_true",
+        help="Write sectioned directories (header + JSONL sections) instead of JSON files"
+    )
+
+    args = parser.parse_args()
+
+    # Imported after argument parsing: it loads git and every analyzer
+    from analyzer.batch import BatchOptions, load_manifest, run_batch, summarize
+
+    config = {}
+    if args.fast_mode:
+        config["use_fast_mode"] = True
+    if args.max_commits:
+        config["max_commit_scan"] = args.max_commits
+    if args.parse_workers:
+        config["parse_workers"] = args.parse_workers
+    if args.incremental:
+        config["incremental"] = True
+
+    jobs = load_manifest(args.manifest)
+    logger.info(f"Analyzing {len(jobs)} repositories from {args.manifest}")
+
+    def on_result(result):
+        if result.status == "ok":
+            logger.info(f"✅ {result.name}: {result.timings['total']:.1f}s -> {result.artifact}")
+        else:
+            logger.error(f"❌ {result.name}: {result.error}")
+
+    results = run_batch(
+        jobs,
+        BatchOptions(
+            output_dir=args.output,
+            config=config,
+            clone_dir=args.clone_dir,
+            keep_clones=args.keep_clones,
+            no_checkout=args.no_checkout,
+            blobless=args.blobless,
+            mirror_cache=args.mirror_cache,
+            mirror_cache_max_bytes=int(args.mirror_cache_max_gb * 1024**3),
+            sectioned=args.sectioned,
+        ),
+        workers=args.workers,
+        on_result=on_result,
+    )
+
+    failed = [r for r in results if r.status != "ok"]
+    logger.info("\n" + summarize(results))
+    logger.info(f"{len(results) - len(failed)} succeeded, {len(failed)} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,45 @@
 """Phase 1: Repository Analysis - Universal analyzer for all repository types."""
 
-from analyzer.analyzer import RepoAnalyzer
-from analyzer.models import (
-    UniversalRepoAnalysis,
-    ComponentInfo,
-    CommitInfo,
-    DocumentationInfo,
-    RepoType,
-)
-
-__all__ = [
-    "RepoAnalyzer",
-    "UniversalRepoAnalysis",
-    "ComponentInfo",
-    "CommitInfo",
-    "DocumentationInfo",
-    "RepoType",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from analyzer.analyzer import RepoAnalyzer
+    from analyzer.models import (
+        UniversalRepoAnalysis,
+        ComponentInfo,
+        CommitInfo,
+        DocumentationInfo,
+        RepoType,
+    )
+    from analyzer.serialization import read_analysis, write_analysis
+
+# Exported names are imported on first access, so that importing a light
+# submodule (e.g. analyzer.profiling) does not load git and every analyzer
+_EXPORTS = {
+    "RepoAnalyzer": "analyzer.analyzer",
+    "UniversalRepoAnalysis": "analyzer.models",
+    "ComponentInfo": "analyzer.models",
+    "CommitInfo": "analyzer.models",
+    "DocumentationInfo": "analyzer.models",
+    "RepoType": "analyzer.models",
+    "read_analysis": "analyzer.serialization",
+    "write_analysis": "analyzer.serialization",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
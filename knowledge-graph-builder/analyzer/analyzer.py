@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 from typing import Optional
 
 from analyzer.base import BaseRepoAnalyzer
+from analyzer.incremental import (
+    AnalysisStore,
+    StoredAnalysis,
+    config_fingerprint,
+    detect_changes,
+    dirty_paths,
+    repo_key,
+    resolve_head,
+)
 from analyzer.models import UniversalRepoAnalysis
 from analyzer.registry import AnalyzerRegistry
 
 # Auto-import all analyzers to register them
 from analyzer.analyzers import generic, huggingface
 
+logger = logging.getLogger(__name__)
+
 
 class RepoAnalyzer:
     """
@@ -32,6 +44,11 @@ class RepoAnalyzer:
             config={"max_commit_scan": 10000}
         )
         analysis = analyzer.analyze()
+
+        # Incremental: reuse the previous run's result, re-scanning only
+        # files and commits added since its HEAD
+        analyzer = RepoAnalyzer("/path/to/repo", config={"incremental": True})
+        analysis = analyzer.analyze()
     """
 
     def __init__(
@@ -62,7 +79,12 @@ class RepoAnalyzer:
                     f"Available types: {available_types}"
                 )
         else:
-            analyzer_class = AnalyzerRegistry.auto_detect(self.repo_path)
+            options = config or {}
+            analyzer_class = AnalyzerRegistry.auto_detect(
+                self.repo_path,
+                use_cache=options.get("use_detection_cache", True),
+                cache_dir=options.get("cache_dir"),
+            )
 
         self.analyzer: BaseRepoAnalyzer = analyzer_class(self.repo_path, config=config)
 
@@ -73,10 +95,50 @@ class RepoAnalyzer:
         For backward compatibility, the returned object has properties
         that map to the old RepoAnalysis fields (models, key_commits, etc.)
 
+        With ``incremental`` set in the config, the result is persisted with
+        the HEAD SHA it describes (metadata["head_sha"]), and the next run
+        updates it from the changes since that commit instead of starting over.
+
         Returns:
             UniversalRepoAnalysis object with all analysis results
         """
-        return self.analyzer.analyze()
+        if not self.analyzer.config.get("incremental"):
+            return self.analyzer.analyze()
+        return self._analyze_incremental()
+
+    def _analyze_incremental(self) -> UniversalRepoAnalysis:
+        """Update the stored analysis if possible, else analyze fully; then store."""
+        analyzer = self.analyzer
+        name = type(analyzer).__name__
+        fingerprint = config_fingerprint(analyzer.config)
+        store = AnalysisStore.open_default(analyzer.config.get("cache_dir"))
+        head_sha = resolve_head(self.repo_path)
+        key = repo_key(self.repo_path, analyzer.config.get("source_url"))
+
+        analysis = None
+        stored = store.load(key, name, fingerprint) if head_sha else None
+        if stored is not None:
+            changes = detect_changes(self.repo_path, stored, head_sha, analyzer.index)
+            if changes is not None and changes.is_empty:
+                logger.info("No changes since %s, reusing stored analysis", head_sha[:8])
+                analysis = stored.analysis
+            elif changes is not None:
+                try:
+                    analysis = analyzer.update(stored.analysis, changes)
+                except Exception as e:
+                    logger.warning("Incremental update failed (%s), running full analysis", e)
+
+        if analysis is None:
+            analysis = analyzer.analyze()
+        if head_sha:
+            analysis.metadata["head_sha"] = head_sha
+            store.save(
+                key,
+                name,
+                fingerprint,
+                StoredAnalysis(analysis, head_sha, dirty_paths(analyzer.index)),
+            )
+        return analysis
 
     @property
     def repo_type(self) -> str:
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import logging
-import re
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, Optional
 
 from analyzer.base import BaseRepoAnalyzer
+from analyzer.file_index import is_ignored_path
+from analyzer.incremental import RepoChanges
+from analyzer.keywords import KeywordMatcher
 from analyzer.models import (
     CommitInfo,
     ComponentInfo,
@@ -14,10 +17,27 @@ from analyzer.models import (
     RepoType,
     UniversalRepoAnalysis,
 )
+from analyzer.parsing import ParsedSource
 from analyzer.registry import register_analyzer
 
 logger = logging.getLogger(__name__)
 
+# Generic keywords that work for most repositories
+COMMIT_KEYWORDS = [
+    "release",
+    "version",
+    "feature",
+    "fix",
+    "breaking",
+    "deprecate",
+    "add",
+    "feat",
+    "refactor",
+    "optimize",
+    "performance",
+    "security",
+]
+
 
 @register_analyzer
 class GenericAnalyzer(BaseRepoAnalyzer):
@@ -37,8 +57,18 @@ class GenericAnalyzer(BaseRepoAnalyzer):
         return {
             "max_commit_scan": None,  # None = unlimited (use --fast-mode for limited scan)
             "fast_mode_commits": 1000,  # Used when --fast-mode is enabled
+            "commit_keywords": COMMIT_KEYWORDS,  # Tags matched in commit messages
+            "parse_workers": None,  # Source parsing processes (None = CPU count, 1 = serial)
+            "parse_chunk_size": 64,  # Files per parse task
+            "use_parse_cache": True,  # Reuse per-file results keyed by git blob SHA
+            "doc_byte_budget": 32 * 1024 * 1024,  # Doc bytes to summarize (None = no limit)
+            "doc_workers": None,  # Doc reading threads (None = default, 1 = serial)
         }
 
+    def __init__(self, repo_path: str | Path, config: Optional[dict] = None):
+        super().__init__(repo_path, config)
+        self._parsed: Optional[list[ParsedSource]] = None
+
     def analyze(self) -> UniversalRepoAnalysis:
         """Run generic analysis - basic commit and structure info."""
         logger.info("Starting generic analysis of %s", self.repo_path)
@@ -57,6 +87,66 @@ class GenericAnalyzer(BaseRepoAnalyzer):
 
         dependencies = self.scan_dependencies()
 
+        self.flush_parse_cache()
+
+        return UniversalRepoAnalysis(
+            repo_type=self.get_repo_type(),
+            repo_path=str(self.repo_path),
+            components=components,
+            commits=commits,
+            documentation=documentation,
+            structure=structure,
+            dependencies=dependencies,
+            extensions={},
+            metadata={},
+        )
+
+    def update(
+        self,
+        previous: UniversalRepoAnalysis,
+        changes: RepoChanges,
+    ) -> UniversalRepoAnalysis:
+        """
+        Patch a previous generic analysis with the files and commits changed since.
+
+        Only changed Python files are parsed; components and class hierarchy
+        entries of all other files are carried over, in the same file order a
+        full scan produces.
+        """
+        logger.info(
+            "Updating generic analysis of %s: %d changed files, %d new commits",
+            self.repo_path, len(changes.changed_paths), changes.new_commits,
+        )
+        python_files = self._python_files()
+        changed = [f for f in python_files if changes.touches(f)]
+        parsed = {p.path: p for p in self.parse_python_files(changed)}
+
+        # Previous entries grouped by file, minus changed (incl. deleted) files
+        components_by_file: dict[str, list[ComponentInfo]] = {}
+        for component in previous.components:
+            if not changes.touches(component.path):
+                components_by_file.setdefault(component.path, []).append(component)
+        classes_by_file: dict[str, dict] = {}
+        for class_name, info in previous.structure.items():
+            if not changes.touches(info["file"]):
+                classes_by_file.setdefault(info["file"], {})[class_name] = info
+
+        for path, source in parsed.items():
+            components_by_file[path] = self._file_components(source)
+            classes_by_file[path] = self._file_hierarchy(source)
+
+        components = [c for f in python_files for c in components_by_file.get(f, [])]
+        structure: dict = {}
+        for f in python_files:
+            structure.update(classes_by_file.get(f, {}))
+
+        self.reuse_documentation(previous.documentation, changes)
+        documentation = self.scan_documentation()
+        commits = self.update_commits(previous.commits, changes)
+        dependencies = self.scan_dependencies()
+
+        self.flush_parse_cache()
+
         return UniversalRepoAnalysis(
             repo_type=self.get_repo_type(),
             repo_path=str(self.repo_path),
@@ -72,50 +162,33 @@ class GenericAnalyzer(BaseRepoAnalyzer):
     def scan_commits(self) -> list[CommitInfo]:
         """Scan commits with generic keywords."""
         commits = []
-
-        # Generic keywords that work for most repositories
-        keywords = [
-            "release",
-            "version",
-            "feature",
-            "fix",
-            "breaking",
-            "deprecate",
-            "add",
-            "feat",
-            "refactor",
-            "optimize",
-            "performance",
-            "security",
-        ]
-
         try:
-            max_scan = self.config.get("max_commit_scan")  # None = unlimited
-            # If max_scan is None, don't pass max_count (scan all commits)
-            iter_args = {"max_count": max_scan} if max_scan else {}
-            for commit in self.repo.iter_commits(**iter_args):
-                msg = commit.message.strip()
-                msg_lower = msg.lower()
-
-                matched_tags = [kw for kw in keywords if kw in msg_lower]
-
-                # Also match version-like commit messages (v1.0.0, Release 2.0, etc.)
-                if matched_tags or commit.summary.startswith(("v", "V", "Release")):
-                    commits.append(
-                        CommitInfo(
-                            sha=commit.hexsha[:8],
-                            date=commit.committed_datetime.strftime("%Y-%m-%d"),
-                            message=msg.split("\n")[0][:200],
-                            author=str(commit.author),
-                            tags=matched_tags,
-                            metadata={},
-                        )
-                    )
+            for commit in self.iter_key_commits():
+                commits.append(commit)
         except Exception as e:
             logger.warning(f"Error scanning commits: {e}")
 
         return commits
 
+    def iter_key_commits(self, rev: str = "HEAD") -> Iterator[CommitInfo]:
+        """Yield commits matching generic keywords, streaming the commit log."""
+        matcher = KeywordMatcher(self.config["commit_keywords"])
+
+        for entry in self.iter_commit_log(rev):
+            msg = entry.message.strip()
+            matched_tags = matcher.find_all(msg)
+
+            # Also match version-like commit messages (v1.0.0, Release 2.0, etc.)
+            if matched_tags or entry.summary.startswith(("v", "V", "Release")):
+                yield CommitInfo(
+                    sha=entry.sha[:8],
+                    date=entry.date,
+                    message=msg.split("\n")[0][:200],
+                    author=entry.author,
+                    tags=matched_tags,
+                    metadata={},
+                )
+
     def scan_structure(self) -> dict:
         """
         Extract class hierarchy from Python source files.
@@ -127,41 +200,8 @@ class GenericAnalyzer(BaseRepoAnalyzer):
         hierarchy: dict = {}
 
         try:
-            python_files = [
-                f for f in self.repo_path.rglob("*.py")
-                if not any(part.startswith(".") for part in f.parts)
-                and not any(
-                    part in {"__pycache__", "venv", "env", "node_modules", "build", "dist"}
-                    for part in f.parts
-                )
-            ]
-
-            # Limit to avoid scanning too many files in large repos
-            max_files = 50
-            if len(python_files) > max_files:
-                logger.info("Found %d Python files, limiting structure scan to %d", len(python_files), max_files)
-                python_files = sorted(python_files)[:max_files]
-
-            for py_file in python_files:
-                try:
-                    content = py_file.read_text(errors="replace")
-                    relative_path = str(py_file.relative_to(self.repo_path))
-
-                    for match in re.finditer(
-                        r"^class\s+(\w+)\s*\(([^)]+)\)\s*:", content, re.MULTILINE
-                    ):
-                        class_name = match.group(1)
-                        bases = [
-                            b.strip() for b in match.group(2).split(",")
-                            if b.strip() and b.strip() not in {"object", "ABC", "Enum"}
-                        ]
-                        hierarchy[class_name] = {
-                            "inherits": bases,
-                            "file": relative_path,
-                        }
-                except Exception as e:
-                    logger.debug("Could not parse %s: %s", py_file, e)
-
+            for parsed in self._parsed_python_files():
+                hierarchy.update(self._file_hierarchy(parsed))
         except Exception as e:
             logger.warning("Error scanning structure: %s", e)
 
@@ -176,48 +216,8 @@ class GenericAnalyzer(BaseRepoAnalyzer):
         components = []
 
         try:
-            # Scan Python files for classes and functions
-            python_files = list(self.repo_path.rglob("*.py"))
-
-            # Limit to avoid scanning too many files
-            max_files = 100
-            if len(python_files) > max_files:
-                logger.info(f"Found {len(python_files)} Python files, limiting to {max_files}")
-                python_files = python_files[:max_files]
-
-            for py_file in python_files:
-                # Skip hidden directories and common ignore patterns
-                if any(part.startswith(".") for part in py_file.parts):
-                    continue
-                if any(part in ["__pycache__", "venv", "env", "node_modules"] for part in py_file.parts):
-                    continue
-
-                relative_path = str(py_file.relative_to(self.repo_path))
-
-                # Extract classes
-                classes = self._extract_class_names(py_file)
-                for class_name in classes:
-                    components.append(
-                        ComponentInfo(
-                            name=class_name,
-                            path=relative_path,
-                            type="class",
-                            metadata={},
-                        )
-                    )
-
-                # Extract top-level functions
-                functions = self._extract_function_names(py_file)
-                for func_name in functions:
-                    components.append(
-                        ComponentInfo(
-                            name=func_name,
-                            path=relative_path,
-                            type="function",
-                            metadata={},
-                        )
-                    )
-
+            for parsed in self._parsed_python_files():
+                components.extend(self._file_components(parsed))
         except Exception as e:
             logger.warning(f"Error scanning components: {e}")
 
@@ -235,62 +235,46 @@ class GenericAnalyzer(BaseRepoAnalyzer):
             # 1. Look for README files in root
             readme_patterns = ["README.md", "README.rst", "README.txt", "README"]
             for pattern in readme_patterns:
-                readme_path = self.repo_path / pattern
-                if readme_path.exists():
+                if self.index.is_file(pattern):
                     try:
-                        content = readme_path.read_text(errors="replace")
-                        summary = self._extract_doc_summary(content)
+                        summary, length = self.summarize_doc(pattern)
                         documentation.append(
                             DocumentationInfo(
                                 path=pattern,
                                 title="README",
                                 summary=summary,
                                 category="guide",
-                                metadata={"length": len(content)},
+                                metadata={"length_bytes": length},
                             )
                         )
                         break  # Only add one README
                     except Exception as e:
-                        logger.debug(f"Could not read {readme_path}: {e}")
+                        logger.debug(f"Could not read {pattern}: {e}")
 
             # 2. Look for docs directory
             docs_dirs = ["docs", "documentation", "doc"]
             for docs_dir_name in docs_dirs:
-                docs_dir = self.repo_path / docs_dir_name
-                if docs_dir.exists() and docs_dir.is_dir():
-                    # Scan markdown files in docs
-                    md_files = list(docs_dir.rglob("*.md"))
-
-                    # Limit to avoid too many files
-                    max_docs = 20
-                    if len(md_files) > max_docs:
-                        logger.info(f"Found {len(md_files)} doc files, limiting to {max_docs}")
-                        md_files = sorted(md_files)[:max_docs]
-
-                    for doc_file in md_files:
-                        try:
-                            content = doc_file.read_text(errors="replace")
-                            summary = self._extract_doc_summary(content)
-                            relative_path = str(doc_file.relative_to(self.repo_path))
-
-                            # Determine category from path
-                            category = "guide"
-                            if "api" in relative_path.lower():
-                                category = "api"
-                            elif "tutorial" in relative_path.lower():
-                                category = "tutorial"
-
-                            documentation.append(
-                                DocumentationInfo(
-                                    path=relative_path,
-                                    title=doc_file.stem,
-                                    summary=summary,
-                                    category=category,
-                                    metadata={"length": len(content)},
-                                )
+                if self.index.is_dir(docs_dir_name):
+                    # Scan markdown files in docs (bounded by doc_byte_budget)
+                    md_files = self.index.glob("*.md", under=docs_dir_name)
+
+                    for relative_path, (summary, length) in self.summarize_docs(md_files).items():
+                        # Determine category from path
+                        category = "guide"
+                        if "api" in relative_path.lower():
+                            category = "api"
+                        elif "tutorial" in relative_path.lower():
+                            category = "tutorial"
+
+                        documentation.append(
+                            DocumentationInfo(
+                                path=relative_path,
+                                title=PurePosixPath(relative_path).stem,
+                                summary=summary,
+                                category=category,
+                                metadata={"length_bytes": length},
                             )
-                        except Exception as e:
-                            logger.debug(f"Could not read doc {doc_file}: {e}")
+                        )
 
                     break  # Only scan first matching docs directory
 
@@ -301,39 +285,50 @@ class GenericAnalyzer(BaseRepoAnalyzer):
 
     # Helper methods
 
-    def _extract_class_names(self, filepath: Path) -> list[str]:
-        """Extract class names from a Python file."""
-        classes = []
-        try:
-            content = filepath.read_text(errors="replace")
-            for match in re.finditer(r"^class\s+(\w+)\s*[\(:]", content, re.MULTILINE):
-                classes.append(match.group(1))
-        except Exception as e:
-            logger.debug(f"Could not read {filepath}: {e}")
-        return classes
+    def _python_files(self) -> list[str]:
+        """Return indexed Python files outside hidden and ignored directories."""
+        return [f for f in self.index.glob("*.py") if not is_ignored_path(f)]
 
-    def _extract_function_names(self, filepath: Path) -> list[str]:
-        """Extract top-level function names from a Python file."""
-        functions = []
-        try:
-            content = filepath.read_text(errors="replace")
-            # Match top-level functions (no indentation before 'def')
-            for match in re.finditer(r"^def\s+(\w+)\s*\(", content, re.MULTILINE):
-                func_name = match.group(1)
-                # Skip private functions (starting with _)
-                if not func_name.startswith("_"):
-                    functions.append(func_name)
-        except Exception as e:
-            logger.debug(f"Could not read {filepath}: {e}")
-        return functions
+    def _parsed_python_files(self) -> list[ParsedSource]:
+        """
+        Parse every Python file once, shared by scan_components and scan_structure.
+
+        Unchanged files come from the parse cache; the rest are parsed over a
+        process pool, so the whole repository is covered instead of a sample.
+        """
+        if self._parsed is None:
+            python_files = self._python_files()
+            logger.info("Parsing %d Python files", len(python_files))
+            self._parsed = self.parse_python_files(python_files)
+        return self._parsed
+
+    @staticmethod
+    def _file_components(parsed: ParsedSource) -> list[ComponentInfo]:
+        """Components (classes, then public functions) defined in one file."""
+        components = [
+            ComponentInfo(name=class_name, path=parsed.path, type="class", metadata={})
+            for class_name in parsed.classes
+        ]
+        components.extend(
+            ComponentInfo(name=func_name, path=parsed.path, type="function", metadata={})
+            for func_name in parsed.functions
+        )
+        return components
+
+    @staticmethod
+    def _file_hierarchy(parsed: ParsedSource) -> dict:
+        """Class hierarchy entries for the classes with bases in one file."""
+        return {
+            class_name: {"inherits": bases, "file": parsed.path}
+            for class_name, bases in parsed.bases.items()
+        }
 
-    def _extract_doc_summary(self, content: str) -> str:
+    def _summarize_lines(self, lines: Iterable[str]) -> str:
         """
         Extract the first meaningful paragraph from a markdown doc.
 
         Skips headers, frontmatter, and extracts the first substantial paragraph.
         """
-        lines = content.split("\n")
         in_content = False
         summary_lines = []
 
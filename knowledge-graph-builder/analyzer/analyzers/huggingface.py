@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import logging
-import re
-from pathlib import Path
-from typing import Optional
-
-from analyzer.base import BaseRepoAnalyzer
+import posixpath
+import subprocess
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, Optional
+
+from analyzer.base import DEPENDENCY_FILES, BaseRepoAnalyzer
+from analyzer.file_index import RepoFileIndex
+from analyzer.git_log import first_commit_dates
+from analyzer.git_objects import changed_from_tree, subtree_shas
+from analyzer.incremental import RepoChanges
+from analyzer.keywords import KeywordMatcher
 from analyzer.models import (
     CommitInfo,
     ComponentInfo,
@@ -19,6 +25,9 @@ from analyzer.registry import register_analyzer
 
 logger = logging.getLogger(__name__)
 
+# Parse cache kind of per-model-directory records (bump when the layout changes)
+MODEL_RECORD_KIND = "hf_model_dir:1"
+
 # Keywords indicating important architectural commits
 EVOLUTION_KEYWORDS = [
     "add model",
@@ -55,17 +64,18 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
     def can_handle(cls, repo_path: Path) -> tuple[bool, float]:
         """Detect HuggingFace repo with high confidence."""
         confidence = 0.0
+        index = RepoFileIndex.for_path(repo_path)
 
         # Strong indicator: src/transformers directory exists
-        if (repo_path / "src" / "transformers").exists():
+        if index.is_dir("src/transformers"):
             confidence += 0.6
 
         # Additional indicator: models directory exists
-        if (repo_path / "src" / "transformers" / "models").exists():
+        if index.is_dir("src/transformers/models"):
             confidence += 0.3
 
         # Check for transformers-specific files
-        if (repo_path / "src" / "transformers" / "modeling_utils.py").exists():
+        if index.is_file("src/transformers/modeling_utils.py"):
             confidence += 0.1
 
         return (confidence > 0.5, confidence)
@@ -79,8 +89,28 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
             "max_commit_scan": None,  # None = unlimited (use --fast-mode for limited scan)
             "fast_mode_commits": 5000,  # Used when --fast-mode is enabled
             "evolution_keywords": EVOLUTION_KEYWORDS,
+            "parse_workers": None,  # Source parsing processes (None = CPU count, 1 = serial)
+            "parse_chunk_size": 64,  # Files per parse task
+            "use_parse_cache": True,  # Reuse per-file results keyed by git blob SHA
+            "doc_byte_budget": 32 * 1024 * 1024,  # Doc bytes to summarize (None = no limit)
+            "doc_workers": None,  # Doc reading threads (None = default, 1 = serial)
         }
 
+    @classmethod
+    def get_sparse_paths(cls, config: Optional[dict] = None) -> Optional[list[str]]:
+        """Model sources, modeling_utils, model docs and dependency manifests."""
+        config = {**cls.get_default_config(), **(config or {})}
+        return [
+            config["models_path"],
+            config["modeling_utils_path"],
+            config["docs_path"],
+            *DEPENDENCY_FILES,
+        ]
+
+    def __init__(self, repo_path: str | Path, config: Optional[dict] = None):
+        super().__init__(repo_path, config)
+        self._model_records_by_dir: Optional[dict[str, dict]] = None
+
     def analyze(self) -> UniversalRepoAnalysis:
         """Run HuggingFace-specific analysis."""
         logger.info("Starting HuggingFace analysis of %s", self.repo_path)
@@ -109,6 +139,59 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
         dependencies = self.scan_dependencies()
         logger.info("Found %d packages in dependencies", len(dependencies.get("raw", [])))
 
+        self.flush_parse_cache()
+
+        return UniversalRepoAnalysis(
+            repo_type=self.get_repo_type(),
+            repo_path=str(self.repo_path),
+            components=components,
+            commits=commits,
+            documentation=documentation,
+            structure=structure,
+            dependencies=dependencies,
+            extensions={
+                "models": models,  # HF-specific extension
+            },
+            metadata={},
+        )
+
+    def update(
+        self,
+        previous: UniversalRepoAnalysis,
+        changes: RepoChanges,
+    ) -> UniversalRepoAnalysis:
+        """
+        Patch a previous HuggingFace analysis with the changes since.
+
+        Unchanged model directories keep their model info, and scans whose
+        inputs (models, modeling_utils.py, docs) were not touched are carried
+        over as they are.
+        """
+        logger.info(
+            "Updating HuggingFace analysis of %s: %d changed files, %d new commits",
+            self.repo_path, len(changes.changed_paths), changes.new_commits,
+        )
+        models_path = self.config["models_path"]
+        code_changed = (
+            changes.touches(models_path)
+            or changes.touches(self.config["modeling_utils_path"])
+        )
+
+        models = self._scan_models(previous.extensions.get("models", []), changes)
+        components = self.scan_components() if code_changed else previous.components
+        commits = self.update_commits(previous.commits, changes)
+
+        if changes.touches(self.config["docs_path"]):
+            self.reuse_documentation(previous.documentation, changes)
+            documentation = self.scan_documentation()
+        else:
+            documentation = previous.documentation
+
+        structure = self.scan_structure() if code_changed else previous.structure
+        dependencies = self.scan_dependencies()
+
+        self.flush_parse_cache()
+
         return UniversalRepoAnalysis(
             repo_type=self.get_repo_type(),
             repo_path=str(self.repo_path),
@@ -123,44 +206,61 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
             metadata={},
         )
 
-    def _scan_models(self) -> list[dict]:
-        """Scan src/transformers/models/*/ for model directories."""
-        models_dir = self.repo_path / self.config["models_path"]
-        if not models_dir.exists():
-            logger.warning("Models directory not found: %s", models_dir)
+    def _scan_models(
+        self,
+        previous: Optional[list[dict]] = None,
+        changes: Optional[RepoChanges] = None,
+    ) -> list[dict]:
+        """
+        Scan src/transformers/models/*/ for model directories.
+
+        Args:
+            previous: Model infos of a previous analysis (incremental update)
+            changes: Changes since that analysis; untouched directories reuse
+                their previous info without any file access
+        """
+        models_path = self.config["models_path"]
+        if not self.index.is_dir(models_path):
+            logger.warning("Models directory not found: %s", self.repo_path / models_path)
             return []
 
+        model_dirs = self._model_dirs()
+        previous_by_dir = {m["path"]: m for m in previous or []}
+        reused = {
+            d: previous_by_dir[d] for d in model_dirs
+            if changes is not None and d in previous_by_dir and not changes.touches(d)
+        }
+        scan_dirs = [d for d in model_dirs if d not in reused]
+        records = self._model_records() if scan_dirs else {}
+
+        # First commit date of every model directory from one history pass.
+        # Directories known before keep their date; new ones first appear in
+        # the new commits.
+        first_dates = {
+            d: m["first_commit_date"] for d, m in previous_by_dir.items()
+            if m.get("first_commit_date")
+        }
+        if any(d not in first_dates for d in scan_dirs):
+            rev = changes.commit_range if changes is not None else "HEAD"
+            for d, date in self._first_commit_dates(models_path, rev).items():
+                first_dates.setdefault(d, date)
+
         models = []
-        for model_dir in sorted(models_dir.iterdir()):
-            if not model_dir.is_dir() or model_dir.name.startswith("_"):
+        for model_dir in model_dirs:
+            if model_dir in reused:
+                models.append(reused[model_dir])
                 continue
 
-            model_info = {
-                "name": model_dir.name,
-                "path": str(model_dir.relative_to(self.repo_path)),
-                "classes": [],
-                "first_commit_date": None,
-                "has_modeling": False,
-                "has_config": False,
-                "has_tokenizer": False,
-            }
-
-            # Check for key files
-            for f in model_dir.iterdir():
-                if f.name.startswith("modeling_"):
-                    model_info["has_modeling"] = True
-                    model_info["classes"].extend(self._extract_class_names(f))
-                elif f.name.startswith("configuration_"):
-                    model_info["has_config"] = True
-                elif "tokeniz" in f.name:
-                    model_info["has_tokenizer"] = True
-
-            # Get first commit date for the model directory
-            model_info["first_commit_date"] = self._get_first_commit_date(
-                str(model_dir.relative_to(self.repo_path))
-            )
-
-            models.append(model_info)
+            record = records[model_dir]
+            models.append({
+                "name": posixpath.basename(model_dir),
+                "path": model_dir,
+                "classes": list(record["classes"]),
+                "first_commit_date": first_dates.get(model_dir),
+                "has_modeling": record["has_modeling"],
+                "has_config": record["has_config"],
+                "has_tokenizer": record["has_tokenizer"],
+            })
 
         return models
 
@@ -169,8 +269,8 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
         components = []
 
         # Scan modeling_utils.py for base classes
-        modeling_utils = self.repo_path / self.config["modeling_utils_path"]
-        if modeling_utils.exists():
+        modeling_utils = self.config["modeling_utils_path"]
+        if self.index.is_file(modeling_utils):
             classes = self._extract_class_names(modeling_utils)
             for cls_name in classes:
                 components.append(
@@ -183,20 +283,20 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
                 )
 
         # Scan for attention implementations
-        attn_dir = self.repo_path / self.config["models_path"]
-        if attn_dir.exists():
+        attn_dir = self.config["models_path"]
+        if self.index.is_dir(attn_dir):
             attn_classes = set()
-            for modeling_file in attn_dir.rglob("modeling_*.py"):
-                try:
-                    content = modeling_file.read_text(errors="replace")
-                    for match in re.finditer(
-                        r"^class\s+(\w*(?:Attention|SelfAttention|MultiHeadAttention)\w*)\s*[\(:]",
-                        content,
-                        re.MULTILINE,
-                    ):
-                        attn_classes.add(match.group(1))
-                except Exception:
-                    continue
+            records = self._model_records()
+            for record in records.values():
+                attn_classes.update(record["attention_classes"])
+
+            # Modeling files outside model directories (e.g. _private ones)
+            other_files = [
+                f for f in self.index.glob("modeling_*.py", under=attn_dir)
+                if self._model_dir_of(f) not in records
+            ]
+            for parsed in self.parse_python_files(other_files):
+                attn_classes.update(_attention_classes(parsed.classes))
 
             # Report a summary rather than every individual class
             if attn_classes:
@@ -218,57 +318,48 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
     def scan_commits(self) -> list[CommitInfo]:
         """Scan evolution commits - adapted from original."""
         commits = []
-        keywords = self.config["evolution_keywords"]
-        max_scan = self.config.get("max_commit_scan")  # None = unlimited
-
         try:
-            # If max_scan is None, don't pass max_count (scan all commits)
-            iter_args = {"max_count": max_scan} if max_scan else {}
-            for commit in self.repo.iter_commits(**iter_args):
-                msg_lower = commit.message.lower()
-                for keyword in keywords:
-                    if keyword in msg_lower:
-                        commits.append(
-                            CommitInfo(
-                                sha=commit.hexsha[:8],
-                                date=commit.committed_datetime.strftime("%Y-%m-%d"),
-                                message=commit.message.strip().split("\n")[0][:200],
-                                author=str(commit.author),
-                                tags=[keyword],
-                                metadata={"keyword": keyword},
-                            )
-                        )
-                        break  # one keyword match per commit is enough
+            for commit in self.iter_key_commits():
+                commits.append(commit)
         except Exception as e:
             logger.warning(f"Error scanning commits: {e}")
 
         return commits
 
+    def iter_key_commits(self, rev: str = "HEAD") -> Iterator[CommitInfo]:
+        """Yield commits mentioning an evolution keyword, streaming the commit log."""
+        matcher = KeywordMatcher(self.config["evolution_keywords"])
+        for entry in self.iter_commit_log(rev):
+            # One tag per commit: the first matching keyword in config order
+            keyword = matcher.first(entry.message)
+            if keyword is not None:
+                yield CommitInfo(
+                    sha=entry.sha[:8],
+                    date=entry.date,
+                    message=entry.message.strip().split("\n")[0][:200],
+                    author=entry.author,
+                    tags=[keyword],
+                    metadata={"keyword": keyword},
+                )
+
     def scan_documentation(self) -> list[DocumentationInfo]:
         """Scan model documentation - adapted from original."""
-        docs_dir = self.repo_path / self.config["docs_path"]
-        if not docs_dir.exists():
-            logger.warning("Docs directory not found: %s", docs_dir)
+        docs_dir = self.config["docs_path"]
+        if not self.index.is_dir(docs_dir):
+            logger.warning("Docs directory not found: %s", self.repo_path / docs_dir)
             return []
 
-        documentation = []
-        for doc_file in sorted(docs_dir.glob("*.md")):
-            try:
-                content = doc_file.read_text(errors="replace")
-                summary = self._extract_doc_summary(content)
-                documentation.append(
-                    DocumentationInfo(
-                        path=str(doc_file.relative_to(self.repo_path)),
-                        title=doc_file.stem,
-                        summary=summary,
-                        category="model",
-                        metadata={"length": len(content)},
-                    )
-                )
-            except Exception as e:
-                logger.debug(f"Could not read doc {doc_file}: {e}")
-
-        return documentation
+        doc_files = self.index.glob("*.md", under=docs_dir, recursive=False)
+        return [
+            DocumentationInfo(
+                path=doc_file,
+                title=PurePosixPath(doc_file).stem,
+                summary=summary,
+                category="model",
+                metadata={"length_bytes": length},
+            )
+            for doc_file, (summary, length) in self.summarize_docs(doc_files).items()
+        ]
 
     def scan_structure(self) -> dict:
         """
@@ -281,69 +372,173 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
         hierarchy: dict = {}
 
         # Always include the base classes file
-        target_files = [self.config["modeling_utils_path"]]
-
-        # Add one modeling file per model, limited to first 10 alphabetically
-        models_dir = self.repo_path / self.config["models_path"]
-        if models_dir.exists():
-            sample_dirs = sorted(
-                d for d in models_dir.iterdir()
-                if d.is_dir() and not d.name.startswith("_")
-            )[:10]
-            for model_dir in sample_dirs:
-                for f in sorted(model_dir.glob("modeling_*.py")):
-                    target_files.append(str(f.relative_to(self.repo_path)))
-                    break  # one file per model
-
-        for relative_path in target_files:
-            filepath = self.repo_path / relative_path
-            if not filepath.exists():
-                continue
-            try:
-                content = filepath.read_text(errors="replace")
-                for match in re.finditer(
-                    r"^class\s+(\w+)\s*\(([^)]+)\)\s*:", content, re.MULTILINE
-                ):
-                    class_name = match.group(1)
-                    bases = [
-                        b.strip() for b in match.group(2).split(",")
-                        if b.strip() and b.strip() not in {"object", "ABC", "Enum"}
-                    ]
+        modeling_utils = self.config["modeling_utils_path"]
+        if self.index.is_file(modeling_utils):
+            for parsed in self.parse_python_files([modeling_utils]):
+                for class_name, bases in parsed.bases.items():
                     hierarchy[class_name] = {
                         "inherits": bases,
-                        "file": relative_path,
+                        "file": parsed.path,
                     }
-            except Exception as e:
-                logger.debug("Could not parse %s: %s", filepath, e)
+
+        # Add one modeling file per model, limited to first 10 alphabetically
+        records = self._model_records()
+        for model_dir in self._model_dirs()[:10]:
+            sample = records[model_dir]["structure"]
+            if sample is None:
+                continue
+            for class_name, bases in sample["bases"].items():
+                hierarchy[class_name] = {
+                    "inherits": bases,
+                    "file": f"{model_dir}/{sample['file']}",
+                }
 
         return hierarchy
 
     # Helper methods (from original implementation)
 
-    def _extract_class_names(self, filepath: Path) -> list[str]:
-        """Extract class names from a Python file."""
-        classes = []
+    def _model_dirs(self) -> list[str]:
+        """Return model directories under models_path (skipping _private ones)."""
+        return [
+            d for d in self.index.iterdir(self.config["models_path"])
+            if self.index.is_dir(d) and not posixpath.basename(d).startswith("_")
+        ]
+
+    def _model_dir_of(self, relative_path: str) -> str:
+        """Return the model directory a path under models_path belongs to."""
+        models_path = self.config["models_path"].strip("/")
+        name = relative_path[len(models_path) + 1:].split("/", 1)[0]
+        return f"{models_path}/{name}"
+
+    def _model_records(self) -> dict[str, dict]:
+        """
+        Per-model-directory scan results, shared by models, components and structure.
+
+        Each record holds what the scans need from one model directory (model
+        classes, key-file flags, attention classes, a sample class hierarchy).
+        Records are stored in the parse cache keyed by the directory's git tree
+        SHA, so a model directory that is byte-identical to one seen before
+        (e.g. across transformers releases) costs one lookup and no file reads.
+        Directories with uncommitted changes are always scanned.
+        """
+        if self._model_records_by_dir is not None:
+            return self._model_records_by_dir
+
+        model_dirs = self._model_dirs()
+        tree_shas = self._committed_tree_shas() if self.parse_cache else {}
+
+        records: dict[str, dict] = {}
+        for model_dir in model_dirs:
+            tree_sha = tree_shas.get(model_dir)
+            if tree_sha:
+                cached = self.parse_cache.get(MODEL_RECORD_KIND, tree_sha)
+                if cached is not None:
+                    records[model_dir] = cached
+
+        missing = [d for d in model_dirs if d not in records]
+        if missing:
+            logger.info(
+                "Scanning %d model directories (%d unchanged)",
+                len(missing), len(model_dirs) - len(missing),
+            )
+            for model_dir, record in self._build_model_records(missing).items():
+                records[model_dir] = record
+                if self.parse_cache:
+                    self.parse_cache.put(MODEL_RECORD_KIND, tree_shas.get(model_dir), record)
+
+        self._model_records_by_dir = {d: records[d] for d in model_dirs}
+        return self._model_records_by_dir
+
+    def _committed_tree_shas(self) -> dict[str, str]:
+        """Tree SHA of each model directory whose content matches HEAD."""
+        models_path = self.config["models_path"].strip("/")
         try:
-            content = filepath.read_text(errors="replace")
-            for match in re.finditer(r"^class\s+(\w+)\s*[\(:]", content, re.MULTILINE):
-                classes.append(match.group(1))
-        except Exception as e:
-            logger.debug("Could not read %s: %s", filepath, e)
-        return classes
+            tree_shas = subtree_shas(self.repo_path, models_path)
+            if self.index.reads_objects:
+                return tree_shas
+            # Staged, modified, deleted or untracked files make HEAD's tree stale
+            dirty = set(changed_from_tree(self.repo_path, models_path))
+            dirty.update(
+                f for f in self.index.glob("*", under=models_path)
+                if self.index.blob_sha(f) is None
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("Could not read model tree SHAs: %s", e)
+            return {}
+        for path in dirty:
+            tree_shas.pop(self._model_dir_of(path), None)
+        return tree_shas
+
+    def _build_model_records(self, model_dirs: list[str]) -> dict[str, dict]:
+        """Scan model directories from their files (one batched parse)."""
+        listings = {d: self.index.iterdir(d) for d in model_dirs}
+        modeling = {
+            d: [
+                f for f in listings[d]
+                if posixpath.basename(f).startswith("modeling_") and self.index.is_file(f)
+            ]
+            for d in model_dirs
+        }
+        # Attention classes come from every modeling_*.py below the directory
+        nested = {d: self.index.glob("modeling_*.py", under=d) for d in model_dirs}
+        samples = {
+            d: next(iter(self.index.glob("modeling_*.py", under=d, recursive=False)), None)
+            for d in model_dirs
+        }
+
+        to_parse = sorted({f for d in model_dirs for f in (*modeling[d], *nested[d])})
+        parsed = {p.path: p for p in self.parse_python_files(to_parse)}
 
-    def _get_first_commit_date(self, path: str) -> Optional[str]:
-        """Get the date of the first commit that touched a path."""
+        records = {}
+        for model_dir in model_dirs:
+            record = {
+                "classes": [],
+                "has_modeling": False,
+                "has_config": False,
+                "has_tokenizer": False,
+                "attention_classes": sorted({
+                    c for f in nested[model_dir] if f in parsed
+                    for c in _attention_classes(parsed[f].classes)
+                }),
+                "structure": None,
+            }
+
+            # Check for key files
+            for f in listings[model_dir]:
+                name = posixpath.basename(f)
+                if name.startswith("modeling_"):
+                    record["has_modeling"] = True
+                    if f in parsed:
+                        record["classes"].extend(parsed[f].classes)
+                elif name.startswith("configuration_"):
+                    record["has_config"] = True
+                elif "tokeniz" in name:
+                    record["has_tokenizer"] = True
+
+            sample = samples[model_dir]
+            if sample in parsed:
+                record["structure"] = {
+                    "file": posixpath.basename(sample),
+                    "bases": parsed[sample].bases,
+                }
+            records[model_dir] = record
+        return records
+
+    def _extract_class_names(self, relative_path: str) -> list[str]:
+        """Extract class names from a Python file (via the parse cache)."""
+        parsed = self.parse_python_files([relative_path])
+        return parsed[0].classes if parsed else []
+
+    def _first_commit_dates(self, models_path: str, rev: str = "HEAD") -> dict[str, str]:
+        """Get the date of the first commit that touched each model directory."""
         try:
-            commits = list(self.repo.iter_commits(paths=path, max_count=1, reverse=True))
-            if commits:
-                return commits[0].committed_datetime.strftime("%Y-%m-%d")
+            return first_commit_dates(self.repo_path, models_path, rev=rev)
         except Exception as e:
-            logger.debug("Could not get first commit for %s: %s", path, e)
-        return None
+            logger.debug("Could not get first commit dates under %s: %s", models_path, e)
+            return {}
 
-    def _extract_doc_summary(self, content: str) -> str:
+    def _summarize_lines(self, lines: Iterable[str]) -> str:
         """Extract the first meaningful paragraph from a markdown doc."""
-        lines = content.split("\n")
         in_content = False
         summary_lines = []
 
@@ -365,3 +560,8 @@ class HuggingFaceAnalyzer(BaseRepoAnalyzer):
                 break  # end of first paragraph
 
         return " ".join(summary_lines)[:500]
+
+
+def _attention_classes(class_names: list[str]) -> list[str]:
+    """Same match as ^class \\w*Attention\\w*[(:] on the source."""
+    return [c for c in class_names if "Attention" in c]
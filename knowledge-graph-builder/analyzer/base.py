@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import io
 import json
 import logging
 import re
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
 
 from git import InvalidGitRepositoryError, Repo
 
+from analyzer.file_index import RepoFileIndex
+from analyzer.git_log import LogEntry, iter_log, rev_list
+from analyzer.incremental import RepoChanges
+from analyzer.parse_cache import DEFAULT_MAX_BYTES, ParseCache
+from analyzer.parsing import ParsedSource, parse_python_files
 from analyzer.models import (
     CommitInfo,
     ComponentInfo,
@@ -21,6 +28,21 @@ from analyzer.models import (
 
 logger = logging.getLogger(__name__)
 
+# Documentation is summarized from at most this many leading bytes per file
+DOC_HEAD_BYTES = 64 * 1024
+
+# Threads reading documentation files (config: doc_workers)
+DEFAULT_DOC_WORKERS = 8
+
+# Dependency manifests read by scan_dependencies(), in order
+DEPENDENCY_FILES = (
+    "requirements.txt",
+    "requirements-dev.txt",
+    "pyproject.toml",
+    "setup.py",
+    "package.json",
+)
+
 # Package categorization sets for scan_dependencies()
 _ML_FRAMEWORKS = frozenset({
     "torch", "pytorch", "tensorflow", "jax", "flax",
@@ -71,6 +93,23 @@ class BaseRepoAnalyzer(ABC):
         except InvalidGitRepositoryError:
             raise ValueError(f"{repo_path} is not a valid git repository")
 
+        # One file listing shared by every scan (and by detection). Without a
+        # checkout (bare mirror, --no-checkout clone) it reads git objects.
+        self.index = RepoFileIndex.for_path(
+            self.repo_path, self.config.get("file_source", "auto")
+        )
+
+        # Doc path -> (summary, length) carried over by update()
+        self._reused_docs: dict[str, tuple[str, int]] = {}
+
+        # Per-file extraction results persisted across runs, keyed by blob SHA
+        self.parse_cache: Optional[ParseCache] = None
+        if self.config.get("use_parse_cache", True):
+            self.parse_cache = ParseCache.open_default(
+                self.config.get("cache_dir"),
+                max_bytes=self.config.get("parse_cache_max_bytes", DEFAULT_MAX_BYTES),
+            )
+
     @classmethod
     @abstractmethod
     def get_repo_type(cls) -> RepoType:
@@ -89,7 +128,8 @@ class BaseRepoAnalyzer(ABC):
         Check if this analyzer can handle the given repo.
 
         This method uses heuristics to detect if the repository matches
-        the type this analyzer is designed for.
+        the type this analyzer is designed for. Implementations should query
+        RepoFileIndex.for_path(repo_path) rather than walking the tree.
 
         Args:
             repo_path: Path to the repository
@@ -113,6 +153,23 @@ class BaseRepoAnalyzer(ABC):
         """
         return {}
 
+    @classmethod
+    def get_sparse_paths(cls, config: Optional[dict] = None) -> Optional[list[str]]:
+        """
+        Return the paths analyze() reads, for sparse checkouts.
+
+        Clones made for this analyzer only check out these files and
+        directories (see analyzer.clone). Subclasses that read a known subset
+        of the tree override this; the default needs the whole tree.
+
+        Args:
+            config: Analyzer config overrides (merged over get_default_config())
+
+        Returns:
+            Paths relative to the repository root, or None for everything
+        """
+        return None
+
     @abstractmethod
     def analyze(self) -> UniversalRepoAnalysis:
         """
@@ -128,6 +185,27 @@ class BaseRepoAnalyzer(ABC):
 
     # Optional hooks with default implementations
 
+    def update(
+        self,
+        previous: UniversalRepoAnalysis,
+        changes: RepoChanges,
+    ) -> UniversalRepoAnalysis:
+        """
+        Bring a previous analysis of this repository up to date.
+
+        Called by RepoAnalyzer in incremental mode instead of analyze().
+        Subclasses override this to re-scan only what ``changes`` touches and
+        patch the rest of ``previous``; the default runs a full analysis.
+
+        Args:
+            previous: Analysis of the repository at changes.since_sha
+            changes: Files and commits added since then
+
+        Returns:
+            UniversalRepoAnalysis for the current state
+        """
+        return self.analyze()
+
     def scan_components(self) -> list[ComponentInfo]:
         """
         Scan repository for components (classes, functions, modules).
@@ -185,19 +263,18 @@ class BaseRepoAnalyzer(ABC):
         raw_packages: list[str] = []
         source_files: list[str] = []
 
-        candidates = [
-            ("requirements.txt", self._parse_requirements_file),
-            ("requirements-dev.txt", self._parse_requirements_file),
-            ("pyproject.toml", self._parse_pyproject_toml),
-            ("setup.py", self._parse_setup_py),
-            ("package.json", self._parse_package_json),
-        ]
-
-        for filename, parser in candidates:
-            path = self.repo_path / filename
-            if path.exists():
+        parsers = {
+            "requirements.txt": self._parse_requirements_file,
+            "requirements-dev.txt": self._parse_requirements_file,
+            "pyproject.toml": self._parse_pyproject_toml,
+            "setup.py": self._parse_setup_py,
+            "package.json": self._parse_package_json,
+        }
+
+        for filename in DEPENDENCY_FILES:
+            if self.index.is_file(filename):
                 try:
-                    packages = parser(path)
+                    packages = parsers[filename](self.index.read_text(filename))
                     if packages:
                         raw_packages.extend(packages)
                         source_files.append(filename)
@@ -236,19 +313,18 @@ class BaseRepoAnalyzer(ABC):
             "source_files": source_files,
         }
 
-    def _parse_requirements_file(self, path: Path) -> list[str]:
+    def _parse_requirements_file(self, content: str) -> list[str]:
         """Parse requirements.txt-style file."""
         packages = []
-        for line in path.read_text(errors="replace").splitlines():
+        for line in content.splitlines():
             line = line.split("#")[0].strip()
             if line and not line.startswith("-"):
                 packages.append(line)
         return packages
 
-    def _parse_pyproject_toml(self, path: Path) -> list[str]:
+    def _parse_pyproject_toml(self, content: str) -> list[str]:
         """Extract dependencies from pyproject.toml via regex (no toml lib needed)."""
         packages = []
-        content = path.read_text(errors="replace")
         # Match lines inside [project] dependencies = [...] or [tool.poetry.dependencies]
         in_deps = False
         for line in content.splitlines():
@@ -266,20 +342,19 @@ class BaseRepoAnalyzer(ABC):
                     in_deps = False
         return packages
 
-    def _parse_setup_py(self, path: Path) -> list[str]:
+    def _parse_setup_py(self, content: str) -> list[str]:
         """Extract install_requires list from setup.py via regex."""
         packages = []
-        content = path.read_text(errors="replace")
         m = re.search(r"install_requires\s*=\s*\[(.*?)\]", content, re.DOTALL)
         if m:
             for pkg_m in re.finditer(r"""["']([A-Za-z][^"']+)["']""", m.group(1)):
                 packages.append(pkg_m.group(1))
         return packages
 
-    def _parse_package_json(self, path: Path) -> list[str]:
+    def _parse_package_json(self, content: str) -> list[str]:
         """Extract dependency names from package.json."""
         try:
-            data = json.loads(path.read_text(errors="replace"))
+            data = json.loads(content)
             packages = []
             for section in ("dependencies", "devDependencies", "peerDependencies"):
                 packages.extend(data.get(section, {}).keys())
@@ -288,6 +363,273 @@ class BaseRepoAnalyzer(ABC):
             logger.debug("Could not parse package.json: %s", e)
             return []
 
+    # Cached per-file extraction
+
+    def parse_python_files(self, paths: list[str]) -> list[ParsedSource]:
+        """
+        Parse Python files, serving unchanged files from the parse cache.
+
+        Cache misses are parsed in parallel (parse_workers / parse_chunk_size
+        config) and written back to the cache.
+
+        Args:
+            paths: File paths relative to the repo root
+
+        Returns:
+            ParsedSource records in the order of ``paths`` (unreadable files dropped)
+        """
+        results: dict[str, ParsedSource] = {}
+        misses: list[str] = []
+        for path in paths:
+            cached = None
+            if self.parse_cache:
+                cached = self.parse_cache.get("python", self.index.blob_sha(path))
+            if cached is not None:
+                results[path] = ParsedSource.from_dict(path, cached)
+            else:
+                misses.append(path)
+
+        if misses:
+            parsed_files = parse_python_files(
+                self.repo_path,
+                misses,
+                workers=self.config.get("parse_workers"),
+                chunk_size=self.config.get("parse_chunk_size", 64),
+                object_shas=(
+                    {p: self.index.blob_sha(p) or "" for p in misses}
+                    if self.index.reads_objects else None
+                ),
+            )
+            for parsed in parsed_files:
+                results[parsed.path] = parsed
+                if self.parse_cache:
+                    self.parse_cache.put("python", self.index.blob_sha(parsed.path), parsed.to_dict())
+
+        return [results[p] for p in paths if p in results]
+
+    def summarize_doc(self, relative_path: str) -> tuple[str, int]:
+        """
+        Return (summary, length) of a documentation file.
+
+        Served from the parse cache when the file is unchanged. The cache kind
+        includes the analyzer class because each analyzer summarizes differently.
+
+        Args:
+            relative_path: Doc file path relative to the repo root
+
+        Returns:
+            Tuple of (summary text, file size in bytes)
+        """
+        known = self._known_doc_summary(relative_path)
+        if known is not None:
+            return known
+        outcome = self._read_doc_summary(relative_path)
+        self._store_doc_summary(relative_path, outcome)
+        return outcome
+
+    def summarize_docs(self, paths: list[str]) -> dict[str, tuple[str, int]]:
+        """
+        Summarize many documentation files within the doc byte budget.
+
+        Files are read in parallel (``doc_workers`` threads) and only up to
+        the end of their first paragraph. Each file is charged
+        min(size, DOC_HEAD_BYTES) against ``doc_byte_budget`` in path order;
+        files past the budget are left out, so the result does not depend on
+        timing or on what was cached.
+
+        Args:
+            paths: Doc file paths relative to the repo root, in priority order
+
+        Returns:
+            Dict mapping path to (summary, size in bytes) for the files that
+            were readable and fit the budget, in path order
+        """
+        budget = self.config.get("doc_byte_budget")
+        results: dict[str, tuple[str, int]] = {}
+        spent = 0
+        for path, outcome in self._iter_doc_summaries(paths):
+            if outcome is None:
+                continue
+            spent += min(outcome[1], DOC_HEAD_BYTES)
+            if budget is not None and spent > budget:
+                logger.info(
+                    "Documentation byte budget (%d bytes) reached after %d of %d files",
+                    budget, len(results), len(paths),
+                )
+                break
+            results[path] = outcome
+        return results
+
+    def _iter_doc_summaries(self, paths: list[str]) -> Iterator[tuple[str, Optional[tuple[str, int]]]]:
+        """Yield (path, (summary, size) or None if unreadable) in path order."""
+        workers = self.config.get("doc_workers") or DEFAULT_DOC_WORKERS
+        if self.index.reads_objects:
+            workers = 1  # a single cat-file process serves every read
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        # Work in windows so that stopping at the budget wastes little I/O
+        window = workers * 4
+        try:
+            for start in range(0, len(paths), window):
+                batch = paths[start:start + window]
+                known = {p: self._known_doc_summary(p) for p in batch}
+                misses = [p for p in batch if known[p] is None]
+                mapper = executor.map if executor is not None else map
+                for path, outcome in zip(misses, mapper(self._try_read_doc_summary, misses)):
+                    known[path] = outcome
+                    if outcome is not None:
+                        self._store_doc_summary(path, outcome)
+                for path in batch:
+                    yield path, known[path]
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def _known_doc_summary(self, relative_path: str) -> Optional[tuple[str, int]]:
+        """Summary carried over by update() or found in the parse cache."""
+        reused = self._reused_docs.get(relative_path)
+        if reused is not None:
+            return reused
+        if self.parse_cache:
+            cached = self.parse_cache.get(self._doc_cache_kind(), self.index.blob_sha(relative_path))
+            if cached is not None:
+                return cached["summary"], cached["length_bytes"]
+        return None
+
+    def _store_doc_summary(self, relative_path: str, outcome: tuple[str, int]) -> None:
+        if self.parse_cache:
+            summary, length = outcome
+            self.parse_cache.put(
+                self._doc_cache_kind(),
+                self.index.blob_sha(relative_path),
+                {"summary": summary, "length_bytes": length},
+            )
+
+    def _doc_cache_kind(self) -> str:
+        return f"doc:{type(self).__name__}"
+
+    def _try_read_doc_summary(self, relative_path: str) -> Optional[tuple[str, int]]:
+        try:
+            return self._read_doc_summary(relative_path)
+        except Exception as e:
+            logger.debug(f"Could not read doc {relative_path}: {e}")
+            return None
+
+    def _read_doc_summary(self, relative_path: str) -> tuple[str, int]:
+        """Summarize a file from its head, reading no further than needed."""
+        with self.index.open_binary(relative_path) as f:
+            size = f.seek(0, io.SEEK_END)
+            f.seek(0)
+            return self._summarize_lines(_iter_head_lines(f, DOC_HEAD_BYTES)), size
+
+    def _extract_doc_summary(self, content: str) -> str:
+        """Summarize a documentation file from its full text."""
+        return self._summarize_lines(content.split("\n"))
+
+    def _summarize_lines(self, lines: Iterable[str]) -> str:
+        """
+        Summarize a documentation file from its lines. Subclasses override this.
+
+        Lines are produced lazily from the file; stop iterating as soon as the
+        summary is complete so the rest of the file is never read.
+        """
+        head: list[str] = []
+        total = 0
+        for line in lines:
+            head.append(line)
+            total += len(line) + 1
+            # Once 500 characters survive strip(), the rest cannot change them
+            if total >= 500 and len("\n".join(head).strip()) >= 500:
+                break
+        return "\n".join(head).strip()[:500]
+
+    def flush_parse_cache(self) -> None:
+        """Persist pending parse cache entries and log hit/miss counters."""
+        if self.parse_cache:
+            self.parse_cache.flush()
+            stats = self.parse_cache.stats()
+            logger.info(
+                "Parse cache: %d hits, %d misses (%.0f%% hit rate)",
+                stats["hits"], stats["misses"], stats["hit_rate"] * 100,
+            )
+
+    # Commit history
+
+    def iter_commit_log(self, rev: str = "HEAD") -> Iterator[LogEntry]:
+        """
+        Stream commits newest first, honoring the max_commit_scan config.
+
+        Reads one ``git log`` stream instead of building a GitPython Commit
+        object per commit, so it stays fast and flat in memory on long histories.
+
+        Args:
+            rev: Revision or range to walk
+
+        Yields:
+            LogEntry per commit
+        """
+        return iter_log(self.repo_path, max_count=self.config.get("max_commit_scan"), rev=rev)
+
+    def iter_key_commits(self, rev: str = "HEAD") -> Iterator[CommitInfo]:
+        """
+        Yield the commits scan_commits() reports, streaming the commit log.
+
+        Subclasses that scan commits override this; update_commits() relies on it.
+
+        Args:
+            rev: Revision or range to walk
+        """
+        return iter(())
+
+    def update_commits(
+        self,
+        previous: list[CommitInfo],
+        changes: RepoChanges,
+    ) -> list[CommitInfo]:
+        """
+        Extend previously found key commits with those among the new commits.
+
+        Only changes.commit_range is scanned. With max_commit_scan set, previous
+        commits that fell out of the newest-N window are dropped, as a full
+        scan would not see them either.
+
+        Args:
+            previous: Key commits of the previous analysis
+            changes: Detected changes
+
+        Returns:
+            Key commits, newest first
+        """
+        if not changes.new_commits:
+            return previous
+        new = list(self.iter_key_commits(rev=changes.commit_range))
+
+        max_scan = self.config.get("max_commit_scan")
+        if not max_scan:
+            return [*new, *previous]
+        remaining = max_scan - changes.new_commits
+        if remaining <= 0:
+            return new
+        window = {sha[:8] for sha in rev_list(self.repo_path, changes.since_sha, max_count=remaining)}
+        return new + [c for c in previous if c.sha in window]
+
+    def reuse_documentation(
+        self,
+        previous: list[DocumentationInfo],
+        changes: RepoChanges,
+    ) -> None:
+        """
+        Let summarize_doc() answer from a previous analysis for unchanged docs.
+
+        Args:
+            previous: Documentation entries of the previous analysis
+            changes: Detected changes
+        """
+        self._reused_docs = {
+            doc.path: (doc.summary, doc.metadata["length_bytes"])
+            for doc in previous
+            if "length_bytes" in doc.metadata and not changes.touches(doc.path)
+        }
+
     def get_extensions(self) -> dict[str, Any]:
         """
         Return type-specific extension data.
@@ -299,3 +641,19 @@ class BaseRepoAnalyzer(ABC):
             Dict of extension data
         """
         return {}
+
+
+def _iter_head_lines(f: BinaryIO, limit: int) -> Iterator[str]:
+    """
+    Yield decoded lines from the start of a binary file, up to ``limit`` bytes.
+
+    Splits like text mode with universal newlines (and ``str.split("\\n")``
+    on the decoded text), so summaries match reading the whole file.
+    """
+    consumed = 0
+    for raw in f:
+        consumed += len(raw)
+        text = raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+        yield from (text[:-1] if text.endswith("\n") else text).split("\n")
+        if consumed >= limit:
+            return
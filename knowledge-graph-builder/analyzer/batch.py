@@ -0,0 +1,306 @@
+"""Analyze many repositories in one process pool."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from analyzer.analyzer import RepoAnalyzer
+from analyzer.clone import clone_repository, is_remote_url, remove_clone, repo_name
+from analyzer.mirror import DEFAULT_MAX_BYTES as DEFAULT_MIRROR_MAX_BYTES, MirrorCache
+from analyzer.serialization import write_analysis
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = "batch_report.jsonl"
+
+
+@dataclass
+class BatchJob:
+    """One repository to analyze."""
+
+    repo: str  # Local path or URL
+    name: str  # Artifact name, unique within the batch
+    config: dict = field(default_factory=dict)  # Per-repo analyzer config overrides
+
+
+@dataclass
+class BatchOptions:
+    """Settings shared by every job of a batch."""
+
+    output_dir: str  # Where artifacts and the report are written
+    config: dict = field(default_factory=dict)  # Analyzer config for every repo
+    clone_dir: Optional[str] = None  # Clone URLs under here (default: temporary dirs)
+    keep_clones: bool = False  # Keep clones made in temporary dirs
+    no_checkout: bool = False  # Clone without checking out files
+    blobless: bool = False  # Clone without blobs, sparse-checking-out the analyzer's paths
+    mirror_cache: bool = False  # Fetch URLs through persistent local mirrors
+    mirror_cache_max_bytes: int = DEFAULT_MIRROR_MAX_BYTES  # Mirror size before LRU eviction
+    sectioned: bool = False  # Write sectioned directories instead of JSON files
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one job."""
+
+    name: str
+    repo: str
+    status: str  # "ok" or "failed"
+    artifact: Optional[str] = None  # Written analysis (file or sectioned dir)
+    repo_type: Optional[str] = None
+    counts: dict = field(default_factory=dict)  # Components, commits, documentation
+    timings: dict = field(default_factory=dict)  # Seconds: clone, analyze, write, total
+    error: Optional[str] = None  # Exception summary when failed
+    traceback: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Serialize to dict."""
+        return asdict(self)
+
+
+def load_manifest(path: str | Path) -> list[BatchJob]:
+    """
+    Read a batch manifest.
+
+    Formats:
+        - ``.json``: a list of repo strings or ``{"repo", "name"?, "config"?}`` objects
+        - anything else: one entry per line, either ``<repo> [name]`` or a JSON
+          object as above; blank lines and ``#`` comments are skipped
+
+    Names default to the repository name and are made unique with a numeric
+    suffix.
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Jobs in manifest order
+
+    Raises:
+        ValueError: If an entry has no repo
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        entries = json.loads(text)
+    else:
+        entries = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entries.append(json.loads(line))
+            else:
+                repo, _, name = line.partition(" ")
+                entries.append({"repo": repo, "name": name.strip() or None})
+
+    jobs: list[BatchJob] = []
+    used: set[str] = set()
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"repo": entry}
+        if not entry.get("repo"):
+            raise ValueError(f"Manifest entry without a repo: {entry!r}")
+        base = entry.get("name") or repo_name(entry["repo"]) or "repo"
+        name, n = base, 1
+        while name in used:
+            n += 1
+            name = f"{base}-{n}"
+        used.add(name)
+        jobs.append(BatchJob(repo=entry["repo"], name=name, config=entry.get("config") or {}))
+    return jobs
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    options: BatchOptions,
+    workers: Optional[int] = None,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+) -> list[BatchResult]:
+    """
+    Analyze repositories in a process pool.
+
+    At most ``workers`` repositories are analyzed at once; each worker process
+    is reused across repositories, so imports and caches are paid once per
+    worker rather than once per repository. Results are appended to
+    ``<output_dir>/batch_report.jsonl`` as they complete.
+
+    A failing repository only fails its own job. If a worker process dies
+    (e.g. out of memory), the jobs that were in flight are retried one at a
+    time before being reported as failed.
+
+    Args:
+        jobs: Repositories to analyze
+        options: Shared settings
+        workers: Concurrent repositories (default: min(4, CPU count))
+        on_result: Called in the parent with each result as it arrives
+
+    Returns:
+        Results in job order
+    """
+    workers = max(1, min(workers or min(4, os.cpu_count() or 1), len(jobs) or 1))
+    config = dict(options.config)
+    # Split the machine between repositories instead of every analyzer
+    # starting a parse pool the size of the CPU count
+    config.setdefault("parse_workers", max(1, (os.cpu_count() or 1) // workers))
+    options = replace(options, config=config)
+
+    out = Path(options.output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    results: dict[str, BatchResult] = {}
+
+    with (out / REPORT_FILE).open("a", encoding="utf-8") as report:
+        def record(result: BatchResult) -> None:
+            results[result.name] = result
+            report.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+            report.flush()
+            if on_result is not None:
+                on_result(result)
+
+        broken = _run_pool(jobs, options, workers, record)
+        # A dead worker breaks the whole pool, so the repositories in flight
+        # with the culprit are lost too: retry each one in a pool of its own
+        for job in broken:
+            logger.warning("Worker process died; retrying %s on its own", job.name)
+            if _run_pool([job], options, 1, record):
+                record(BatchResult(
+                    name=job.name,
+                    repo=job.repo,
+                    status="failed",
+                    error="Worker process died while analyzing this repository",
+                ))
+
+    return [results[job.name] for job in jobs]
+
+
+def _run_pool(
+    jobs: list[BatchJob],
+    options: BatchOptions,
+    workers: int,
+    record: Callable[[BatchResult], None],
+) -> list[BatchJob]:
+    """Run jobs in one pool; return the jobs lost to a broken pool."""
+    broken: list[BatchJob] = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(analyze_job, job, options): job for job in jobs}
+        not_done = set(futures)
+        while not_done:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = futures[future]
+                try:
+                    record(future.result())
+                except BrokenProcessPool:
+                    broken.append(job)
+                except Exception as e:  # e.g. result not picklable
+                    record(BatchResult(
+                        name=job.name, repo=job.repo, status="failed", error=f"{type(e).__name__}: {e}",
+                    ))
+    return broken
+
+
+def analyze_job(job: BatchJob, options: BatchOptions) -> BatchResult:
+    """
+    Clone (if needed), analyze and write one repository; never raises.
+
+    Runs in a worker process.
+
+    Args:
+        job: Repository to analyze
+        options: Shared settings
+
+    Returns:
+        BatchResult with status "ok" or "failed"
+    """
+    result = BatchResult(name=job.name, repo=job.repo, status="failed")
+    config = {**options.config, **job.config}
+    start = time.perf_counter()
+    step = start
+    temp_clone: Optional[Path] = None
+
+    def lap(label: str) -> None:
+        nonlocal step
+        now = time.perf_counter()
+        result.timings[label] = round(now - step, 3)
+        step = now
+
+    try:
+        repo_path = Path(job.repo)
+        if is_remote_url(job.repo):
+            if options.clone_dir:
+                repo_path = Path(options.clone_dir) / job.name
+            else:
+                repo_path = temp_clone = Path(tempfile.mkdtemp(prefix=f"batch_{job.name}_"))
+            clone_repository(
+                job.repo,
+                repo_path,
+                max_commits=config.get("max_commit_scan"),
+                no_checkout=options.no_checkout,
+                blobless=options.blobless,
+                config=config,
+                mirrors=MirrorCache.open_default(
+                    config.get("cache_dir"), max_bytes=options.mirror_cache_max_bytes
+                ) if options.mirror_cache else None,
+            )
+            lap("clone")
+            config["source_url"] = job.repo  # Stored analyses outlive the clone directory
+
+        analysis = RepoAnalyzer(repo_path, config=config).analyze()
+        lap("analyze")
+
+        analysis.metadata["source_repo"] = job.repo
+        out = Path(options.output_dir)
+        if options.sectioned:
+            artifact = write_analysis(analysis, out / job.name)
+        else:
+            artifact = out / f"{job.name}.json"
+            tmp = out / f".{job.name}.json.{os.getpid()}.tmp"
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(analysis.to_dict(), f, indent=2, ensure_ascii=False)
+            tmp.replace(artifact)
+        lap("write")
+
+        result.status = "ok"
+        result.artifact = str(artifact)
+        result.repo_type = analysis.repo_type.value
+        result.counts = {
+            "components": len(analysis.components),
+            "commits": len(analysis.commits),
+            "documentation": len(analysis.documentation),
+        }
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        result.traceback = traceback.format_exc()
+        logger.error("Analysis of %s failed: %s", job.name, result.error)
+    finally:
+        if temp_clone is not None and not options.keep_clones:
+            remove_clone(temp_clone)
+        result.timings["total"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def summarize(results: Iterable[BatchResult]) -> str:
+    """Format a per-repository timing table."""
+    rows = [("repo", "status", "type", "clone", "analyze", "write", "total")]
+    for r in results:
+        t = r.timings
+        rows.append((
+            r.name,
+            r.status,
+            r.repo_type or "-",
+            *(f"{t[k]:.1f}s" if k in t else "-" for k in ("clone", "analyze", "write", "total")),
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows
+    )
@@ -0,0 +1,190 @@
+"""Cloning remote repositories for analysis."""
+
+from __future__ import annotations
+
+import logging
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from git import Git
+from git import Repo as GitRepo
+
+from analyzer.file_index import RepoFileIndex
+from analyzer.mirror import MirrorCache
+from analyzer.registry import AnalyzerRegistry
+
+# Auto-import all analyzers to register them (blobless clones detect before analysis)
+from analyzer.analyzers import generic, huggingface
+
+logger = logging.getLogger(__name__)
+
+
+def is_remote_url(repo: str) -> bool:
+    """Return True if the repository argument is a URL rather than a local path."""
+    return repo.startswith(("http://", "https://", "ssh://", "git://", "file://", "git@"))
+
+
+def repo_name(repo: str) -> str:
+    """
+    Short name of a repository path or URL (e.g. "transformers").
+
+    Args:
+        repo: Local path or URL
+
+    Returns:
+        Last path component without a ``.git`` suffix
+    """
+    name = repo.rstrip("/").split("/")[-1]
+    return name[:-4] if name.endswith(".git") else name
+
+
+def clone_repository(
+    url: str,
+    dest: str | Path,
+    max_commits: Optional[int] = None,
+    no_checkout: bool = False,
+    blobless: bool = False,
+    config: Optional[dict] = None,
+    mirrors: Optional[MirrorCache] = None,
+) -> Path:
+    """
+    Shallow-clone a repository, then deepen it for commit history.
+
+    An existing clone at ``dest`` is reused as is.
+
+    With ``blobless``, the clone is made with ``--filter=blob:none``: commits
+    and trees are fetched (so commit scans and history queries work as usual)
+    but file contents are not. The analyzer for the repository is detected
+    from the tree, and only the paths it declares (get_sparse_paths) are
+    checked out, which fetches just their blobs.
+
+    With ``mirrors``, the repository is fetched into a persistent local mirror
+    (only new commits after the first run) and ``dest`` becomes a worktree of
+    that mirror instead of a clone of its own.
+
+    Args:
+        url: Repository URL
+        dest: Clone directory
+        max_commits: Commits of history to fetch after the depth-1 clone
+            (None = keep depth 1; whole history with ``blobless``)
+        no_checkout: Skip checking out files (Phase 1 then reads git objects)
+        blobless: Clone without blobs and sparse-check-out the analyzer's paths
+        config: Analyzer config, for the paths of a blobless checkout
+        mirrors: Mirror cache to fetch through (None = clone directly)
+
+    Returns:
+        The clone directory
+    """
+    dest = Path(dest)
+    if (dest / ".git").exists():
+        logger.info("♻️  Using existing clone")
+        return dest
+    if mirrors is not None:
+        repo = mirrors.checkout(
+            url, dest, max_commits=max_commits, blobless=blobless, no_checkout=no_checkout or blobless
+        )
+        if blobless and not no_checkout:
+            _sparse_checkout(repo, dest, config)
+        return dest
+    if blobless:
+        return _clone_blobless(url, dest, max_commits, no_checkout, config)
+
+    logger.info("Cloning repository (depth=1)...")
+    dest.mkdir(parents=True, exist_ok=True)
+    clone_args = {"no_checkout": True} if no_checkout else {}
+    GitRepo.clone_from(url, str(dest), depth=1, **clone_args)
+    logger.info("✅ Clone completed")
+
+    if max_commits:
+        logger.info(f"Fetching commit history (last {max_commits} commits)...")
+        try:
+            GitRepo(dest).git.fetch("--deepen", str(max_commits))
+            logger.info("✅ Commit history fetched")
+        except Exception as e:
+            logger.warning(f"Could not deepen clone: {e}")
+    return dest
+
+
+def remove_clone(path: str | Path) -> None:
+    """
+    Delete a clone made by clone_repository().
+
+    For a worktree of a mirror, the mirror's record of it is pruned too, so
+    the mirror no longer counts as in use.
+
+    Args:
+        path: Clone directory
+    """
+    path = Path(path)
+    common_dir = None
+    if (path / ".git").is_file():
+        try:
+            common_dir = GitRepo(path).common_dir
+        except Exception as e:
+            logger.debug("Could not resolve the git dir of %s: %s", path, e)
+    shutil.rmtree(path, ignore_errors=True)
+    if common_dir is not None:
+        try:
+            Git(common_dir).worktree("prune")
+        except Exception as e:
+            logger.debug("Could not prune worktrees of %s: %s", common_dir, e)
+
+
+def _clone_blobless(
+    url: str,
+    dest: Path,
+    max_commits: Optional[int],
+    no_checkout: bool,
+    config: Optional[dict],
+) -> Path:
+    """Clone commits and trees only, then sparse-check-out the analyzer's paths."""
+    depth = f"depth={max_commits}" if max_commits else "full history"
+    logger.info(f"Cloning repository (blobless, {depth})...")
+    dest.mkdir(parents=True, exist_ok=True)
+    clone_args = {"depth": max_commits} if max_commits else {}
+    repo = GitRepo.clone_from(url, str(dest), filter="blob:none", no_checkout=True, **clone_args)
+    logger.info("✅ Clone completed")
+    if not no_checkout:
+        _sparse_checkout(repo, dest, config)
+    return dest
+
+
+def _sparse_checkout(repo: GitRepo, dest: Path, config: Optional[dict]) -> None:
+    """Check out the paths the detected analyzer reads (everything if it does not say)."""
+    # Detection only lists the HEAD tree, which needs no blobs
+    index = RepoFileIndex.for_path(dest)
+    analyzer_class = AnalyzerRegistry.auto_detect(dest)
+    paths = analyzer_class.get_sparse_paths(config)
+    if paths is not None:
+        patterns = sparse_patterns(paths, index)
+        logger.info(f"Sparse checkout of {len(patterns)} paths for {analyzer_class.__name__}")
+        repo.git.sparse_checkout("set", "--no-cone", *patterns)
+    repo.git.checkout()
+    # The index built for detection read from objects; the clone has a work tree now
+    RepoFileIndex.clear_cache()
+    logger.info("✅ Checkout completed")
+
+
+def sparse_patterns(paths: list[str], index: RepoFileIndex) -> list[str]:
+    """
+    Turn repository paths into non-cone sparse-checkout patterns.
+
+    Directories become ``/dir/`` (everything below them) and files ``/file``;
+    paths missing from the tree are dropped.
+
+    Args:
+        paths: Paths relative to the repository root
+        index: Index of the tree being checked out
+
+    Returns:
+        Patterns for ``git sparse-checkout set --no-cone``
+    """
+    patterns = []
+    for path in paths:
+        path = path.strip("/")
+        if index.is_dir(path):
+            patterns.append(f"/{path}/")
+        elif index.is_file(path):
+            patterns.append(f"/{path}")
+    return patterns
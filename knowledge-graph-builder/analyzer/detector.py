@@ -2,33 +2,198 @@
 
 from __future__ import annotations
 
+import contextlib
+import json
 import logging
+import os
 from pathlib import Path
-from typing import Type
+from typing import Iterator, Optional, Type
+
+from analyzer.file_index import RepoFileIndex, tree_has_suffix
+from analyzer.git_objects import lacks_work_tree
+from analyzer.incremental import resolve_head
+from analyzer.parse_cache import default_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache is updated without locking
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Source files deeper than this many directories are not looked at by
+# detect_features(); top-level layout is what identifies a repository type
+DETECT_MAX_DEPTH = 4
+
+class _WorkTreeProbe:
+    """The RepoFileIndex queries detect_features() needs, answered by the filesystem."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def is_file(self, relative_path: str) -> bool:
+        return (self.root / relative_path).is_file()
+
+    def is_dir(self, relative_path: str) -> bool:
+        return (self.root / relative_path).is_dir()
+
+    def read_text(self, relative_path: str, errors: str = "replace") -> str:
+        return (self.root / relative_path).read_text(errors=errors)
+
+    def has_suffix(self, *suffixes: str, max_depth: int) -> bool:
+        return tree_has_suffix(self.root, *suffixes, max_depth=max_depth)
+
+
+# Repositories remembered by DetectionCache
+_MAX_CACHED_DETECTIONS = 512
+
+
+class DetectionCache:
+    """
+    Remembers the detected analyzer per (repository path, HEAD SHA).
+
+    A single small JSON file under the shared cache directory. An entry is
+    only used for the same HEAD and the same set of registered analyzers, so
+    new commits or a newly registered analyzer trigger a fresh detection.
+    Uncommitted changes do not: they rarely change what a repository is.
+    Updates hold a lock on ``<path>.lock`` so concurrent processes (e.g.
+    batch workers) do not drop each other's entries.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: JSON file holding the cached detections
+        """
+        self.path = Path(path)
+
+    @classmethod
+    def open_default(cls, cache_dir: Optional[str | Path] = None) -> DetectionCache:
+        """Return the cache under the shared cache directory."""
+        return cls((Path(cache_dir) if cache_dir else default_cache_dir()) / "detection.json")
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable detection cache %s: %s", self.path, e)
+            return {}
+
+    def get(self, repo_path: Path, head_sha: str, analyzer_names: list[str]) -> Optional[tuple[str, float]]:
+        """
+        Look up a previous detection.
+
+        Args:
+            repo_path: Repository root
+            head_sha: Current HEAD
+            analyzer_names: Names of the analyzers detection would consider
+
+        Returns:
+            (analyzer class name, confidence), or None on a miss
+        """
+        entry = self._load().get(str(repo_path.resolve()))
+        if (
+            not isinstance(entry, dict)
+            or entry.get("head_sha") != head_sha
+            or entry.get("analyzers") != sorted(analyzer_names)
+        ):
+            return None
+        return entry["analyzer"], entry["confidence"]
+
+    def put(
+        self,
+        repo_path: Path,
+        head_sha: str,
+        analyzer_names: list[str],
+        analyzer: str,
+        confidence: float,
+    ) -> None:
+        """Store a detection result (written atomically; failures are logged)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock():
+                entries = self._load()
+                key = str(repo_path.resolve())
+                entries.pop(key, None)
+                entries[key] = {
+                    "head_sha": head_sha,
+                    "analyzers": sorted(analyzer_names),
+                    "analyzer": analyzer,
+                    "confidence": confidence,
+                }
+                # Oldest entries first (insertion order); keep the newest
+                for stale in list(entries)[:-_MAX_CACHED_DETECTIONS]:
+                    del entries[stale]
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(entries))
+                tmp.replace(self.path)
+        except OSError as e:
+            logger.warning("Could not store detection at %s: %s", self.path, e)
+
+    @contextlib.contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the cache file for a read-modify-write."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
 
 class RepoTypeDetector:
     """Detects repository type based on heuristics."""
 
     @staticmethod
     def detect(
-        repo_path: Path, analyzers: list[Type["BaseRepoAnalyzer"]]
+        repo_path: Path,
+        analyzers: list[Type["BaseRepoAnalyzer"]],
+        cache: Optional[DetectionCache] = None,
     ) -> tuple[Type["BaseRepoAnalyzer"], float]:
         """
         Detect the best analyzer for a repository.
 
         Calls can_handle() on all analyzers and selects the one with
-        the highest confidence score.
+        the highest confidence score. With a cache, a previous result for
+        the same HEAD commit is returned without calling can_handle().
 
         Args:
             repo_path: Path to the repository
             analyzers: List of available analyzer classes
+            cache: Optional DetectionCache to consult and update
 
         Returns:
             Tuple of (AnalyzerClass, confidence_score)
         """
+        head_sha = resolve_head(repo_path) if cache is not None else None
+        if head_sha is not None:
+            by_name = {a.__name__: a for a in analyzers}
+            hit = cache.get(repo_path, head_sha, list(by_name))
+            if hit is not None and hit[0] in by_name:
+                logger.info(
+                    f"Using cached detection for {repo_path} at {head_sha[:8]}: "
+                    f"{hit[0]} (confidence: {hit[1]:.2f})"
+                )
+                return by_name[hit[0]], hit[1]
+
+        analyzer_class, confidence = RepoTypeDetector._detect_uncached(repo_path, analyzers)
+        if head_sha is not None:
+            cache.put(
+                repo_path, head_sha, [a.__name__ for a in analyzers],
+                analyzer_class.__name__, confidence,
+            )
+        return analyzer_class, confidence
+
+    @staticmethod
+    def _detect_uncached(
+        repo_path: Path, analyzers: list[Type["BaseRepoAnalyzer"]]
+    ) -> tuple[Type["BaseRepoAnalyzer"], float]:
+        """Run can_handle() on every analyzer and pick the most confident."""
         candidates = []
 
         for analyzer_class in analyzers:
@@ -72,6 +237,10 @@ class RepoTypeDetector:
         Detect various repository features for heuristic matching.
 
         This method checks for common indicators across different repository types.
+        In a checkout it only stats a few paths and walks the top
+        DETECT_MAX_DEPTH levels until the first source file, without listing
+        the whole repository; repositories without a checkout are answered
+        from the shared RepoFileIndex.
 
         Args:
             repo_path: Path to the repository
@@ -80,31 +249,36 @@ class RepoTypeDetector:
             Dict of boolean features
         """
         features = {}
+        repo_path = Path(repo_path)
+        if lacks_work_tree(repo_path):
+            index = RepoFileIndex.for_path(repo_path)
+        else:
+            index = _WorkTreeProbe(repo_path)
 
         # Python indicators
-        features["has_setup_py"] = (repo_path / "setup.py").exists()
-        features["has_pyproject_toml"] = (repo_path / "pyproject.toml").exists()
-        features["has_requirements_txt"] = (repo_path / "requirements.txt").exists()
-        features["has_python_src"] = any(repo_path.rglob("*.py"))
+        features["has_setup_py"] = index.is_file("setup.py")
+        features["has_pyproject_toml"] = index.is_file("pyproject.toml")
+        features["has_requirements_txt"] = index.is_file("requirements.txt")
+        features["has_python_src"] = index.has_suffix(".py", max_depth=DETECT_MAX_DEPTH)
 
         # JavaScript/TypeScript indicators
-        features["has_package_json"] = (repo_path / "package.json").exists()
+        features["has_package_json"] = index.is_file("package.json")
+        # node_modules is gitignored, so check the filesystem rather than the index
         features["has_node_modules"] = (repo_path / "node_modules").exists()
-        features["has_js_src"] = any(repo_path.rglob("*.js")) or any(repo_path.rglob("*.ts"))
+        features["has_js_src"] = index.has_suffix(".js", ".ts", max_depth=DETECT_MAX_DEPTH)
 
         # Framework-specific
-        features["has_transformers"] = (repo_path / "src" / "transformers").exists()
-        features["has_torch_dir"] = (repo_path / "torch").exists()
-        features["has_django_manage"] = (repo_path / "manage.py").exists()
+        features["has_transformers"] = index.is_dir("src/transformers")
+        features["has_torch_dir"] = index.is_dir("torch")
+        features["has_django_manage"] = index.is_file("manage.py")
 
         # Try to detect Flask (check common entry point files)
         flask_indicators = ["app.py", "application.py", "main.py"]
         features["has_flask_app"] = False
         for filename in flask_indicators:
-            filepath = repo_path / filename
-            if filepath.exists():
+            if index.is_file(filename):
                 try:
-                    content = filepath.read_text(errors="ignore")
+                    content = index.read_text(filename, errors="ignore")
                     if "Flask" in content:
                         features["has_flask_app"] = True
                         break
@@ -112,11 +286,9 @@ class RepoTypeDetector:
                     pass
 
         # Documentation
-        features["has_docs"] = (
-            (repo_path / "docs").exists() or (repo_path / "documentation").exists()
-        )
+        features["has_docs"] = index.is_dir("docs") or index.is_dir("documentation")
         features["has_readme"] = any(
-            (repo_path / name).exists()
+            index.is_file(name)
             for name in ["README.md", "README.rst", "README.txt", "README"]
         )
 
@@ -0,0 +1,404 @@
+"""Single-pass file index shared by all scans of one repository."""
+
+from __future__ import annotations
+
+import bisect
+import fnmatch
+import io
+import itertools
+import logging
+import os
+import posixpath
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from analyzer.git_objects import GitObjectReader, lacks_work_tree, ls_tree
+
+logger = logging.getLogger(__name__)
+
+# Directory names that are never part of the source tree proper. Used both to
+# prune the fallback filesystem walk and to filter tracked files in scans.
+IGNORED_DIRS = frozenset({
+    "__pycache__", "venv", "env", ".venv", "node_modules", "build", "dist",
+})
+
+# Number of indexes kept alive by RepoFileIndex.for_path()
+_MAX_CACHED_INDEXES = 8
+
+
+def is_ignored_path(relative_path: str) -> bool:
+    """Return True if any directory component is hidden or in IGNORED_DIRS."""
+    parts = relative_path.split("/")[:-1]
+    return any(part.startswith(".") or part in IGNORED_DIRS for part in parts)
+
+
+def _normalize(relative_path: str | Path) -> str:
+    """Normalize a relative path to the index's POSIX form ("" is the root)."""
+    path = posixpath.normpath(Path(relative_path).as_posix())
+    return "" if path == "." else path.strip("/")
+
+
+class RepoFileIndex:
+    """
+    Sorted listing of every file in a repository.
+
+    The listing comes from ``git ls-files -z``, so gitignored
+    directories (``node_modules``, virtualenvs, build output) are never walked.
+    Directory membership is derived from the file paths, which lets scans
+    answer exists/is_dir/iterdir/glob queries without touching the filesystem.
+
+    Repositories without a checkout (bare mirrors, ``--no-checkout`` or
+    blobless clones) are indexed from the ``HEAD`` tree instead, and file
+    contents are streamed from the object database (see GitObjectReader).
+
+    Paths are always POSIX-style and relative to the repository root.
+    """
+
+    _cache: "OrderedDict[tuple[Path, str], RepoFileIndex]" = OrderedDict()
+
+    def __init__(
+        self,
+        root: str | Path,
+        files: list[str],
+        blob_shas: Optional[dict[str, str]] = None,
+        object_reader: Optional[GitObjectReader] = None,
+    ):
+        """
+        Build an index from a list of relative file paths.
+
+        Args:
+            root: Repository root directory
+            files: File paths relative to root (POSIX separators)
+            blob_shas: Git blob SHA per path, for files whose work tree content
+                matches the git index (others are left out)
+            object_reader: If given, contents are read from git objects by
+                blob SHA instead of from the work tree
+        """
+        self.root = Path(root)
+        self._files = sorted(set(files))
+        self._file_set = frozenset(self._files)
+        self._blob_shas = blob_shas or {}
+        self.object_reader = object_reader
+
+        # dir -> sorted child paths (files and sub-directories)
+        children: dict[str, set[str]] = {"": set()}
+        for path in self._files:
+            child = path
+            parent = posixpath.dirname(child)
+            while True:
+                siblings = children.setdefault(parent, set())
+                if child in siblings:
+                    break
+                siblings.add(child)
+                if not parent:
+                    break
+                child, parent = parent, posixpath.dirname(parent)
+        self._children = {d: sorted(c) for d, c in children.items()}
+
+    @classmethod
+    def build(cls, root: str | Path, source: str = "auto") -> RepoFileIndex:
+        """
+        Build an index for a repository.
+
+        Uses ``git ls-files`` (tracked plus untracked-but-not-ignored files).
+        Falls back to a pruned filesystem walk if git is unavailable or the
+        directory is not a git work tree. If the HEAD tree cannot be listed
+        for an "objects" index, the work tree is indexed instead.
+
+        Args:
+            root: Repository root directory (or bare git dir)
+            source: "worktree", "objects" (HEAD tree, read from the object
+                database) or "auto" (objects when there is no checkout)
+
+        Returns:
+            RepoFileIndex for the repository
+        """
+        root = Path(root)
+        if source == "objects" or (source == "auto" and lacks_work_tree(root)):
+            try:
+                return cls.from_tree(root)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning("Could not list the HEAD tree of %s (%s), indexing files instead", root, e)
+        try:
+            files, blob_shas = _git_ls_files(root)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug("git ls-files failed for %s (%s), walking tree instead", root, e)
+            files, blob_shas = _walk_files(root), {}
+        logger.debug("Indexed %d files in %s", len(files), root)
+        return cls(root, files, blob_shas)
+
+    @classmethod
+    def from_tree(cls, root: str | Path, rev: str = "HEAD") -> RepoFileIndex:
+        """
+        Build an index from a commit's tree, without needing a checkout.
+
+        Args:
+            root: Repository root directory (or bare git dir)
+            rev: Commit to index
+
+        Returns:
+            RepoFileIndex whose reads go through ``git cat-file --batch``
+        """
+        root = Path(root)
+        blob_shas = ls_tree(root, rev)
+        logger.debug("Indexed %d files from %s tree in %s", len(blob_shas), rev, root)
+        return cls(root, list(blob_shas), blob_shas, object_reader=GitObjectReader(root))
+
+    @classmethod
+    def for_path(cls, root: str | Path, source: str = "auto") -> RepoFileIndex:
+        """
+        Return the shared index for a repository, building it on first use.
+
+        Detection (can_handle) and analysis of the same repository reuse one
+        index instead of listing the tree once per analyzer.
+
+        Args:
+            root: Repository root directory
+            source: See build()
+
+        Returns:
+            RepoFileIndex for the repository
+        """
+        key = (Path(root).resolve(), source)
+        index = cls._cache.get(key)
+        if index is None:
+            index = cls.build(root, source)
+            cls._cache[key] = index
+            while len(cls._cache) > _MAX_CACHED_INDEXES:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+        return index
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all shared indexes (e.g. after the work tree changed)."""
+        cls._cache.clear()
+
+    # Queries
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __contains__(self, relative_path: object) -> bool:
+        return isinstance(relative_path, (str, Path)) and self.is_file(relative_path)
+
+    @property
+    def files(self) -> list[str]:
+        """All indexed file paths, sorted."""
+        return self._files
+
+    def is_file(self, relative_path: str | Path) -> bool:
+        """Return True if the path is an indexed file."""
+        return _normalize(relative_path) in self._file_set
+
+    def is_dir(self, relative_path: str | Path) -> bool:
+        """Return True if the path is a directory containing indexed files."""
+        return _normalize(relative_path) in self._children
+
+    def exists(self, relative_path: str | Path) -> bool:
+        """Return True if the path is an indexed file or directory."""
+        path = _normalize(relative_path)
+        return path in self._file_set or path in self._children
+
+    def iterdir(self, relative_dir: str | Path = "") -> list[str]:
+        """Return the immediate children (files and directories) of a directory."""
+        return self._children.get(_normalize(relative_dir), [])
+
+    def glob(
+        self,
+        pattern: str,
+        under: str | Path = "",
+        recursive: bool = True,
+    ) -> list[str]:
+        """
+        Return files whose name matches a shell pattern.
+
+        Args:
+            pattern: fnmatch pattern applied to the file name (e.g. "*.py")
+            under: Only return files inside this directory
+            recursive: Include files in sub-directories (like Path.rglob)
+
+        Returns:
+            Sorted list of matching relative paths
+        """
+        base = _normalize(under)
+        if recursive:
+            candidates = self._iter_under(base)
+        else:
+            candidates = (p for p in self.iterdir(base) if p in self._file_set)
+        return [
+            p for p in candidates
+            if fnmatch.fnmatchcase(posixpath.basename(p), pattern)
+        ]
+
+    def has_suffix(self, *suffixes: str, max_depth: Optional[int] = None) -> bool:
+        """
+        Return True if any indexed file ends with one of the suffixes.
+
+        Args:
+            suffixes: File name endings (e.g. ".py")
+            max_depth: If set, only look at files at most this many directories
+                deep, skipping hidden and IGNORED_DIRS directories (even when
+                tracked, like a committed ``node_modules``)
+
+        Returns:
+            True on the first matching file
+        """
+        if max_depth is None:
+            return any(p.endswith(suffixes) for p in self._files)
+        return any(
+            p.endswith(suffixes) and p.count("/") <= max_depth and not is_ignored_path(p)
+            for p in self._files
+        )
+
+    def _iter_under(self, base: str) -> Iterator[str]:
+        if not base:
+            return iter(self._files)
+        prefix = base + "/"
+        start = bisect.bisect_left(self._files, prefix)
+        return itertools.takewhile(
+            lambda p: p.startswith(prefix), itertools.islice(self._files, start, None)
+        )
+
+    def blob_sha(self, relative_path: str | Path) -> Optional[str]:
+        """
+        Return the git blob SHA of a file's content.
+
+        None for untracked files and for tracked files modified in the work
+        tree, whose content is not (yet) a git object.
+        """
+        return self._blob_shas.get(_normalize(relative_path))
+
+    # File access
+
+    @property
+    def reads_objects(self) -> bool:
+        """True if file contents come from the git object database."""
+        return self.object_reader is not None
+
+    def path(self, relative_path: str | Path) -> Path:
+        """Return the absolute filesystem path of an indexed file."""
+        return self.root / _normalize(relative_path)
+
+    def read_bytes(self, relative_path: str | Path) -> bytes:
+        """Read an indexed file's raw content."""
+        if self.object_reader is not None:
+            blob_sha = self.blob_sha(relative_path)
+            if blob_sha is None:
+                raise FileNotFoundError(f"Not in tree: {relative_path}")
+            return self.object_reader.read(blob_sha)
+        return self.path(relative_path).read_bytes()
+
+    def open_binary(self, relative_path: str | Path) -> BinaryIO:
+        """
+        Open an indexed file for streaming binary reads.
+
+        Work tree files are opened directly; with object reads the blob is
+        fetched and wrapped in a BytesIO.
+        """
+        if self.object_reader is not None:
+            return io.BytesIO(self.read_bytes(relative_path))
+        return self.path(relative_path).open("rb")
+
+    def read_text(self, relative_path: str | Path, errors: str = "replace") -> str:
+        """Read an indexed file as text."""
+        if self.object_reader is not None:
+            return self.read_bytes(relative_path).decode("utf-8", errors=errors)
+        return self.path(relative_path).read_text(errors=errors)
+
+
+def _git_ls_files(root: Path) -> tuple[list[str], dict[str, str]]:
+    """
+    List tracked and untracked (non-ignored) files with their blob SHAs.
+
+    ``--stage`` gives the blob SHA of every tracked file; a second listing of
+    untracked and work-tree-modified files tells which of those SHAs cannot be
+    trusted for the content on disk. Files outside a sparse checkout (tagged
+    ``S`` by ``-t``) are left out, since their blobs may not even be local.
+    """
+    staged = _run_git(root, "ls-files", "-z", "-t", "--stage")
+    changed = _run_git(root, "ls-files", "-z", "--others", "--modified", "--exclude-standard")
+
+    blob_shas: dict[str, str] = {}
+    for entry in staged:
+        meta, _, path = entry.partition("\t")
+        tag, mode, sha, _stage = meta.split(" ")
+        if tag != "S" and mode != "160000":  # skip sparse entries and submodule commits
+            blob_shas[path] = sha
+
+    files = set(blob_shas)
+    for path in changed:
+        files.add(path)
+        blob_shas.pop(path, None)
+    # Deleted-but-tracked files show up as modified and are not on disk
+    files = [p for p in files if p in blob_shas or (root / p).is_file()]
+    return files, blob_shas
+
+
+def _run_git(root: Path, *args: str) -> list[str]:
+    """Run a NUL-separated git listing command and return its entries."""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=root,
+        capture_output=True,
+        check=True,
+    )
+    entries = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    return [entry for entry in entries if entry]
+
+
+def tree_has_suffix(root: str | Path, *suffixes: str, max_depth: int) -> bool:
+    """
+    Return True if a file in the work tree ends with one of the suffixes.
+
+    Walks breadth-first, at most ``max_depth`` directories deep, pruning
+    hidden and IGNORED_DIRS directories, and stops at the first match, so
+    only the top of a large tree is listed.
+
+    Args:
+        root: Directory to search
+        suffixes: File name endings (e.g. ".py")
+        max_depth: Deepest directory level to look at (0 is ``root`` itself)
+
+    Returns:
+        True on the first matching file
+    """
+    level = [str(root)]
+    for depth in range(max_depth + 1):
+        subdirs = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith(".") and entry.name not in IGNORED_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.name.endswith(suffixes):
+                            return True
+            except OSError:
+                continue
+        if not subdirs:
+            break
+        level = subdirs
+    return False
+
+
+def _walk_files(root: Path) -> list[str]:
+    """Walk the filesystem, pruning hidden and ignored directories."""
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        dirnames[:] = [
+            d for d in dirnames
+            if not d.startswith(".") and d not in IGNORED_DIRS
+        ]
+        for name in filenames:
+            rel = name if rel_dir == "." else os.path.join(rel_dir, name)
+            files.append(Path(rel).as_posix())
+    return files
@@ -0,0 +1,191 @@
+"""Streaming commit log reader built on a single ``git log -z`` process."""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Full SHA, committer date (YYYY-MM-DD, committer's timezone), author name and
+# raw message, separated by ASCII unit separators. -z ends each record with NUL.
+_LOG_FORMAT = "%H%x1f%cs%x1f%an%x1f%B"
+
+_READ_SIZE = 1 << 16
+
+
+@dataclass
+class LogEntry:
+    """The commit fields CommitInfo needs, nothing more."""
+
+    sha: str  # Full commit SHA
+    date: str  # Committer date (YYYY-MM-DD)
+    author: str  # Author name
+    message: str  # Raw commit message
+
+    @property
+    def summary(self) -> str:
+        """First line of the message."""
+        return self.message.split("\n", 1)[0]
+
+
+def iter_log(
+    repo_path: str | Path,
+    max_count: Optional[int] = None,
+    rev: str = "HEAD",
+    paths: Sequence[str] = (),
+) -> Iterator[LogEntry]:
+    """
+    Stream commits from ``git log``, newest first.
+
+    Output is parsed incrementally as git produces it, so memory stays flat
+    regardless of history length and consumers can stop early (the git
+    process is killed when the generator is closed).
+
+    Args:
+        repo_path: Path to the repository (work tree or bare git dir)
+        max_count: Maximum number of commits (None = whole history)
+        rev: Revision to start from
+        paths: Only commits touching these paths
+
+    Yields:
+        LogEntry per commit
+
+    Raises:
+        subprocess.CalledProcessError: If git log fails (e.g. no commits yet)
+    """
+    args = ["git", "log", "-z", f"--format={_LOG_FORMAT}"]
+    if max_count:
+        args.append(f"--max-count={max_count}")
+    args.append(rev)
+    if paths:
+        args += ["--", *paths]
+
+    for record in _stream_records(args, repo_path):
+        entry = _parse_record(record)
+        if entry is not None:
+            yield entry
+
+
+def first_commit_dates(
+    repo_path: str | Path,
+    parent_dir: str,
+    rev: str = "HEAD",
+) -> dict[str, str]:
+    """
+    Date of the first commit touching each sub-directory of a directory.
+
+    One ``git log --reverse --name-only`` pass over the history of
+    ``parent_dir`` replaces a separate history walk per sub-directory.
+
+    Args:
+        repo_path: Path to the repository (work tree or bare git dir)
+        parent_dir: Directory relative to the repo root (e.g. "src/transformers/models")
+        rev: Revision whose history is walked
+
+    Returns:
+        Dict mapping sub-directory path ("<parent_dir>/<name>") to YYYY-MM-DD
+
+    Raises:
+        subprocess.CalledProcessError: If git log fails
+    """
+    prefix = parent_dir.strip("/") + "/"
+    args = [
+        "git", "log", "--reverse", "--name-only", "--no-renames", "-z",
+        "--format=%x1e%cs", rev, "--", prefix,
+    ]
+
+    dates: dict[str, str] = {}
+    date = None
+    for record in _stream_records(args, repo_path):
+        text = record.decode("utf-8", errors="surrogateescape")
+        if text.startswith("\x1e"):
+            date = text[1:]  # commit header; file names follow
+            continue
+        path = text.lstrip("\n")
+        if date is None or not path.startswith(prefix):
+            continue
+        name, sep, _ = path[len(prefix):].partition("/")
+        if sep:
+            dates.setdefault(prefix + name, date)
+    return dates
+
+
+def rev_list(
+    repo_path: str | Path,
+    rev: str = "HEAD",
+    max_count: Optional[int] = None,
+) -> list[str]:
+    """
+    List commit SHAs reachable from a revision, newest first (same order as iter_log).
+
+    Args:
+        repo_path: Path to the repository
+        rev: Revision or range
+        max_count: Maximum number of commits
+
+    Returns:
+        Full commit SHAs
+    """
+    args = ["git", "rev-list"]
+    if max_count:
+        args.append(f"--max-count={max_count}")
+    args.append(rev)
+    result = subprocess.run(args, cwd=repo_path, capture_output=True, check=True)
+    return result.stdout.decode("ascii").split()
+
+
+def _stream_records(args: list[str], repo_path: str | Path) -> Iterator[bytes]:
+    """
+    Run a git command and yield its NUL-separated output records as they arrive.
+
+    The process is killed if the consumer stops early. Its stderr goes to a
+    temporary file rather than a pipe (an unread pipe fills up and stalls
+    git) and is included in the CalledProcessError raised on failure.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            args,
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        try:
+            pending = b""
+            while True:
+                chunk = proc.stdout.read1(_READ_SIZE)
+                if not chunk:
+                    break
+                *records, pending = (pending + chunk).split(b"\0")
+                yield from records
+            if pending:
+                yield pending
+
+            returncode = proc.wait()
+            if returncode:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    returncode, args, stderr=stderr.read().decode(errors="replace")
+                )
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+
+def _parse_record(record: bytes) -> Optional[LogEntry]:
+    """Split one NUL-terminated log record into its fields."""
+    if not record:
+        return None
+    fields = record.decode("utf-8", errors="replace").split("\x1f", 3)
+    if len(fields) != 4:
+        logger.debug("Skipping malformed log record: %r", record[:80])
+        return None
+    sha, date, author, message = fields
+    return LogEntry(sha=sha, date=date, author=author, message=message)
+
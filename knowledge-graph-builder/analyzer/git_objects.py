@@ -0,0 +1,226 @@
+"""Read repository content straight from the git object database."""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GitObjectReader:
+    """
+    Streams blob contents through one long-lived ``git cat-file --batch`` process.
+
+    Works on bare, ``--no-checkout`` and blobless (``--filter=blob:none``)
+    clones: git fetches missing blobs from the promisor remote on demand.
+    Safe to share between threads; requests are serialized on one pipe.
+
+    Example usage:
+        with GitObjectReader("/path/to/mirror.git") as reader:
+            data = reader.read("HEAD:setup.py")
+    """
+
+    def __init__(self, repo_path: str | Path):
+        """
+        Prepare a reader; the cat-file process starts on the first read.
+
+        Args:
+            repo_path: Path to the repository (work tree or bare git dir)
+        """
+        self.repo_path = Path(repo_path)
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+
+    def _start(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def read(self, object_name: str) -> bytes:
+        """
+        Return the raw content of an object.
+
+        Args:
+            object_name: Object SHA or any rev expression (e.g. "HEAD:README.md")
+
+        Returns:
+            Object content as bytes
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+        """
+        with self._lock:
+            proc = self._start()
+            proc.stdin.write(object_name.encode("utf-8", errors="surrogateescape") + b"\n")
+            proc.stdin.flush()
+            header = proc.stdout.readline()
+            if not header:
+                self._proc = None
+                raise OSError(f"git cat-file exited while reading {object_name}")
+            parts = header.split()
+            if len(parts) < 3 or parts[-1] == b"missing":
+                raise FileNotFoundError(f"git object not found: {object_name}")
+            size = int(parts[2])
+            data = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing newline
+            return data
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        with self._lock:
+            if self._proc is not None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._proc.kill()
+                self._proc = None
+
+    def __enter__(self) -> GitObjectReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def ls_tree(repo_path: str | Path, rev: str = "HEAD") -> dict[str, str]:
+    """
+    List every blob in a commit's tree.
+
+    Only tree objects are read, so this works without a checkout and without
+    blobs being present locally.
+
+    Args:
+        repo_path: Path to the repository (work tree or bare git dir)
+        rev: Commit or tree to list
+
+    Returns:
+        Dict mapping relative file path to blob SHA
+    """
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "--full-tree", rev],
+        cwd=repo_path,
+        capture_output=True,
+        check=True,
+    )
+    blobs: dict[str, str] = {}
+    for entry in result.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        if not entry:
+            continue
+        meta, _, path = entry.partition("\t")
+        _mode, obj_type, sha = meta.split(" ")
+        if obj_type == "blob":
+            blobs[path] = sha
+    return blobs
+
+
+def subtree_shas(repo_path: str | Path, parent_dir: str, rev: str = "HEAD") -> dict[str, str]:
+    """
+    Return the tree SHA of each immediate sub-directory of a directory.
+
+    A tree SHA changes whenever anything below the directory changes, so it
+    identifies the directory's whole content at ``rev``.
+
+    Args:
+        repo_path: Path to the repository (work tree or bare git dir)
+        parent_dir: Directory relative to the repo root
+        rev: Commit to read
+
+    Returns:
+        Dict mapping sub-directory path ("<parent_dir>/<name>") to tree SHA
+    """
+    result = subprocess.run(
+        ["git", "ls-tree", "-z", "--full-tree", rev, parent_dir.strip("/") + "/"],
+        cwd=repo_path,
+        capture_output=True,
+        check=True,
+    )
+    trees: dict[str, str] = {}
+    for entry in result.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        if not entry:
+            continue
+        meta, _, path = entry.partition("\t")
+        _mode, obj_type, sha = meta.split(" ")
+        if obj_type == "tree":
+            trees[path] = sha
+    return trees
+
+
+def changed_from_tree(repo_path: str | Path, under: str, rev: str = "HEAD") -> list[str]:
+    """
+    List tracked files under a directory whose index or work tree content differs from ``rev``.
+
+    Untracked files are not included (the file index reports those without a
+    blob SHA).
+
+    Args:
+        repo_path: Path to the repository work tree
+        under: Directory relative to the repo root
+        rev: Commit to compare against
+
+    Returns:
+        Relative paths of staged, modified or deleted files
+    """
+    result = subprocess.run(
+        ["git", "diff-index", "--name-only", "-z", rev, "--", under],
+        cwd=repo_path,
+        capture_output=True,
+        check=True,
+    )
+    return [p for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def lacks_work_tree(repo_path: str | Path) -> bool:
+    """
+    Return True for git repositories whose files are not checked out.
+
+    That is bare repositories (e.g. mirrors) and ``--no-checkout`` clones or
+    worktrees, which have no git index yet. Their content must be read from
+    the object database. A repository whose HEAD has no commit (e.g. right
+    after ``git init``, which has no index either) has nothing there to read,
+    so it counts as checked out.
+    """
+    repo_path = Path(repo_path)
+    git_dir = repo_path / ".git"
+    if git_dir.is_file():
+        # Linked worktree or submodule: .git is a "gitdir: ..." pointer
+        pointer = git_dir.read_text(encoding="utf-8", errors="replace").strip()
+        if not pointer.startswith("gitdir:"):
+            return False
+        git_dir = repo_path / pointer[len("gitdir:"):].strip()
+    if git_dir.is_dir():
+        return not (git_dir / "index").is_file() and _head_resolves(repo_path)
+    return (
+        (repo_path / "HEAD").is_file()
+        and (repo_path / "objects").is_dir()
+        and _head_resolves(repo_path)
+    )
+
+
+def _head_resolves(repo_path: Path) -> bool:
+    """Return True if HEAD points to a commit."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", "HEAD^{commit}"],
+            cwd=repo_path,
+            capture_output=True,
+        )
+    except OSError:
+        return False
+    return result.returncode == 0
@@ -0,0 +1,260 @@
+"""Incremental re-analysis: persisted results and change detection."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from analyzer.file_index import RepoFileIndex
+from analyzer.mirror import normalize_url
+from analyzer.models import UniversalRepoAnalysis
+from analyzer.parse_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or the patching logic changes
+STATE_VERSION = 3
+
+# Config keys that do not affect analysis results
+_RUNTIME_CONFIG_KEYS = frozenset({
+    "incremental", "parse_workers", "parse_chunk_size", "use_parse_cache",
+    "cache_dir", "parse_cache_max_bytes", "use_detection_cache",
+    "doc_workers", "source_url",
+})
+
+
+@dataclass
+class RepoChanges:
+    """What changed in a repository since a previously analyzed commit."""
+
+    since_sha: str  # HEAD of the previous analysis
+    head_sha: str  # Current HEAD
+    changed_paths: set[str] = field(default_factory=set)  # Added/modified/deleted files
+    new_commits: int = 0  # Number of commits in since_sha..head_sha
+
+    def __post_init__(self):
+        # Every ancestor directory of a changed path, for touches()
+        dirs: set[str] = set()
+        for path in self.changed_paths:
+            parent = posixpath.dirname(path)
+            while parent and parent not in dirs:
+                dirs.add(parent)
+                parent = posixpath.dirname(parent)
+        self._changed_dirs = frozenset(dirs)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if neither files nor history changed."""
+        return not self.changed_paths and not self.new_commits
+
+    @property
+    def commit_range(self) -> str:
+        """Revision range of the new commits."""
+        return f"{self.since_sha}..{self.head_sha}"
+
+    def touches(self, relative_path: str) -> bool:
+        """Return True if the file, or anything under the directory, changed."""
+        path = relative_path.strip("/")
+        return path in self.changed_paths or path in self._changed_dirs
+
+
+@dataclass
+class StoredAnalysis:
+    """A persisted analysis and the repository state it describes."""
+
+    analysis: UniversalRepoAnalysis
+    head_sha: str
+    dirty_paths: list[str] = field(default_factory=list)  # Uncommitted files at the time
+
+
+class AnalysisStore:
+    """
+    Keeps the last analysis of each repository on disk.
+
+    One JSON file per (repository, analyzer), stored with the HEAD SHA it was
+    computed at and a fingerprint of the result-affecting config. A stored
+    analysis is only handed out for the same analyzer and fingerprint.
+    Repositories are identified by repo_key(): the source URL for clones
+    (whose checkout directory may be temporary), else the resolved path.
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Args:
+            root: Directory holding the stored analyses
+        """
+        self.root = Path(root)
+
+    @classmethod
+    def open_default(cls, cache_dir: Optional[str | Path] = None) -> AnalysisStore:
+        """Return the store under the shared cache directory."""
+        return cls((Path(cache_dir) if cache_dir else default_cache_dir()) / "analyses")
+
+    def _path(self, key: str, analyzer_name: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return self.root / f"{digest}-{analyzer_name}.json"
+
+    def load(
+        self,
+        key: str,
+        analyzer_name: str,
+        fingerprint: str,
+    ) -> Optional[StoredAnalysis]:
+        """
+        Load the previous analysis of a repository.
+
+        Args:
+            key: repo_key() of the repository
+            analyzer_name: Analyzer class name
+            fingerprint: config_fingerprint() of the current config
+
+        Returns:
+            StoredAnalysis, or None if there is no usable one
+        """
+        path = self._path(key, analyzer_name)
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable stored analysis %s: %s", path, e)
+            return None
+
+        if data.get("version") != STATE_VERSION or data.get("fingerprint") != fingerprint:
+            logger.info("Stored analysis is for a different config, running full analysis")
+            return None
+        try:
+            return StoredAnalysis(
+                analysis=UniversalRepoAnalysis.from_dict(data["analysis"]),
+                head_sha=data["head_sha"],
+                dirty_paths=data.get("dirty_paths", []),
+            )
+        except (KeyError, ValueError) as e:
+            logger.warning("Ignoring malformed stored analysis %s: %s", path, e)
+            return None
+
+    def save(
+        self,
+        key: str,
+        analyzer_name: str,
+        fingerprint: str,
+        stored: StoredAnalysis,
+    ) -> None:
+        """Persist an analysis (written atomically; failures are logged)."""
+        path = self._path(key, analyzer_name)
+        data = {
+            "version": STATE_VERSION,
+            "repo": key,
+            "fingerprint": fingerprint,
+            "head_sha": stored.head_sha,
+            "dirty_paths": stored.dirty_paths,
+            "analysis": stored.analysis.to_dict(),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning("Could not store analysis at %s: %s", path, e)
+
+
+def repo_key(repo_path: str | Path, source_url: Optional[str] = None) -> str:
+    """
+    Identify a repository across runs.
+
+    Args:
+        repo_path: Repository root
+        source_url: URL the checkout was cloned from, if any
+
+    Returns:
+        The normalized URL (see mirror.normalize_url) for clones, so a fresh
+        temporary checkout still finds the previous analysis; otherwise the
+        resolved path
+    """
+    if source_url:
+        return normalize_url(source_url)
+    return str(Path(repo_path).resolve())
+
+
+def config_fingerprint(config: dict) -> str:
+    """Hash the config entries that affect analysis results."""
+    relevant = {k: v for k, v in config.items() if k not in _RUNTIME_CONFIG_KEYS}
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def resolve_head(repo_path: str | Path) -> Optional[str]:
+    """Return the full SHA of HEAD, or None (e.g. empty repository)."""
+    try:
+        return _git(repo_path, "rev-parse", "--verify", "HEAD^{commit}").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dirty_paths(index: RepoFileIndex) -> list[str]:
+    """Indexed files whose content is not a committed blob (untracked or modified)."""
+    if index.reads_objects:
+        return []
+    return [path for path in index if index.blob_sha(path) is None]
+
+
+def detect_changes(
+    repo_path: str | Path,
+    stored: StoredAnalysis,
+    head_sha: str,
+    index: RepoFileIndex,
+) -> Optional[RepoChanges]:
+    """
+    Work out what changed since a stored analysis.
+
+    Changed paths are the files differing between the two commits, plus
+    uncommitted files now and at the previous run (their content is not tied
+    to a commit, so they are always re-read).
+
+    Args:
+        repo_path: Repository root
+        stored: Previous analysis
+        head_sha: Current HEAD
+        index: Current file index
+
+    Returns:
+        RepoChanges, or None if the stored commit is not an ancestor of HEAD
+        (history rewritten, or missing from a shallow clone)
+    """
+    since = stored.head_sha
+    try:
+        if since != head_sha:
+            _git(repo_path, "merge-base", "--is-ancestor", since, head_sha)
+        diff = _git(repo_path, "diff", "--name-only", "--no-renames", "-z", since, head_sha)
+        new_commits = int(_git(repo_path, "rev-list", "--count", f"{since}..{head_sha}"))
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        logger.info("Cannot diff against %s (%s), running full analysis", since[:8], e)
+        return None
+
+    changed = {p for p in diff.split("\0") if p}
+    changed.update(stored.dirty_paths)
+    changed.update(dirty_paths(index))
+    return RepoChanges(
+        since_sha=since,
+        head_sha=head_sha,
+        changed_paths=changed,
+        new_commits=new_commits,
+    )
+
+
+def _git(repo_path: str | Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo_path,
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout.decode("utf-8", errors="surrogateescape")
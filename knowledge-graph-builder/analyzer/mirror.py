@@ -0,0 +1,245 @@
+"""Persistent local mirrors of cloned repositories."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+from urllib.parse import urlsplit
+
+from analyzer.parse_cache import default_cache_dir
+
+if TYPE_CHECKING:
+    from git import Repo as GitRepo
+
+try:
+    import fcntl
+except ImportError:  # Windows: mirrors are used without locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+
+# scp-like SSH URLs: [user@]host:path
+_SCP_URL_RE = re.compile(r"^(?:[^@/]+@)?([^:/]+):(?!//)(.+)$")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return the mirror key of a repository URL.
+
+    The scheme, user and ``.git`` suffix are dropped and the host is
+    lowercased, so ``https://github.com/org/repo.git`` and
+    ``git@github.com:org/repo`` share one mirror.
+
+    Args:
+        url: Repository URL
+
+    Returns:
+        ``host/path`` (just the path for ``file://`` URLs)
+    """
+    url = url.strip()
+    match = _SCP_URL_RE.match(url) if "://" not in url else None
+    if match:
+        host, path = match.group(1), match.group(2)
+    else:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        path = parts.path
+    path = path.strip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"{host.lower()}/{path}" if host else path
+
+
+class MirrorCache:
+    """
+    Bare mirrors of remote repositories, kept across runs.
+
+    Each URL gets one bare repository under ``<cache_dir>/mirrors``. A run
+    fetches new commits into the mirror and checks out a linked worktree
+    (``git worktree add``) from it, which shares the mirror's objects, so
+    only what changed upstream goes over the network and nothing is copied.
+    Blobs fetched on demand in a blobless mirror also land in the mirror.
+
+    Least-recently-used mirrors are removed once the cache is larger than
+    ``max_bytes``; mirrors that still have worktrees are kept.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            root: Directory holding the mirrors
+            max_bytes: Total size above which LRU eviction kicks in
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def open_default(
+        cls,
+        cache_dir: Optional[str | Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> MirrorCache:
+        """Return the mirror cache under the shared cache directory."""
+        return cls((Path(cache_dir) if cache_dir else default_cache_dir()) / "mirrors", max_bytes)
+
+    def mirror_path(self, url: str) -> Path:
+        """Return the mirror directory of a URL (whether or not it exists yet)."""
+        key = normalize_url(url)
+        name = key.rsplit("/", 1)[-1] or "repo"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return self.root / f"{name}-{digest}.git"
+
+    def checkout(
+        self,
+        url: str,
+        dest: str | Path,
+        max_commits: Optional[int] = None,
+        blobless: bool = False,
+        no_checkout: bool = False,
+    ) -> GitRepo:
+        """
+        Update the mirror of a URL and add a worktree of its HEAD at ``dest``.
+
+        Args:
+            url: Repository URL
+            dest: Worktree directory (must not be a repository yet)
+            max_commits: History depth of a new mirror; an existing shallow
+                mirror is fetched to this depth (None = whole history)
+            blobless: Create a new mirror with ``--filter=blob:none``
+            no_checkout: Add the worktree without checking out files
+
+        Returns:
+            The worktree repository (files checked out unless no_checkout)
+        """
+        from git import Git
+        from git import Repo as GitRepo
+
+        mirror = self.mirror_path(url)
+        if not self.root.is_dir():
+            logger.info(
+                "Creating mirror cache in %s (least recently used mirrors are evicted above %.1f GiB)",
+                self.root, self.max_bytes / 1024**3,
+            )
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock(mirror):
+            self._update(url, mirror, max_commits, blobless)
+            logger.info("Adding worktree at %s", dest)
+            git = Git(mirror)
+            git.worktree("prune")
+            git.worktree("add", "--detach", "--no-checkout", str(Path(dest).resolve()), "HEAD")
+            os.utime(mirror)
+        worktree = GitRepo(dest)
+        if not no_checkout:
+            worktree.git.checkout()
+        self.evict(keep=mirror)
+        return worktree
+
+    def _update(self, url: str, mirror: Path, max_commits: Optional[int], blobless: bool) -> None:
+        """Create the mirror, or fetch what changed upstream into it."""
+        from git import Git
+        from git import Repo as GitRepo
+
+        if not (mirror / "HEAD").is_file():
+            shutil.rmtree(mirror, ignore_errors=True)
+            logger.info("Creating mirror of %s in %s", url, mirror)
+            clone_args = {}
+            if max_commits:
+                clone_args["depth"] = max_commits
+            if blobless:
+                clone_args["filter"] = "blob:none"
+            GitRepo.clone_from(url, str(mirror), bare=True, **clone_args)
+            # Bare clones have no fetch refspec; keep branches as they are upstream
+            Git(mirror).config("remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+            return
+
+        logger.info("Fetching %s into mirror %s", url, mirror)
+        git = Git(mirror)
+        git.remote("set-url", "origin", url)
+        fetch_args = ["--prune", "--tags"]
+        if (mirror / "shallow").is_file():
+            fetch_args.append(f"--depth={max_commits}" if max_commits else "--unshallow")
+        git.fetch("origin", *fetch_args)
+
+    def evict(self, keep: Optional[Path] = None) -> list[Path]:
+        """
+        Remove least-recently-used mirrors until the cache fits in max_bytes.
+
+        Mirrors with live worktrees, mirrors another process is updating and
+        ``keep`` are never removed.
+
+        Args:
+            keep: Mirror to leave in place (e.g. the one just used)
+
+        Returns:
+            Removed mirror directories
+        """
+        if not self.root.is_dir():
+            return []
+        mirrors = [p for p in self.root.glob("*.git") if p.is_dir()]
+        sizes = {p: _dir_size(p) for p in mirrors}
+        total = sum(sizes.values())
+        removed: list[Path] = []
+        for mirror in sorted(mirrors, key=lambda p: p.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and mirror == keep:
+                continue
+            with self._lock(mirror, blocking=False) as locked:
+                if not locked or _has_worktrees(mirror):
+                    continue
+                logger.info("Evicting mirror %s (%.1f MiB)", mirror.name, sizes[mirror] / 2**20)
+                shutil.rmtree(mirror, ignore_errors=True)
+            total -= sizes[mirror]
+            removed.append(mirror)
+        return removed
+
+    @contextlib.contextmanager
+    def _lock(self, mirror: Path, blocking: bool = True) -> Iterator[bool]:
+        """Hold an exclusive lock on a mirror; yields False if non-blocking and busy."""
+        if fcntl is None:
+            yield True
+            return
+        with open(mirror.with_suffix(".lock"), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _has_worktrees(mirror: Path) -> bool:
+    """True if a worktree of the mirror still exists (stale entries are pruned)."""
+    from git import Git
+
+    try:
+        Git(mirror).worktree("prune")
+    except Exception as e:
+        logger.debug("Could not prune worktrees of %s: %s", mirror, e)
+    worktrees = mirror / "worktrees"
+    return worktrees.is_dir() and any(worktrees.iterdir())
+
+
+def _dir_size(path: Path) -> int:
+    """Total size in bytes of the files below a directory."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
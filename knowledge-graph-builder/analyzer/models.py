@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional
 
 
 class RepoType(str, Enum):
@@ -18,7 +21,7 @@ class RepoType(str, Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(slots=True)
 class ComponentInfo:
     """Universal component representation (class, function, module, etc.)."""
 
@@ -47,7 +50,7 @@ class ComponentInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommitInfo:
     """Universal commit representation."""
 
@@ -82,6 +85,199 @@ class CommitInfo:
         )
 
 
+def _intern(value):
+    """Intern strings (repeated pool values then share one object)."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class _FrozenDict(dict):
+    """Read-only dict handed out as the metadata of table rows."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("metadata of a table row is read-only; append a new record instead")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles are plain, writable dicts
+        return dict, (dict(self),)
+
+
+_EMPTY_METADATA = _FrozenDict()
+
+
+class _Row:
+    """
+    Mixin for the records a _RecordTable hands out: read-only snapshots.
+
+    Fields can be set once (by __init__), so dataclasses.replace() works, but
+    assigning to a field of a row raises instead of being lost. Rows compare
+    equal to plain records with the same fields; copies and pickles of a row
+    are plain records.
+    """
+
+    __slots__ = ()
+    _record_type: type
+
+    def __setattr__(self, name: str, value) -> None:
+        try:
+            getattr(self, name)
+        except AttributeError:
+            object.__setattr__(self, name, value)
+            return
+        raise AttributeError(
+            f"{self._record_type.__name__} rows of a table are read-only snapshots; "
+            f"use dataclasses.replace() and append the result instead"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self._record_type.__name__} rows of a table are read-only snapshots")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, self._record_type):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(self._record_type))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        text = super().__repr__()
+        return self._record_type.__name__ + text[text.index("("):]
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles are plain, writable records
+        values = {f.name: getattr(self, f.name) for f in fields(self._record_type)}
+        values["metadata"] = dict(values["metadata"])
+        return _rebuild_record, (self._record_type, values)
+
+
+def _rebuild_record(record_type: type, values: dict):
+    return record_type(**values)
+
+
+class _ComponentRow(_Row, ComponentInfo):
+    __slots__ = ()
+    _record_type = ComponentInfo
+
+
+class _CommitRow(_Row, CommitInfo):
+    __slots__ = ()
+    _record_type = CommitInfo
+
+
+class _RecordTable(Sequence):
+    """
+    Columnar, list-like container of records.
+
+    Each field is stored as a column instead of one object per record:
+    ``_plain_fields`` as lists of values, ``_pooled_fields`` (few distinct
+    values, e.g. authors or file paths) as an ``array`` of indices into a
+    shared pool of interned values. Metadata is kept only for the rows that
+    have any.
+
+    Indexing and iteration build records on the fly, so the records handed
+    out are read-only snapshots: assigning to their fields or metadata raises.
+    Modify the table with append()/extend().
+    """
+
+    _row_type: type[_Row]
+    _plain_fields: tuple[str, ...] = ()
+    _pooled_fields: tuple[str, ...] = ()
+
+    def __init__(self, records: Iterable = ()):
+        """
+        Args:
+            records: Initial records
+        """
+        self._plain: dict[str, list] = {f: [] for f in self._plain_fields}
+        self._pooled: dict[str, array] = {f: array("I") for f in self._pooled_fields}
+        self._pool: list = []
+        self._pool_index: dict = {}
+        self._metadata: dict[int, _FrozenDict] = {}
+        self._size = 0
+        # Bumped on every change, so views derived from the table can be cached
+        self.version = 0
+        self.extend(records)
+
+    def _pool_id(self, value) -> int:
+        key = tuple(value) if isinstance(value, list) else value
+        pool_id = self._pool_index.get(key)
+        if pool_id is None:
+            pool_id = self._pool_index[key] = len(self._pool)
+            if isinstance(key, tuple):
+                self._pool.append(tuple(_intern(v) for v in key))
+            else:
+                self._pool.append(_intern(key))
+        return pool_id
+
+    def append(self, record) -> None:
+        """Add a record at the end (its metadata is copied)."""
+        for name, column in self._plain.items():
+            column.append(getattr(record, name))
+        for name, column in self._pooled.items():
+            column.append(self._pool_id(getattr(record, name)))
+        if record.metadata:
+            self._metadata[self._size] = _FrozenDict(record.metadata)
+        self._size += 1
+        self.version += 1
+
+    def extend(self, records: Iterable) -> None:
+        """Add records at the end."""
+        for record in records:
+            self.append(record)
+
+    def _record(self, row: int) -> _Row:
+        values = {name: column[row] for name, column in self._plain.items()}
+        for name, column in self._pooled.items():
+            value = self._pool[column[row]]
+            values[name] = list(value) if isinstance(value, tuple) else value
+        return self._row_type(**values, metadata=self._metadata.get(row, _EMPTY_METADATA))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(row) for row in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("record index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[_Row]:
+        for row in range(self._size):
+            yield self._record(row)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (_RecordTable, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._size} records)"
+
+
+class ComponentTable(_RecordTable):
+    """Columnar list of ComponentInfo (names, paths and types are pooled)."""
+
+    _row_type = _ComponentRow
+    _pooled_fields = ("name", "path", "type")
+
+
+class CommitTable(_RecordTable):
+    """Columnar list of CommitInfo (dates, authors and tag lists are pooled)."""
+
+    _row_type = _CommitRow
+    _plain_fields = ("sha", "message")
+    _pooled_fields = ("date", "author", "tags")
+
+
 @dataclass
 class DocumentationInfo:
     """Universal documentation representation."""
@@ -121,15 +317,19 @@ class UniversalRepoAnalysis:
 
     This data model supports all repository types with a common interface
     while allowing type-specific extensions.
+
+    When loaded with analyzer.serialization.read_analysis(), the list fields
+    and ``structure`` are read-only views that stream from disk on iteration.
     """
 
     # Metadata
     repo_type: RepoType  # Detected repository type
     repo_path: str  # Analyzed repository path
 
-    # Core fields (present in all repo types)
-    components: list[ComponentInfo] = field(default_factory=list)
-    commits: list[CommitInfo] = field(default_factory=list)
+    # Core fields (present in all repo types); lists of components and
+    # commits are stored as ComponentTable / CommitTable
+    components: Sequence[ComponentInfo] = field(default_factory=ComponentTable)
+    commits: Sequence[CommitInfo] = field(default_factory=CommitTable)
     documentation: list[DocumentationInfo] = field(default_factory=list)
 
     # Structural info
@@ -142,6 +342,15 @@ class UniversalRepoAnalysis:
     # Metadata
     metadata: dict = field(default_factory=dict)
 
+    # Cached backward-compatible views: name -> (source, version, view)
+    _views: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if isinstance(self.components, list):
+            self.components = ComponentTable(self.components)
+        if isinstance(self.commits, list):
+            self.commits = CommitTable(self.commits)
+
     def to_dict(self) -> dict:
         """Serialize to dict."""
         return {
@@ -150,7 +359,7 @@ class UniversalRepoAnalysis:
             "components": [c.to_dict() for c in self.components],
             "commits": [c.to_dict() for c in self.commits],
             "documentation": [d.to_dict() for d in self.documentation],
-            "structure": self.structure,
+            "structure": dict(self.structure.items()),
             "dependencies": self.dependencies,
             "extensions": self.extensions,
             "metadata": self.metadata,
@@ -162,8 +371,8 @@ class UniversalRepoAnalysis:
         return cls(
             repo_type=RepoType(d["repo_type"]),
             repo_path=d["repo_path"],
-            components=[ComponentInfo.from_dict(c) for c in d.get("components", [])],
-            commits=[CommitInfo.from_dict(c) for c in d.get("commits", [])],
+            components=ComponentTable(ComponentInfo.from_dict(c) for c in d.get("components", [])),
+            commits=CommitTable(CommitInfo.from_dict(c) for c in d.get("commits", [])),
             documentation=[DocumentationInfo.from_dict(doc) for doc in d.get("documentation", [])],
             structure=d.get("structure", {}),
             dependencies=d.get("dependencies", {}),
@@ -190,8 +399,10 @@ class UniversalRepoAnalysis:
         Alias for commits (backward compatibility).
 
         This property maintains compatibility with the old RepoAnalysis.key_commits field.
+        The list is built once and reused until ``commits`` changes; treat it
+        as read-only.
         """
-        return [c.to_dict() for c in self.commits]
+        return self._cached_view("key_commits", self.commits)
 
     @property
     def doc_summaries(self) -> list[dict]:
@@ -199,5 +410,25 @@ class UniversalRepoAnalysis:
         Alias for documentation (backward compatibility).
 
         This property maintains compatibility with the old RepoAnalysis.doc_summaries field.
+        The list is cached only when ``documentation`` is a read-only lazy
+        section; treat it as read-only.
+        """
+        return self._cached_view("doc_summaries", self.documentation)
+
+    def _cached_view(self, name: str, source: Sequence) -> list[dict]:
+        """
+        Return [r.to_dict() for r in source].
+
+        Only sources that count their changes in ``version`` (record tables,
+        read-only lazy sections) are cached, keyed on their identity and
+        version; plain lists can change in place unnoticed, so their view is
+        rebuilt on every access.
         """
-        return [d.to_dict() for d in self.documentation]
+        version = getattr(source, "version", None)
+        if version is None:
+            return [r.to_dict() for r in source]
+        cached = self._views.get(name)
+        if cached is None or cached[0] is not source or cached[1] != version:
+            cached = (source, version, [r.to_dict() for r in source])
+            self._views[name] = cached
+        return cached[2]
@@ -0,0 +1,215 @@
+"""Persistent per-file parse cache keyed by git blob SHA."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction logic changes so stale entries are never served
+PARSER_VERSION = 4
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Pending writes are committed in batches of this size
+_FLUSH_EVERY = 500
+
+
+def default_cache_dir() -> Path:
+    """Return the cache root ($KG_CACHE_DIR or ~/.cache/knowledge-graph-builder)."""
+    env = os.environ.get("KG_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    return Path.home() / ".cache" / "knowledge-graph-builder"
+
+
+class ParseCache:
+    """
+    SQLite cache of extraction results, keyed by (kind, git blob SHA).
+
+    A blob SHA identifies file content exactly, so an entry stays valid for as
+    long as it exists: unchanged files are never read or parsed again, across
+    runs and across repositories. ``kind`` separates the different extractors
+    (Python parse records, per-analyzer doc summaries, ...).
+
+    Entries are evicted least-recently-used once the stored payload exceeds
+    ``max_bytes``. Hit/miss counters cover the lifetime of the instance.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) a cache database.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Payload size above which LRU eviction kicks in
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        self._pending_puts: dict[str, tuple[str, int, float]] = {}
+        self._pending_touches: dict[str, float] = {}
+
+    @classmethod
+    def open_default(
+        cls,
+        cache_dir: Optional[str | Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> Optional[ParseCache]:
+        """
+        Open the shared parse cache, or return None if it cannot be opened.
+
+        Args:
+            cache_dir: Cache root directory (default: default_cache_dir())
+            max_bytes: Payload size above which LRU eviction kicks in
+
+        Returns:
+            ParseCache instance, or None (caching is then simply disabled)
+        """
+        root = Path(cache_dir) if cache_dir else default_cache_dir()
+        try:
+            return cls(root / "parse_cache.sqlite", max_bytes=max_bytes)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Parse cache unavailable at %s: %s", root, e)
+            return None
+
+    @staticmethod
+    def _key(kind: str, blob_sha: str) -> str:
+        return f"{kind}:{PARSER_VERSION}:{blob_sha}"
+
+    def get(self, kind: str, blob_sha: Optional[str]) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            kind: Extractor name (e.g. "python", "doc:GenericAnalyzer")
+            blob_sha: Git blob SHA of the file (None = uncacheable, always a miss)
+
+        Returns:
+            The cached JSON value, or None on a miss
+        """
+        if not blob_sha:
+            self.misses += 1
+            return None
+        key = self._key(kind, blob_sha)
+        pending = self._pending_puts.get(key)
+        if pending is not None:
+            self.hits += 1
+            return json.loads(pending[0])
+        row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._pending_touches[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, kind: str, blob_sha: Optional[str], value: Any) -> None:
+        """
+        Store a JSON-serializable value for a blob.
+
+        Args:
+            kind: Extractor name
+            blob_sha: Git blob SHA of the file (None = not stored)
+            value: JSON-serializable extraction result
+        """
+        if not blob_sha:
+            return
+        payload = json.dumps(value, separators=(",", ":"))
+        self._pending_puts[self._key(kind, blob_sha)] = (payload, len(payload), time.time())
+        if len(self._pending_puts) >= _FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending entries and LRU timestamps, then evict if over budget."""
+        if not self._pending_puts and not self._pending_touches:
+            return
+        try:
+            with self._conn:
+                if self._pending_touches:
+                    self._conn.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?",
+                        [(ts, key) for key, ts in self._pending_touches.items()],
+                    )
+                for key, (value, size, ts) in self._pending_puts.items():
+                    old = self._conn.execute(
+                        "SELECT size FROM entries WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                        (key, value, size, ts),
+                    )
+                    self._total_bytes += size - (old[0] if old else 0)
+        except sqlite3.Error as e:
+            logger.warning("Could not write parse cache: %s", e)
+        self._pending_puts.clear()
+        self._pending_touches.clear()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache is back to 90% of max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Other processes may share the database; evict against the real total
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        try:
+            with self._conn:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY last_used ASC"
+                )
+                doomed = []
+                for key, size in rows:
+                    if self._total_bytes <= target:
+                        break
+                    doomed.append((key,))
+                    self._total_bytes -= size
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+                removed = len(doomed)
+        except sqlite3.Error as e:
+            logger.warning("Could not evict parse cache entries: %s", e)
+        logger.debug("Evicted %d parse cache entries", removed)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        self.flush()
+        self._conn.close()
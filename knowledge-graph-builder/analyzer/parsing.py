@@ -0,0 +1,204 @@
+"""Regex-based Python source parsing, fanned out over a process pool."""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+from analyzer.git_objects import GitObjectReader
+
+logger = logging.getLogger(__name__)
+
+# The patterns run on raw (UTF-8) bytes so files never need decoding; only the
+# matched names are. Non-ASCII bytes count as identifier characters, so names
+# using non-ASCII letters are captured whole.
+_IDENT = rb"([\w\x80-\xff]+)"
+CLASS_RE = re.compile(rb"^class\s+" + _IDENT + rb"\s*[\(:]", re.MULTILINE)
+CLASS_WITH_BASES_RE = re.compile(rb"^class\s+" + _IDENT + rb"\s*\(([^)]+)\)\s*:", re.MULTILINE)
+FUNCTION_RE = re.compile(rb"^def\s+" + _IDENT + rb"\s*\(", re.MULTILINE)
+
+# Work tree files at least this large are memory-mapped instead of read
+MMAP_MIN_BYTES = 64 * 1024
+
+# Bases that carry no structural information
+_IGNORED_BASES = frozenset({"object", "ABC", "Enum"})
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+@dataclass
+class ParsedSource:
+    """Classes, public top-level functions and class bases found in one file."""
+
+    path: str  # File path relative to repo root
+    classes: list[str] = field(default_factory=list)  # All top-level class names
+    functions: list[str] = field(default_factory=list)  # Public top-level function names
+    bases: dict[str, list[str]] = field(default_factory=dict)  # Class name -> inherited bases
+
+    def to_dict(self) -> dict:
+        """Serialize to dict (without path, so one record can serve every copy of a blob)."""
+        return {
+            "classes": self.classes,
+            "functions": self.functions,
+            "bases": self.bases,
+        }
+
+    @classmethod
+    def from_dict(cls, path: str, d: dict) -> ParsedSource:
+        """Deserialize from dict for the given path."""
+        return cls(
+            path=path,
+            classes=d.get("classes", []),
+            functions=d.get("functions", []),
+            bases=d.get("bases", {}),
+        )
+
+
+def parse_python_source(path: str, content: str) -> ParsedSource:
+    """
+    Extract classes, functions and bases from Python source text.
+
+    Args:
+        path: File path relative to repo root (recorded on the result)
+        content: Source text
+
+    Returns:
+        ParsedSource for the file
+    """
+    return parse_python_bytes(path, content.encode("utf-8", errors="surrogatepass"))
+
+
+def parse_python_bytes(path: str, data: Buffer) -> ParsedSource:
+    """
+    Extract classes, functions and bases from raw Python source.
+
+    Works on any bytes-like object, including an mmap, and only decodes the
+    matched names, so large files are never turned into a str.
+
+    Args:
+        path: File path relative to repo root (recorded on the result)
+        data: UTF-8 source bytes
+
+    Returns:
+        ParsedSource for the file
+    """
+    bases: dict[str, list[str]] = {}
+    for match in CLASS_WITH_BASES_RE.finditer(data):
+        names = (_decode(b.strip()) for b in match.group(2).split(b","))
+        bases[_decode(match.group(1))] = [
+            b for b in names if b and b not in _IGNORED_BASES
+        ]
+    return ParsedSource(
+        path=path,
+        classes=[_decode(m.group(1)) for m in CLASS_RE.finditer(data)],
+        functions=[
+            _decode(m.group(1)) for m in FUNCTION_RE.finditer(data)
+            if not m.group(1).startswith(b"_")
+        ],
+        bases=bases,
+    )
+
+
+def _decode(name: bytes) -> str:
+    return name.decode("utf-8", errors="replace")
+
+
+def parse_python_file(
+    root: str | Path,
+    path: str,
+    reader: Optional[GitObjectReader] = None,
+    blob_sha: Optional[str] = None,
+) -> Optional[ParsedSource]:
+    """
+    Read and parse one file; returns None if it cannot be read.
+
+    With a reader and blob SHA the content comes from the git object database
+    instead of the work tree. Large work tree files are memory-mapped, so
+    their pages are scanned in place rather than copied into the process.
+    """
+    try:
+        if reader is not None and blob_sha:
+            return parse_python_bytes(path, reader.read(blob_sha))
+        with open(Path(root) / path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+                return parse_python_bytes(path, f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse_python_bytes(path, data)
+    except Exception as e:
+        logger.debug("Could not read %s: %s", path, e)
+        return None
+
+
+def _parse_chunk(
+    root: str,
+    paths: list[str],
+    blob_shas: Optional[list[str]] = None,
+) -> list[Optional[ParsedSource]]:
+    """Process-pool task: parse a chunk of files (from git objects if SHAs are given)."""
+    if blob_shas is None:
+        return [parse_python_file(root, p) for p in paths]
+    with GitObjectReader(root) as reader:
+        return [parse_python_file(root, p, reader, sha) for p, sha in zip(paths, blob_shas)]
+
+
+def parse_python_files(
+    root: str | Path,
+    paths: list[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    object_shas: Optional[dict[str, str]] = None,
+) -> list[ParsedSource]:
+    """
+    Parse many Python files, in parallel when worthwhile.
+
+    Files are sent to a ProcessPoolExecutor in chunks so that workers read and
+    regex the files themselves and only the small ParsedSource records travel
+    back. Results keep the order of ``paths``; unreadable files are dropped.
+
+    Args:
+        root: Repository root directory
+        paths: File paths relative to root
+        workers: Number of worker processes (None = os.cpu_count(), 1 = serial)
+        chunk_size: Number of files per pool task
+        object_shas: Blob SHA per path; when given, contents are read from the
+            git object database (each task runs its own cat-file process)
+
+    Returns:
+        List of ParsedSource records
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    root = str(root)
+
+    shas = [object_shas.get(p, "") for p in paths] if object_shas is not None else None
+
+    # A single chunk is not worth the pool start-up cost
+    if workers <= 1 or len(paths) <= chunk_size:
+        results = _parse_chunk(root, paths, shas)
+    else:
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        sha_chunks = (
+            [shas[i:i + chunk_size] for i in range(0, len(shas), chunk_size)]
+            if shas is not None else [None] * len(chunks)
+        )
+        workers = min(workers, len(chunks))
+        logger.debug("Parsing %d files in %d chunks over %d workers", len(paths), len(chunks), workers)
+        results = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk_results in executor.map(
+                    _parse_chunk, [root] * len(chunks), chunks, sha_chunks
+                ):
+                    results.extend(chunk_results)
+        except Exception as e:
+            # e.g. process creation refused in restricted environments
+            logger.warning("Parallel parsing failed (%s), parsing serially", e)
+            results = _parse_chunk(root, paths, shas)
+
+    return [r for r in results if r is not None]
@@ -0,0 +1,182 @@
+"""Wall time, CPU time and peak memory of pipeline phases and analyzer scans."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileRecord:
+    """Totals of one profiled section (summed over its calls)."""
+
+    name: str  # "/"-joined path of enclosing sections
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0  # CPU time of this process (worker processes not included)
+    peak_bytes: int = 0  # Highest traced allocation above the level at entry
+    counters: dict = field(default_factory=dict)  # Deltas of the profiler's counters
+
+    def to_dict(self) -> dict:
+        """Serialize to dict."""
+        return asdict(self)
+
+
+class _Frame:
+    __slots__ = ("name", "peak")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.peak = 0
+
+
+class Profiler:
+    """
+    Records wall time, CPU time and peak memory of nested sections.
+
+    Memory is measured with tracemalloc, which is started on construction
+    and slows Python allocations down noticeably; only use it for profiling
+    runs. Sections nest: a section entered inside another is recorded as
+    ``outer/inner``, and the outer section's peak includes the inner one.
+
+    Counters are callables returning cumulative numbers (e.g. LLM calls and
+    seconds spent waiting on them); each section records how much they grew
+    while it ran.
+
+    Example:
+        profiler = Profiler(counters={"llm": llm_stats})
+        analysis = profiler.wrap(run_phase_1_analyze)(repo_path, config)
+        profiler.write("profile.json")
+    """
+
+    def __init__(self, counters: Optional[dict[str, Callable[[], dict]]] = None):
+        """
+        Args:
+            counters: Name -> function returning a dict of cumulative numbers
+        """
+        self.counters = counters or {}
+        self.records: dict[str, ProfileRecord] = {}
+        self._stack: list[_Frame] = []
+        self._started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as ``name`` (nested under open sections)."""
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = _Frame("/".join([*(f.name for f in self._stack), name]))
+        self._stack.append(frame)
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start_counters = self._read_counters()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+
+            record = self.records.get(frame.name)
+            if record is None:
+                record = self.records[frame.name] = ProfileRecord(frame.name)
+            record.calls += 1
+            record.wall_s += wall
+            record.cpu_s += cpu
+            record.peak_bytes = max(record.peak_bytes, frame.peak - start_bytes)
+            for key, value in self._read_counters().items():
+                delta = value - start_counters.get(key, 0)
+                record.counters[key] = record.counters.get(key, 0) + delta
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Return ``func`` profiled as a section named after it."""
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.section(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def instrument(self, obj: Any, prefix: str = "scan_") -> Any:
+        """
+        Profile the methods of an object whose names start with ``prefix``.
+
+        Private variants (``_scan_models``) are included. The wrappers are set
+        on the instance, so calls through ``self`` inside the class are
+        profiled too.
+
+        Args:
+            obj: Instance to instrument (e.g. a BaseRepoAnalyzer)
+            prefix: Method name prefix
+
+        Returns:
+            The same object
+        """
+        for attr in dir(type(obj)):
+            if attr.lstrip("_").startswith(prefix) and callable(getattr(obj, attr, None)):
+                setattr(obj, attr, self.wrap(getattr(obj, attr), attr))
+        return obj
+
+    def _read_counters(self) -> dict[str, float]:
+        values: dict[str, float] = {}
+        for group, read in self.counters.items():
+            try:
+                for key, value in read().items():
+                    values[f"{group}_{key}"] = value
+            except Exception as e:
+                logger.debug("Profile counter %s failed: %s", group, e)
+        return values
+
+    def to_dict(self) -> dict:
+        """Serialize all records (in the order sections first finished)."""
+        return {
+            "total_wall_s": time.perf_counter() - self._started,
+            "peak_traced_bytes": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None,
+            "sections": [r.to_dict() for r in self.records.values()],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        """Write the profile as JSON and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def summary_table(self) -> str:
+        """Format the records as a table, sorted by name (nested sections under their parent)."""
+        counter_keys = sorted({k for r in self.records.values() for k in r.counters})
+        rows = [("section", "calls", "wall", "cpu", "peak MiB", *counter_keys)]
+        for record in sorted(self.records.values(), key=lambda r: r.name):
+            rows.append((
+                record.name,
+                str(record.calls),
+                f"{record.wall_s:.2f}s",
+                f"{record.cpu_s:.2f}s",
+                f"{record.peak_bytes / 2**20:.1f}",
+                *(_format_counter(record.counters.get(k, 0)) for k in counter_keys),
+            ))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows
+        )
+
+
+def _format_counter(value: float) -> str:
+    return str(value) if isinstance(value, int) else f"{value:.2f}"
@@ -59,7 +59,12 @@ class AnalyzerRegistry:
         return list(cls._analyzers.values())
 
     @classmethod
-    def auto_detect(cls, repo_path: str | Path) -> Type["BaseRepoAnalyzer"]:
+    def auto_detect(
+        cls,
+        repo_path: str | Path,
+        use_cache: bool = False,
+        cache_dir: Optional[str | Path] = None,
+    ) -> Type["BaseRepoAnalyzer"]:
         """
         Auto-detect the best analyzer for a repository.
 
@@ -67,14 +72,17 @@ class AnalyzerRegistry:
 
         Args:
             repo_path: Path to the repository
+            use_cache: Reuse the detection made at the same HEAD commit
+            cache_dir: Cache root for the detection cache (default: shared cache dir)
 
         Returns:
             The best matching analyzer class
         """
-        from analyzer.detector import RepoTypeDetector
+        from analyzer.detector import DetectionCache, RepoTypeDetector
 
         repo_path = Path(repo_path)
-        analyzer_class, confidence = RepoTypeDetector.detect(repo_path, cls.get_all())
+        cache = DetectionCache.open_default(cache_dir) if use_cache else None
+        analyzer_class, confidence = RepoTypeDetector.detect(repo_path, cls.get_all(), cache=cache)
 
         logger.info(
             f"Auto-detected analyzer: {analyzer_class.__name__} "
@@ -0,0 +1,253 @@
+"""Sectioned on-disk format for UniversalRepoAnalysis with lazy loading."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from analyzer.models import (
+    CommitInfo,
+    ComponentInfo,
+    DocumentationInfo,
+    RepoType,
+    UniversalRepoAnalysis,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "kg-analysis-sections"
+FORMAT_VERSION = 1
+
+HEADER_FILE = "header.json"
+
+# Section name -> (file name, record deserializer)
+_LIST_SECTIONS: dict[str, tuple[str, Callable[[dict], Any]]] = {
+    "components": ("components.jsonl", ComponentInfo.from_dict),
+    "commits": ("commits.jsonl", CommitInfo.from_dict),
+    "documentation": ("documentation.jsonl", DocumentationInfo.from_dict),
+}
+_STRUCTURE_FILE = "structure.jsonl"
+
+
+class LazySection(Sequence):
+    """
+    Read-only list of records backed by a JSONL file.
+
+    Iteration streams records from disk, so a consumer that stops early never
+    reads the rest of the file. ``len()`` comes from the header. Indexing
+    materializes the section once (slices from the start are streamed).
+    """
+
+    # Never changes (read-only), so views derived from a section can be cached
+    version = 0
+
+    def __init__(self, path: Path, count: int, from_dict: Callable[[dict], Any]):
+        self.path = path
+        self._count = count
+        self._from_dict = from_dict
+        self._items: Optional[list] = None
+
+    def __iter__(self) -> Iterator:
+        if self._items is not None:
+            return iter(self._items)
+        return self._stream()
+
+    def _stream(self) -> Iterator:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield self._from_dict(json.loads(line))
+
+    def __len__(self) -> int:
+        return self._count if self._items is None else len(self._items)
+
+    def __getitem__(self, index):
+        if (
+            self._items is None
+            and isinstance(index, slice)
+            and index.step in (None, 1)
+            and (index.start or 0) >= 0
+            and index.stop is not None
+            and index.stop >= 0
+        ):
+            return list(itertools.islice(self._stream(), index.start, index.stop))
+        return self.materialize()[index]
+
+    def materialize(self) -> list:
+        """Load the whole section into memory (kept for later accesses)."""
+        if self._items is None:
+            self._items = list(self._stream())
+        return self._items
+
+    def __repr__(self) -> str:
+        return f"LazySection({self.path.name!r}, {len(self)} records)"
+
+
+class LazyStructure(Mapping):
+    """
+    Read-only class hierarchy mapping backed by a JSONL file.
+
+    ``items()``, ``keys()`` and iteration stream from disk in file order;
+    key lookups materialize the mapping once.
+    """
+
+    def __init__(self, path: Path, count: int):
+        self.path = path
+        self._count = count
+        self._data: Optional[dict] = None
+
+    def _stream(self) -> Iterator[tuple[str, dict]]:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.pop("name"), record
+
+    def __iter__(self) -> Iterator[str]:
+        if self._data is not None:
+            return iter(self._data)
+        return (name for name, _ in self._stream())
+
+    def items(self):
+        if self._data is not None:
+            return self._data.items()
+        return _StreamedItems(self)
+
+    def __len__(self) -> int:
+        return self._count if self._data is None else len(self._data)
+
+    def __getitem__(self, key: str) -> dict:
+        return self.materialize()[key]
+
+    def materialize(self) -> dict:
+        """Load the whole mapping into memory (kept for later accesses)."""
+        if self._data is None:
+            self._data = dict(self._stream())
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"LazyStructure({self.path.name!r}, {len(self)} classes)"
+
+
+class _StreamedItems:
+    """items() view of a LazyStructure that streams pairs from disk."""
+
+    def __init__(self, structure: LazyStructure):
+        self._structure = structure
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        return self._structure._stream()
+
+    def __len__(self) -> int:
+        return len(self._structure)
+
+
+def write_analysis(analysis: UniversalRepoAnalysis, path: str | Path) -> Path:
+    """
+    Write an analysis as a sectioned directory.
+
+    Layout::
+
+        <path>/header.json            repo info, dependencies, extensions,
+                                      metadata, section files and counts
+        <path>/components.jsonl       one ComponentInfo per line
+        <path>/commits.jsonl          one CommitInfo per line
+        <path>/documentation.jsonl    one DocumentationInfo per line
+        <path>/structure.jsonl        one {"name", "inherits", "file"} per line
+
+    Records are written one at a time, so lazily loaded sections are streamed
+    through without being materialized. The header is written last.
+
+    Args:
+        analysis: Analysis to write
+        path: Output directory (created if missing)
+
+    Returns:
+        The output directory
+    """
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+
+    sections: dict[str, dict] = {}
+    for name, (file_name, _) in _LIST_SECTIONS.items():
+        count = _write_lines(out / file_name, (r.to_dict() for r in getattr(analysis, name)))
+        sections[name] = {"file": file_name, "count": count}
+    count = _write_lines(
+        out / _STRUCTURE_FILE,
+        ({"name": name, **info} for name, info in analysis.structure.items()),
+    )
+    sections["structure"] = {"file": _STRUCTURE_FILE, "count": count}
+
+    repo_type = analysis.repo_type
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "repo_type": repo_type.value if isinstance(repo_type, RepoType) else repo_type,
+        "repo_path": analysis.repo_path,
+        "dependencies": analysis.dependencies,
+        "extensions": analysis.extensions,
+        "metadata": analysis.metadata,
+        "sections": sections,
+    }
+    with (out / HEADER_FILE).open("w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2, ensure_ascii=False)
+    return out
+
+
+def read_analysis(path: str | Path, lazy: bool = True) -> UniversalRepoAnalysis:
+    """
+    Read an analysis written by write_analysis(), or a plain to_dict() JSON file.
+
+    Args:
+        path: Sectioned directory (or a single JSON file)
+        lazy: Stream sections from disk on demand instead of loading them
+
+    Returns:
+        UniversalRepoAnalysis whose components/commits/documentation are
+        LazySection and structure a LazyStructure when lazy
+    """
+    path = Path(path)
+    if path.is_file():
+        return UniversalRepoAnalysis.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    header = json.loads((path / HEADER_FILE).read_text(encoding="utf-8"))
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a sectioned analysis directory")
+    if header.get("version", 0) > FORMAT_VERSION:
+        logger.warning("Analysis format version %s is newer than supported", header["version"])
+
+    sections = header["sections"]
+    lists = {}
+    for name, (_, from_dict) in _LIST_SECTIONS.items():
+        info = sections[name]
+        section = LazySection(path / info["file"], info["count"], from_dict)
+        lists[name] = section if lazy else section.materialize()
+    info = sections["structure"]
+    structure = LazyStructure(path / info["file"], info["count"])
+
+    return UniversalRepoAnalysis(
+        repo_type=RepoType(header["repo_type"]),
+        repo_path=header["repo_path"],
+        components=lists["components"],
+        commits=lists["commits"],
+        documentation=lists["documentation"],
+        structure=structure if lazy else structure.materialize(),
+        dependencies=header.get("dependencies", {}),
+        extensions=header.get("extensions", {}),
+        metadata=header.get("metadata", {}),
+    )
+
+
+def _write_lines(path: Path, records) -> int:
+    """Write records as JSON lines; return how many were written."""
+    count = 0
+    with path.open("w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
@@ -12,7 +12,7 @@ from pathlib import Path
 
 from git import Repo as GitRepo
 
-from analyzer import RepoAnalyzer
+from analyzer import RepoAnalyzer, write_analysis
 
 # Setup logging
 logging.basicConfig(
@@ -51,6 +51,11 @@ def main():
         default="analyzer/results",
         help="Output directory for results (default: analyzer/results)"
     )
+    parser.add_argument(
+        "--sectioned",
+        action="store_true",
+        help="Save as a sectioned directory (header + JSONL sections) instead of one JSON file"
+    )
 
     args = parser.parse_args()
 
@@ -164,19 +169,22 @@ def main():
             repo_name = Path(args.repo).name
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = output_dir / f"{repo_name}_{timestamp}.json"
+        suffix = "" if args.sectioned else ".json"
+        output_file = output_dir / f"{repo_name}_{timestamp}{suffix}"
 
         # Save (with run metadata attached)
         logger.info("")
         logger.info("=" * 60)
         logger.info(f"Saving results to: {output_file}")
-        result = analysis.to_dict()
-        result["metadata"]["generated_by"] = "analyzer/test_analyzer.py"
-        result["metadata"]["source_repo"] = args.repo
-        result["metadata"]["detail_mode"] = args.detail_mode
-        result["metadata"]["timestamp"] = timestamp
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        analysis.metadata["generated_by"] = "analyzer/test_analyzer.py"
+        analysis.metadata["source_repo"] = args.repo
+        analysis.metadata["detail_mode"] = args.detail_mode
+        analysis.metadata["timestamp"] = timestamp
+        if args.sectioned:
+            write_analysis(analysis, output_file)
+        else:
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(analysis.to_dict(), f, indent=2, ensure_ascii=False)
         logger.info("✅ Results saved")
         logger.info("=" * 60)
 
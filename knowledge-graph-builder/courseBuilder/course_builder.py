@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from extractor.graph import KnowledgeGraph
-from extractor.llm_client import get_client, chat_completion, parse_json_response
+from extractor.llm_client import (
+    achat_completion, aforget_response, get_async_client, parse_json_response, run_sync,
+)
 from extractor.models import (
     ConceptLevel, ConceptNode, Course, Lesson, RelationshipType,
 )
@@ -18,6 +20,9 @@ from courseBuilder.prompts import (
     LESSON_GENERATION_PROMPT,
 )
 
+if TYPE_CHECKING:
+    import openai
+
 logger = logging.getLogger(__name__)
 
 # Maximum characters for the concepts listing in the course structure prompt.
@@ -28,19 +33,28 @@ class CourseBuilder:
     """Phase 4: Builds structured courses from the knowledge graph."""
 
     def __init__(self, base_url: Optional[str] = None, model: str = "google/gemma-3-27b-it"):
-        self.client = get_client(base_url)
+        self.base_url = base_url
         self.model = model
 
     def build_courses(self, kg: KnowledgeGraph, generate_lessons: bool = True) -> list[Course]:
-        """Build courses from the knowledge graph."""
+        """Build courses from the knowledge graph.
+
+        Runs abuild_courses() on its own event loop; inside a running loop,
+        await abuild_courses() instead.
+        """
+        return run_sync(self.abuild_courses(kg, generate_lessons))
+
+    async def abuild_courses(self, kg: KnowledgeGraph, generate_lessons: bool = True) -> list[Course]:
+        """Async build_courses(); requests share the endpoint's concurrency limit."""
+        client = get_async_client(self.base_url)
         sorted_concepts = kg.topological_sort()
-        clusters = self._generate_course_clusters(kg)
+        clusters = await self._generate_course_clusters(client, kg)
         courses = self._cluster_concepts(kg, sorted_concepts, clusters)
 
         if generate_lessons:
-            for course in courses:
-                logger.info("Generating lessons for course: %s", course.title)
-                course.lessons = self._generate_lessons(kg, course.concepts)
+            lessons = await self._generate_all_lessons(client, kg, courses)
+            for course, course_lessons in zip(courses, lessons):
+                course.lessons = course_lessons
 
         courses = [c for c in courses if c.concepts]
 
@@ -49,7 +63,7 @@ class CourseBuilder:
                      sum(len(c.concepts) for c in courses))
         return courses
 
-    def _generate_course_clusters(self, kg: KnowledgeGraph) -> list[dict]:
+    async def _generate_course_clusters(self, client: openai.AsyncOpenAI, kg: KnowledgeGraph) -> list[dict]:
         """Ask the LLM to generate domain-specific course clusters from the knowledge graph."""
         all_nodes = kg.get_all_concepts()
 
@@ -70,12 +84,14 @@ class CourseBuilder:
         )
 
         try:
-            text, _ = chat_completion(
-                self.client, self.model,
+            text, _ = await achat_completion(
+                client, self.model,
                 COURSE_STRUCTURE_PROMPT, user_prompt,
                 max_tokens=2048, temperature=0.3,
             )
             data = parse_json_response(text)
+            if not data:
+                await aforget_response(self.model, COURSE_STRUCTURE_PROMPT, user_prompt, 2048, 0.3)
             clusters = data.get("courses", [])
             if clusters:
                 logger.info("LLM generated %d course clusters", len(clusters))
@@ -166,9 +182,21 @@ class CourseBuilder:
                 best = course
         return best
 
-    def _generate_lessons(self, kg: KnowledgeGraph, concept_ids: list[str]) -> list[Lesson]:
-        # Preprocessing: collect (index, node, prereq_names) to preserve order
-        tasks: list[tuple[int, ConceptNode, list[str]]] = []
+    async def _generate_all_lessons(
+        self, client: openai.AsyncOpenAI, kg: KnowledgeGraph, courses: list[Course]
+    ) -> list[list[Lesson]]:
+        """Generate the lessons of every course at once (bounded by set_concurrency)."""
+        for course in courses:
+            logger.info("Generating lessons for course: %s", course.title)
+        return await asyncio.gather(
+            *(self._generate_lessons(client, kg, course.concepts) for course in courses)
+        )
+
+    async def _generate_lessons(
+        self, client: openai.AsyncOpenAI, kg: KnowledgeGraph, concept_ids: list[str]
+    ) -> list[Lesson]:
+        # Preprocessing: collect (node, prereq_names); gather keeps their order
+        tasks: list[tuple[ConceptNode, list[str]]] = []
         for concept_id in concept_ids:
             node = kg.get_concept(concept_id)
             if not node:
@@ -179,20 +207,16 @@ class CourseBuilder:
                 for pid in prereqs
                 if (pnode := kg.get_concept(pid))
             ]
-            tasks.append((len(tasks), node, prereq_names))
-
-        lessons: list[Lesson | None] = [None] * len(tasks)
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                executor.submit(self._generate_one_lesson, node, prereq_names): idx
-                for idx, node, prereq_names in tasks
-            }
-            for future in as_completed(futures):
-                lessons[futures[future]] = future.result()
+            tasks.append((node, prereq_names))
 
+        lessons = await asyncio.gather(
+            *(self._generate_one_lesson(client, node, prereq_names) for node, prereq_names in tasks)
+        )
         return [lesson for lesson in lessons if lesson is not None]
 
-    def _generate_one_lesson(self, node: ConceptNode, prerequisite_names: list[str]) -> Lesson:
+    async def _generate_one_lesson(
+        self, client: openai.AsyncOpenAI, node: ConceptNode, prerequisite_names: list[str]
+    ) -> Lesson:
         fallback_exercise = (
             f"True or false: {node.name} was introduced to solve a problem with "
             "earlier approaches. Explain your answer in one sentence."
@@ -208,13 +232,15 @@ class CourseBuilder:
         )
 
         try:
-            text, finish_reason = chat_completion(
-                self.client, self.model, "", prompt,
+            text, finish_reason = await achat_completion(
+                client, self.model, "", prompt,
                 max_tokens=6144, temperature=0.3,
             )
             if finish_reason == "length":
                 logger.warning("LLM response truncated for lesson: %s", node.id)
             data = parse_json_response(text)
+            if not data:
+                await aforget_response(self.model, "", prompt, 6144, 0.3)
 
             return Lesson(
                 concept_id=node.id,
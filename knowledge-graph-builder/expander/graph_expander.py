@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from extractor.graph import KnowledgeGraph
-from extractor.llm_client import get_client, chat_completion, parse_json_response
+from extractor.llm_client import (
+    achat_completion, aforget_response, get_async_client, parse_json_response, run_sync,
+)
 from extractor.models import (
     ConceptNode, ConceptType, ConceptLevel, Edge, RelationshipType,
 )
 from expander.prompts import EXPANSION_SYSTEM_PROMPT, EXPANSION_USER_PROMPT
 
+if TYPE_CHECKING:
+    import openai
+
 logger = logging.getLogger(__name__)
 
 # Maximum characters for the existing-concepts listing in the user prompt.
@@ -22,7 +27,7 @@ class GraphExpander:
     """Expands the knowledge graph to include frontier concepts via BFS rounds."""
 
     def __init__(self, base_url: Optional[str] = None, model: str = "google/gemma-3-27b-it"):
-        self.client = get_client(base_url)
+        self.base_url = base_url
         self.model = model
 
     def expand(
@@ -33,6 +38,9 @@ class GraphExpander:
     ) -> KnowledgeGraph:
         """Expand the graph through multiple BFS rounds.
 
+        Runs aexpand() on its own event loop; inside a running loop, await
+        aexpand() instead.
+
         Args:
             kg: The knowledge graph to expand (mutated in-place and returned).
             rounds: Maximum number of expansion rounds.
@@ -41,9 +49,19 @@ class GraphExpander:
         Returns:
             The expanded knowledge graph.
         """
+        return run_sync(self.aexpand(kg, rounds, concepts_per_round))
+
+    async def aexpand(
+        self,
+        kg: KnowledgeGraph,
+        rounds: int = 2,
+        concepts_per_round: int = 10,
+    ) -> KnowledgeGraph:
+        """Async expand(); requests share the endpoint's concurrency limit."""
+        client = get_async_client(self.base_url)
         for round_num in range(1, rounds + 1):
             logger.info("Expansion round %d/%d", round_num, rounds)
-            new_nodes, new_edges = self._expand_one_round(kg, concepts_per_round)
+            new_nodes, new_edges = await self._expand_one_round(client, kg, concepts_per_round)
 
             if not new_nodes:
                 logger.info("No new concepts found, stopping expansion early")
@@ -61,15 +79,15 @@ class GraphExpander:
 
         return kg
 
-    def _expand_one_round(
-        self, kg: KnowledgeGraph, num_new: int
+    async def _expand_one_round(
+        self, client: openai.AsyncOpenAI, kg: KnowledgeGraph, num_new: int
     ) -> tuple[list[ConceptNode], list[Edge]]:
         """Run one round of expansion: build prompts → call LLM → parse → validate."""
         system_prompt = self._build_system_prompt()
         user_prompt = self._build_user_prompt(kg, num_new)
 
-        response_text, finish_reason = chat_completion(
-            self.client, self.model, system_prompt, user_prompt,
+        response_text, finish_reason = await achat_completion(
+            client, self.model, system_prompt, user_prompt,
             max_tokens=4096, temperature=0.3,
         )
 
@@ -77,6 +95,8 @@ class GraphExpander:
             logger.warning("LLM response was truncated (finish_reason=length)")
 
         data = parse_json_response(response_text)
+        if not data:
+            await aforget_response(self.model, system_prompt, user_prompt, 4096, 0.3)
         existing_ids = {n.id for n in kg.get_all_concepts()}
         return self._build_nodes_and_edges(data, existing_ids)
 
@@ -1,31 +1,54 @@
 """Extractor package — Phase 2: concept extraction from repo analysis."""
 
-from extractor.concept_extractor import ConceptExtractor
-from extractor.graph import KnowledgeGraph
-from extractor.models import (
-    ConceptNode,
-    ConceptType,
-    ConceptLevel,
-    Edge,
-    RelationshipType,
-    Lesson,
-    Course,
-    LearnerProfile,
-    LearnerProgress,
-    CONCEPT_LEVEL_DEPTH,
-)
-
-__all__ = [
-    "ConceptExtractor",
-    "KnowledgeGraph",
-    "ConceptNode",
-    "ConceptType",
-    "ConceptLevel",
-    "Edge",
-    "RelationshipType",
-    "Lesson",
-    "Course",
-    "LearnerProfile",
-    "LearnerProgress",
-    "CONCEPT_LEVEL_DEPTH",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from extractor.concept_extractor import ConceptExtractor
+    from extractor.graph import KnowledgeGraph
+    from extractor.models import (
+        ConceptNode,
+        ConceptType,
+        ConceptLevel,
+        Edge,
+        RelationshipType,
+        Lesson,
+        Course,
+        LearnerProfile,
+        LearnerProgress,
+        CONCEPT_LEVEL_DEPTH,
+    )
+
+# Imported on first access: ConceptExtractor pulls in openai and
+# KnowledgeGraph networkx, which extractor.models users do not need
+_EXPORTS = {
+    "ConceptExtractor": "extractor.concept_extractor",
+    "KnowledgeGraph": "extractor.graph",
+    "ConceptNode": "extractor.models",
+    "ConceptType": "extractor.models",
+    "ConceptLevel": "extractor.models",
+    "Edge": "extractor.models",
+    "RelationshipType": "extractor.models",
+    "Lesson": "extractor.models",
+    "Course": "extractor.models",
+    "LearnerProfile": "extractor.models",
+    "LearnerProgress": "extractor.models",
+    "CONCEPT_LEVEL_DEPTH": "extractor.models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
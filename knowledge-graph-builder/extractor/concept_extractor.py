@@ -2,22 +2,35 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from extractor.graph import KnowledgeGraph
-from extractor.llm_client import get_client, chat_completion, parse_json_response
+from extractor.json_stream import JSONObjectStream
+from extractor.llm_client import (
+    aforget_response, astream_chat_completion, get_async_client, parse_json_response, run_sync,
+)
 from extractor.models import (
     ConceptNode, ConceptType, ConceptLevel, Edge, RelationshipType,
 )
 from analyzer.models import UniversalRepoAnalysis, RepoType
 
+if TYPE_CHECKING:
+    import openai
+
 logger = logging.getLogger(__name__)
 
 # Character budget per section in the user prompt.
 # Each of the 4 sections (components, structure, commits, docs) gets this many chars.
 _SECTION_BUDGET = 3_000
 
+# Shortest possible prompt line; bounds how many items a section can show, so
+# sorted sections only need the top _SECTION_BUDGET // _MIN_LINE_CHARS items.
+_MIN_LINE_CHARS = 8
+_MAX_SECTION_ITEMS = _SECTION_BUDGET // _MIN_LINE_CHARS
+
 # Repository types that warrant ML-specific prompt hints.
 _ML_REPO_TYPES = frozenset({RepoType.HUGGINGFACE.value, RepoType.PYTORCH.value})
 
@@ -93,12 +106,21 @@ class ConceptExtractor:
     """Uses an LLM to extract concepts from repo analysis data."""
 
     def __init__(self, base_url: Optional[str] = None, model: str = "google/gemma-3-27b-it"):
-        self.client = get_client(base_url)
+        self.base_url = base_url
         self.model = model
 
     def extract(self, analysis: UniversalRepoAnalysis) -> KnowledgeGraph:
-        """Extract a knowledge graph from repo analysis."""
+        """Extract a knowledge graph from repo analysis.
+
+        Runs aextract() on its own event loop; inside a running loop, await
+        aextract() instead.
+        """
+        return run_sync(self.aextract(analysis))
+
+    async def aextract(self, analysis: UniversalRepoAnalysis) -> KnowledgeGraph:
+        """Async extract(); requests share the endpoint's concurrency limit."""
         logger.info("Extracting concepts via LLM (model=%s)", self.model)
+        client = get_async_client(self.base_url)
 
         domain_context, technique_hint = self._domain_hints(analysis.repo_type)
         system_prompt = EXTRACTION_SYSTEM_PROMPT.format(
@@ -111,52 +133,51 @@ class ConceptExtractor:
 
         user_prompt = self._build_user_prompt(analysis, technique_hint)
 
-        response_text, finish_reason = chat_completion(
-            self.client, self.model, system_prompt, user_prompt,
-            max_tokens=8192, temperature=0.3,
+        graph_data, finish_reason = await self._stream_graph_data(
+            client, system_prompt, user_prompt, max_tokens=8192,
         )
-
-        graph_data = parse_json_response(response_text)
         node_count = len(graph_data.get("nodes", []))
 
         if not node_count:
             # Nothing parsed at all — retry with a simpler, shorter prompt.
             logger.warning("No nodes in response, retrying with simpler prompt...")
-            graph_data = self._retry_extraction(system_prompt, analysis)
-        elif finish_reason == "length" or node_count < 20:
+            graph_data = await self._retry_extraction(client, system_prompt, analysis)
+        elif finish_reason in ("length", "error") or node_count < 20:
             # Output was cut off or suspiciously sparse — run a second pass.
-            if finish_reason == "length":
+            if finish_reason in ("length", "error"):
                 logger.warning(
-                    "Pass 1 truncated (finish_reason=length, %d nodes). Running Pass 2.",
-                    node_count,
+                    "Pass 1 truncated (finish_reason=%s, %d nodes). Running Pass 2.",
+                    finish_reason, node_count,
                 )
             else:
                 logger.warning(
                     "Pass 1 returned only %d nodes. Running Pass 2.", node_count
                 )
-            extra_data = self._extract_pass2(system_prompt, analysis, graph_data)
+            extra_data = await self._extract_pass2(client, system_prompt, analysis, graph_data)
             graph_data = self._merge_graph_data(graph_data, extra_data)
 
         return self._build_graph(graph_data)
 
-    def _retry_extraction(self, system_prompt: str, analysis: UniversalRepoAnalysis) -> dict:
+    async def _retry_extraction(
+        self, client: openai.AsyncOpenAI, system_prompt: str, analysis: UniversalRepoAnalysis
+    ) -> dict:
         """Retry with a shorter prompt if the first attempt fails."""
-        top_components = ", ".join(c.name for c in analysis.components[:30])
+        top_components = ", ".join(c.name for c in itertools.islice(analysis.components, 30))
         short_prompt = (
             f"Extract 30-40 key concepts from the {analysis.repo_type.value} repository. "
             f"Key components include: {top_components}. "
             "Return ONLY valid JSON with keys 'nodes' and 'edges'."
         )
-        text, finish_reason = chat_completion(
-            self.client, self.model, system_prompt, short_prompt,
-            max_tokens=16384, temperature=0.3,
+        graph_data, finish_reason = await self._stream_graph_data(
+            client, system_prompt, short_prompt, max_tokens=16384,
         )
-        if finish_reason == "length":
+        if finish_reason in ("length", "error"):
             logger.warning("Retry also truncated. Graph may be incomplete.")
-        return parse_json_response(text)
+        return graph_data
 
-    def _extract_pass2(
+    async def _extract_pass2(
         self,
+        client: openai.AsyncOpenAI,
         system_prompt: str,
         analysis: UniversalRepoAnalysis,
         existing_data: dict,
@@ -178,13 +199,59 @@ class ConceptExtractor:
             "(use \"\" only if truly no paper exists).\n"
             "Return ONLY valid JSON with keys 'nodes' and 'edges'."
         )
-        text, finish_reason = chat_completion(
-            self.client, self.model, system_prompt, continuation_prompt,
-            max_tokens=8192, temperature=0.3,
+        graph_data, finish_reason = await self._stream_graph_data(
+            client, system_prompt, continuation_prompt, max_tokens=8192,
         )
-        if finish_reason == "length":
+        if finish_reason in ("length", "error"):
             logger.warning("Pass 2 also truncated.")
-        return parse_json_response(text)
+        return graph_data
+
+    async def _stream_graph_data(
+        self, client: openai.AsyncOpenAI, system_prompt: str, user_prompt: str, max_tokens: int
+    ) -> tuple[dict, str]:
+        """Stream an extraction response, validating nodes as they arrive.
+
+        Every node and edge object completed before the response ends is
+        kept, so a truncated response loses only the object it was cut in.
+        Invalid nodes are dropped (and logged) as soon as they are read.
+
+        Returns:
+            ({"nodes", "edges"}, finish_reason)
+        """
+        parser = JSONObjectStream()
+        nodes: list[dict] = []
+        edges: list[dict] = []
+
+        def on_text(chunk: str) -> None:
+            for key, obj in parser.feed(chunk):
+                if not isinstance(obj, dict):
+                    continue
+                if key == "nodes":
+                    try:
+                        self._node_from_data(obj)
+                    except (KeyError, ValueError) as e:
+                        logger.warning("Skipping invalid node %s: %s", obj.get("id", "?"), e)
+                        continue
+                    nodes.append(obj)
+                elif key == "edges":
+                    edges.append(obj)
+
+        text, finish_reason = await astream_chat_completion(
+            client, self.model, system_prompt, user_prompt,
+            max_tokens=max_tokens, temperature=0.3, on_text=on_text,
+        )
+        if not parser.items:
+            # Not the expected {"nodes": [...], "edges": [...]} shape; try the lenient parser
+            data = parse_json_response(text)
+            if not data:
+                await aforget_response(self.model, system_prompt, user_prompt, max_tokens, 0.3)
+            return data, finish_reason
+        if not parser.complete:
+            logger.info(
+                "Response ended early (finish_reason=%s); kept %d complete nodes, %d edges",
+                finish_reason, len(nodes), len(edges),
+            )
+        return {"nodes": nodes, "edges": edges}, finish_reason
 
     def _merge_graph_data(self, base: dict, extra: dict) -> dict:
         """Merge two {nodes, edges} dicts. Deduplicates nodes by id."""
@@ -272,7 +339,8 @@ class ConceptExtractor:
                 return (1, c.name)
             return (2, c.name)
 
-        items = sorted(analysis.components, key=_sort_key)
+        # Streaming top-k: same order as sorted(), without holding every component
+        items = heapq.nsmallest(_MAX_SECTION_ITEMS, analysis.components, key=_sort_key)
         lines: list[str] = []
         budget = _SECTION_BUDGET
         for c in items:
@@ -283,14 +351,13 @@ class ConceptExtractor:
                 break
             lines.append(line)
             budget -= len(line)
-        return "".join(lines), len(items), len(lines)
+        return "".join(lines), len(analysis.components), len(lines)
 
     def _select_structure(self, analysis: UniversalRepoAnalysis) -> tuple[str, int, int]:
         """Return class hierarchy text up to the character budget."""
-        items = list(analysis.structure.items())
         lines: list[str] = []
         budget = _SECTION_BUDGET
-        for cls_name, info in items:
+        for cls_name, info in analysis.structure.items():
             inherits = info.get("inherits", [])
             file_path = info.get("file", "")
             inherits_str = f" extends {', '.join(inherits)}" if inherits else ""
@@ -299,11 +366,11 @@ class ConceptExtractor:
                 break
             lines.append(line)
             budget -= len(line)
-        return "".join(lines), len(items), len(lines)
+        return "".join(lines), len(analysis.structure), len(lines)
 
     def _select_commits(self, analysis: UniversalRepoAnalysis) -> tuple[str, int, int]:
         """Return commits text, sorted by tag richness (most tags first)."""
-        items = sorted(analysis.commits, key=lambda c: -len(c.tags))
+        items = heapq.nsmallest(_MAX_SECTION_ITEMS, analysis.commits, key=lambda c: -len(c.tags))
         lines: list[str] = []
         budget = _SECTION_BUDGET
         for c in items:
@@ -313,21 +380,20 @@ class ConceptExtractor:
                 break
             lines.append(line)
             budget -= len(line)
-        return "".join(lines), len(items), len(lines)
+        return "".join(lines), len(analysis.commits), len(lines)
 
     def _select_docs(self, analysis: UniversalRepoAnalysis) -> tuple[str, int, int]:
         """Return documentation text up to the character budget."""
-        items = analysis.documentation
         lines: list[str] = []
         budget = _SECTION_BUDGET
-        for d in items:
+        for d in analysis.documentation:
             summary = d.summary[:200] if d.summary else ""
             line = f"- **{d.title}** ({d.category}): {summary}\n"
             if len(line) > budget:
                 break
             lines.append(line)
             budget -= len(line)
-        return "".join(lines), len(items), len(lines)
+        return "".join(lines), len(analysis.documentation), len(lines)
 
     def _build_user_prompt(self, analysis: UniversalRepoAnalysis, technique_hint: str = "") -> str:
         components_text, num_components, shown_components = self._select_components(analysis)
@@ -365,25 +431,28 @@ class ConceptExtractor:
             technique_hint=technique_hint,
         )
 
+    def _node_from_data(self, node_data: dict) -> ConceptNode:
+        """Build a ConceptNode from extracted JSON; raises KeyError/ValueError if invalid."""
+        return ConceptNode(
+            id=node_data["id"],
+            name=node_data["name"],
+            type=ConceptType(node_data.get("type", "theory")),
+            level=ConceptLevel(node_data.get("level", "intermediate")),
+            description=node_data.get("description", ""),
+            key_ideas=node_data.get("key_ideas", []),
+            code_refs=node_data.get("code_refs", []),
+            paper_ref=node_data.get("paper_ref", ""),
+            first_appeared=node_data.get("first_appeared"),
+            confidence=node_data.get("confidence", 1.0),
+        )
+
     def _build_graph(self, data: dict) -> KnowledgeGraph:
         """Build a KnowledgeGraph from parsed extraction data."""
         kg = KnowledgeGraph()
 
         for node_data in data.get("nodes", []):
             try:
-                node = ConceptNode(
-                    id=node_data["id"],
-                    name=node_data["name"],
-                    type=ConceptType(node_data.get("type", "theory")),
-                    level=ConceptLevel(node_data.get("level", "intermediate")),
-                    description=node_data.get("description", ""),
-                    key_ideas=node_data.get("key_ideas", []),
-                    code_refs=node_data.get("code_refs", []),
-                    paper_ref=node_data.get("paper_ref", ""),
-                    first_appeared=node_data.get("first_appeared"),
-                    confidence=node_data.get("confidence", 1.0),
-                )
-                kg.add_concept(node)
+                kg.add_concept(self._node_from_data(node_data))
             except (KeyError, ValueError) as e:
                 logger.warning("Skipping invalid node %s: %s", node_data.get("id", "?"), e)
 
@@ -0,0 +1,115 @@
+"""Incremental parsing of streamed JSON responses."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class JSONObjectStream:
+    """
+    Emits the objects of a JSON document's top-level arrays as they complete.
+
+    Fed a response like ``{"nodes": [{...}, {...}], "edges": [{...}]}`` in
+    arbitrary chunks, feed() returns each ``("nodes", {...})`` pair as soon as
+    the object's closing brace arrives, so callers can validate and use
+    results while the rest is still being generated. If the response stops
+    early (e.g. truncated by max_tokens), every object completed before the
+    cut has already been emitted and is kept in ``items``.
+
+    Text before the first ``{`` (such as a markdown fence) and after the
+    document ends is ignored. Only objects directly inside top-level arrays
+    are emitted; scalars and deeper values are part of their object.
+    """
+
+    def __init__(self):
+        self.items: dict[str, list[Any]] = {}  # Top-level key -> objects emitted so far
+        self.complete = False  # True once the top-level object has closed
+        self._stack: list[str] = []  # Open "{" / "[" containers
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string: list[str] | None = None  # Chars of a string at the top level (maybe a key)
+        self._last_string = ""
+        self._key = ""
+        self._element: list[str] | None = None  # Chars of the array element being read
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Consume the next piece of the response.
+
+        Args:
+            chunk: Text as received
+
+        Returns:
+            (top-level key, object) for each object completed by this chunk
+        """
+        emitted: list[tuple[str, Any]] = []
+        for c in chunk:
+            if self.complete:
+                break
+            if self._element is not None:
+                self._element.append(c)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string is not None:
+                        self._last_string = "".join(self._string)
+                        self._string = None
+                    continue
+                if self._string is not None:
+                    self._string.append(c)
+                continue
+
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._stack.append(c)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._stack == ["{"]:
+                    self._string = []
+            elif c == ":" and self._stack == ["{"]:
+                self._key = _decode_key(self._last_string)
+            elif c in "{[":
+                if c == "{" and self._stack == ["{", "["]:
+                    self._element = ["{"]
+                self._stack.append(c)
+            elif c in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+                elif c == "}" and self._element is not None and self._stack == ["{", "["]:
+                    item = self._finish_element()
+                    if item is not None:
+                        self.items.setdefault(self._key, []).append(item)
+                        emitted.append((self._key, item))
+        return emitted
+
+    def _finish_element(self) -> Any:
+        text = "".join(self._element or ())
+        self._element = None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.debug("Skipping unparseable streamed element (%s): %s", e, text[:200])
+            return None
+
+
+def _decode_key(raw: str) -> str:
+    """Decode the escapes of a raw JSON string body."""
+    try:
+        return json.loads(f'"{raw}"')
+    except json.JSONDecodeError:
+        return raw
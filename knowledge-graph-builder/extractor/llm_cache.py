@@ -0,0 +1,244 @@
+"""Persistent cache of chat completion responses keyed by request content."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format or the request key changes
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1024**3
+DEFAULT_TTL_S = 30 * 24 * 3600
+
+
+def request_key(model: str, system: str, user: str, max_tokens: int, temperature: float) -> str:
+    """Return the SHA-256 of a chat completion request's parameters."""
+    payload = json.dumps(
+        [CACHE_VERSION, model, system, user, max_tokens, temperature],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite cache of chat completion responses.
+
+    Entries are keyed by request_key(), so rerunning a phase on unchanged
+    input replays the earlier responses instead of regenerating them; any
+    change to the model, prompts or sampling parameters is a miss. Entries
+    older than ``ttl_s`` are treated as misses and dropped, and
+    least-recently-used entries are evicted once the stored responses
+    exceed ``max_bytes``.
+
+    Safe to share between the threads of one process and between processes
+    using the same file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_s: Optional[float] = DEFAULT_TTL_S,
+    ):
+        """
+        Open (or create) a cache database.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Response size above which LRU eviction kicks in
+            ttl_s: Seconds an entry stays valid (None or 0 = forever)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s or None
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " finish_reason TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @classmethod
+    def open_default(
+        cls,
+        cache_dir: Optional[str | Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_s: Optional[float] = DEFAULT_TTL_S,
+    ) -> Optional[LLMCache]:
+        """
+        Open the shared response cache, or return None if it cannot be opened.
+
+        Args:
+            cache_dir: Cache root directory (default: $KG_CACHE_DIR or
+                ~/.cache/knowledge-graph-builder, like the analyzer caches)
+            max_bytes: Response size above which LRU eviction kicks in
+            ttl_s: Seconds an entry stays valid (None or 0 = forever)
+
+        Returns:
+            LLMCache instance, or None (caching is then simply disabled)
+        """
+        root = Path(cache_dir) if cache_dir else _default_cache_dir()
+        try:
+            return cls(root / "llm_cache.sqlite", max_bytes=max_bytes, ttl_s=ttl_s)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("LLM response cache unavailable at %s: %s", root, e)
+            return None
+
+    def get(self, key: str) -> Optional[tuple[str, str]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: request_key() of the request
+
+        Returns:
+            (response_text, finish_reason), or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT text, finish_reason, size, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self.ttl_s and now - row[3] > self.ttl_s:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._total_bytes -= row[2]
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                with self._conn:
+                    self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                logger.warning("Could not read LLM response cache: %s", e)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(self, key: str, text: str, finish_reason: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: request_key() of the request
+            text: Response text
+            finish_reason: Finish reason reported by the server
+        """
+        size = len(text.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            try:
+                with self._conn:
+                    old = self._conn.execute(
+                        "SELECT size FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses"
+                        " (key, text, finish_reason, size, created, last_used)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, text, finish_reason, size, now, now),
+                    )
+                self._total_bytes += size - (old[0] if old else 0)
+            except sqlite3.Error as e:
+                logger.warning("Could not write LLM response cache: %s", e)
+                return
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Drop a stored response (e.g. one the caller could not use)."""
+        with self._lock:
+            try:
+                with self._conn:
+                    row = self._conn.execute(
+                        "SELECT size FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                if row is not None:
+                    self._total_bytes -= row[0]
+            except sqlite3.Error as e:
+                logger.warning("Could not delete LLM response cache entry: %s", e)
+
+    def _evict(self) -> None:
+        """Drop expired entries, then LRU entries until back to 90% of max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        removed = 0
+        try:
+            with self._conn:
+                if self.ttl_s:
+                    removed += self._conn.execute(
+                        "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_s,)
+                    ).rowcount
+                # Other processes may share the database; evict against the real total
+                self._total_bytes = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+                target = int(self.max_bytes * 0.9)
+                doomed = []
+                if self._total_bytes > self.max_bytes:
+                    rows = self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY last_used ASC"
+                    ).fetchall()
+                    for key, size in rows:
+                        if self._total_bytes <= target:
+                            break
+                        doomed.append((key,))
+                        self._total_bytes -= size
+                    self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                removed += len(doomed)
+        except sqlite3.Error as e:
+            logger.warning("Could not evict LLM response cache entries: %s", e)
+        logger.debug("Evicted %d LLM response cache entries", removed)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+def _default_cache_dir() -> Path:
+    """Return the cache root ($KG_CACHE_DIR or ~/.cache/knowledge-graph-builder)."""
+    env = os.environ.get("KG_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    return Path.home() / ".cache" / "knowledge-graph-builder"
@@ -2,15 +2,140 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import logging
 import os
-from typing import Optional
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Coroutine, Optional, TypeVar
 
-import openai
+from extractor.llm_cache import DEFAULT_MAX_BYTES, DEFAULT_TTL_S, LLMCache, request_key
+from extractor.llm_http import close_async_clients, connection_stats, shared_async_client, shared_client
+from extractor.llm_throttle import DEFAULT_MAX_RETRIES, AdaptiveLimit, is_retryable, retry_delay
+
+if TYPE_CHECKING:
+    import openai
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Cumulative request count, seconds spent waiting on the server and retries
+_stats = {"calls": 0, "wait_s": 0.0, "retries": 0}
+_stats_lock = threading.Lock()
+
+# Maximum in-flight async requests per endpoint (vLLM serves 64+ sequences at once)
+DEFAULT_CONCURRENCY = 64
+
+# Endpoint -> limit; "" holds the default for endpoints not listed
+_concurrency: dict[str, int] = {"": DEFAULT_CONCURRENCY}
+# Limiters belong to an event loop, so each loop gets its own per endpoint
+_limiters: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, AdaptiveLimit]] = (
+    weakref.WeakKeyDictionary()
+)
+
+# Retries per request after a timeout, connection error, 408/409/429 or 5xx
+_max_retries = DEFAULT_MAX_RETRIES
+
+# Response cache shared by every phase; opened on first use unless configured
+_cache: Optional[LLMCache] = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def configure_cache(
+    enabled: bool = True,
+    cache_dir: Optional[str] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    ttl_s: Optional[float] = DEFAULT_TTL_S,
+) -> Optional[LLMCache]:
+    """Set up the response cache used by chat_completion.
+
+    Without a call, the cache is opened with the defaults on the first
+    request. Call with enabled=False to always go to the server.
+
+    Args:
+        enabled: Cache responses at all
+        cache_dir: Cache root directory (default: $KG_CACHE_DIR or ~/.cache/...)
+        max_bytes: Response size above which LRU eviction kicks in
+        ttl_s: Seconds a cached response stays valid (None or 0 = forever)
+
+    Returns:
+        The cache, or None if disabled or unavailable
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = LLMCache.open_default(cache_dir, max_bytes=max_bytes, ttl_s=ttl_s) if enabled else None
+        _cache_configured = True
+        return _cache
+
+
+def _get_cache() -> Optional[LLMCache]:
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            _cache = LLMCache.open_default()
+            _cache_configured = True
+        return _cache
+
+
+def set_concurrency(limit: int, base_url: Optional[str] = None) -> None:
+    """Set how many async requests may be in flight at once.
+
+    Every achat_completion call to the same endpoint shares one limit,
+    whichever phase or coroutine issues it. It is an upper bound: the
+    limit in effect drops when the server errors or queues up and climbs
+    back as requests succeed (see llm_throttle.AdaptiveLimit). It also
+    sizes the connection pool of clients created afterwards.
+
+    Args:
+        limit: Maximum concurrent requests
+        base_url: Endpoint to configure (None = default for all endpoints)
+    """
+    if limit < 1:
+        raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+    _concurrency[_endpoint(base_url) if base_url else ""] = limit
+
+
+def set_max_retries(retries: int) -> None:
+    """Set how many times a failed request is retried (0 = never)."""
+    global _max_retries
+    _max_retries = max(0, retries)
+
+
+def _endpoint(base_url) -> str:
+    return str(base_url).rstrip("/")
+
+
+def _limit(endpoint: str) -> int:
+    return _concurrency.get(endpoint, _concurrency[""])
+
+
+def _limiter(endpoint: str) -> AdaptiveLimit:
+    """Return the running loop's concurrency limiter for an endpoint."""
+    per_loop = _limiters.setdefault(asyncio.get_running_loop(), {})
+    limiter = per_loop.get(endpoint)
+    if limiter is None:
+        limiter = per_loop[endpoint] = AdaptiveLimit(_limit(endpoint), name=endpoint)
+    return limiter
+
+
+def _resolve_base_url(base_url: Optional[str]) -> str:
+    """Return base_url, falling back to $VLLM_BASE_URL."""
+    if base_url:
+        return base_url
+    if "VLLM_BASE_URL" in os.environ:
+        return os.environ["VLLM_BASE_URL"]
+    raise ValueError(
+        "LLM endpoint not configured. "
+        "Set the VLLM_BASE_URL environment variable (e.g. in .env)."
+    )
+
 
 def get_client(base_url: Optional[str] = None) -> openai.OpenAI:
     """Get an OpenAI-compatible client pointing at the vLLM server.
@@ -21,18 +146,141 @@ def get_client(base_url: Optional[str] = None) -> openai.OpenAI:
 
     Raises ValueError if neither is provided.
     Set VLLM_BASE_URL in your .env file for local use.
+
+    Clients are shared per endpoint across the process, so all phases reuse
+    one connection pool (see extractor.llm_http).
     """
-    if base_url:
-        url = base_url
-    elif "VLLM_BASE_URL" in os.environ:
-        url = os.environ["VLLM_BASE_URL"]
+    url = _resolve_base_url(base_url)
+    return shared_client(url, _limit(_endpoint(url)))
+
+
+def get_async_client(base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+    """Get an asyncio OpenAI-compatible client, for use with achat_completion.
+
+    The base URL is resolved like get_client(). Must be called inside the
+    event loop that uses the client; the loop's clients are shared per
+    endpoint and closed with llm_http.close_async_clients().
+    """
+    url = _resolve_base_url(base_url)
+    return shared_async_client(url, _limit(_endpoint(url)))
+
+
+def run_sync(coro: Coroutine[object, object, T]) -> T:
+    """Run an async phase to completion from synchronous code.
+
+    The coroutine gets its own event loop, whose async clients are closed
+    before it ends. The synchronous entry points of the phases
+    (ConceptExtractor.extract, GraphExpander.expand,
+    CourseBuilder.build_courses) are built on this; inside a running event
+    loop, await their async counterparts instead.
+
+    Raises:
+        RuntimeError: If called while an event loop is running in this thread
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
     else:
-        raise ValueError(
-            "LLM endpoint not configured. "
-            "Set the VLLM_BASE_URL environment variable (e.g. in .env)."
+        coro.close()
+        raise RuntimeError(
+            f"{coro.__qualname__}() cannot be run synchronously inside a running event loop; "
+            "await it instead"
+        )
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(main())
+
+
+def _messages(system: str, user: str) -> list[dict]:
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": user})
+    return messages
+
+
+def _cached(model: str, system: str, user: str, max_tokens: int, temperature: float):
+    """Return (cache, key, cached response or None); cache is None when disabled."""
+    cache = _get_cache()
+    if cache is None:
+        return None, None, None
+    key = request_key(model, system, user, max_tokens, temperature)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.debug("Chat completion served from cache (model=%s)", model)
+    return cache, key, cached
+
+
+def forget_response(
+    model: str,
+    system: str,
+    user: str,
+    max_tokens: int = 8192,
+    temperature: float = 0.3,
+) -> None:
+    """Drop the cached response to a request, so the next one asks the server.
+
+    Call with the arguments of a chat_completion whose response turned out
+    unusable (e.g. parse_json_response() found no JSON in it), so that a
+    rerun does not replay the same bad response.
+    """
+    cache = _get_cache()
+    if cache is not None:
+        cache.delete(request_key(model, system, user, max_tokens, temperature))
+
+
+async def aforget_response(
+    model: str,
+    system: str,
+    user: str,
+    max_tokens: int = 8192,
+    temperature: float = 0.3,
+) -> None:
+    """Async forget_response(), with the cache I/O in a worker thread."""
+    await asyncio.to_thread(forget_response, model, system, user, max_tokens, temperature)
+
+
+def _record(start: float) -> float:
+    """Count a finished request and return its latency."""
+    latency = time.perf_counter() - start
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["wait_s"] += latency
+    return latency
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Return the wait before retry number attempt+1, or None to give up."""
+    delay = retry_delay(error, attempt, _max_retries)
+    if delay is not None:
+        with _stats_lock:
+            _stats["retries"] += 1
+        logger.warning(
+            "LLM request failed (%s: %s); retry %d/%d in %.1fs",
+            type(error).__name__, error, attempt + 1, _max_retries, delay,
         )
+    return delay
+
 
-    return openai.OpenAI(base_url=url, api_key="unused")
+def _store(cache: Optional[LLMCache], key: Optional[str], text: str, finish_reason: str) -> None:
+    """Cache a response if it is complete (truncated or filtered ones are asked again)."""
+    if cache is not None and text and finish_reason == "stop":
+        cache.put(key, text, finish_reason)
+
+
+def _unpack(response) -> tuple[str, str]:
+    """Extract (text, finish_reason) from a response."""
+    choice = response.choices[0]
+    text = choice.message.content or ""
+    finish_reason = choice.finish_reason or "unknown"
+    logger.debug("Got response: %d chars, finish_reason=%s", len(text), finish_reason)
+    return text, finish_reason
 
 
 def chat_completion(
@@ -47,28 +295,276 @@ def chat_completion(
 
     finish_reason is "stop" for a clean finish or "length" if the response was
     truncated by max_tokens.
+
+    Responses are served from the response cache when the same request was
+    answered before (see configure_cache); only complete responses
+    (finish_reason "stop") are cached, and callers can drop one they could
+    not use with forget_response(). Timeouts, connection errors and
+    408/409/429/5xx responses are retried up to set_max_retries() times
+    with jittered exponential backoff, or after the server's Retry-After.
     """
-    messages = []
-    if system:
-        messages.append({"role": "system", "content": system})
-    messages.append({"role": "user", "content": user})
+    cache, key, cached = _cached(model, system, user, max_tokens, temperature)
+    if cached is not None:
+        return cached
 
     logger.debug("Sending chat completion request (model=%s, max_tokens=%d)", model, max_tokens)
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        max_tokens=max_tokens,
-        temperature=temperature,
+    for attempt in itertools.count():
+        start = time.perf_counter()
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=_messages(system, user),
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        except Exception as e:
+            _record(start)
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        _record(start)
+        text, finish_reason = _unpack(response)
+        _store(cache, key, text, finish_reason)
+        return text, finish_reason
+
+
+def stream_chat_completion(
+    client: openai.OpenAI,
+    model: str,
+    system: str,
+    user: str,
+    max_tokens: int = 8192,
+    temperature: float = 0.3,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> tuple[str, str]:
+    """Streaming chat_completion: same arguments, caching and return value.
+
+    The response is requested with ``stream=True`` and each piece of text is
+    passed to on_text as it arrives, so callers can parse and act on the
+    output before it is complete (see json_stream.JSONObjectStream). A
+    cached response is passed to on_text in one piece.
+
+    A failed request is retried like chat_completion only while no text has
+    been received. If the stream breaks after that, the text received so
+    far is returned with finish_reason "error" (and not cached), since
+    on_text has already seen it: callers keep what they parsed and treat
+    the response like a truncated one.
+    """
+    cache, key, cached = _cached(model, system, user, max_tokens, temperature)
+    if cached is not None:
+        if on_text is not None:
+            on_text(cached[0])
+        return cached
+
+    logger.debug("Streaming chat completion request (model=%s, max_tokens=%d)", model, max_tokens)
+
+    for attempt in itertools.count():
+        start = time.perf_counter()
+        parts: list[str] = []
+        finish_reason = "unknown"
+        try:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=_messages(system, user),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+            )
+            for chunk in stream:
+                delta, reason = _stream_delta(chunk)
+                if delta:
+                    if not parts:
+                        logger.debug("First token after %.2fs", time.perf_counter() - start)
+                    parts.append(delta)
+                    if on_text is not None:
+                        on_text(delta)
+                if reason:
+                    finish_reason = reason
+        except Exception as e:
+            _record(start)
+            if parts:
+                finish_reason = _partial_response(parts, e)
+                break
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        _record(start)
+        break
+
+    text = "".join(parts)
+    logger.debug("Got streamed response: %d chars, finish_reason=%s", len(text), finish_reason)
+    _store(cache, key, text, finish_reason)
+    return text, finish_reason
+
+
+def _partial_response(parts: list[str], error: Exception) -> str:
+    """Log a stream that broke after some text arrived; return its finish_reason."""
+    logger.warning(
+        "LLM stream failed after %d chars (%s: %s); keeping the partial response",
+        sum(map(len, parts)), type(error).__name__, error,
     )
+    return "error"
 
-    choice = response.choices[0]
-    text = choice.message.content or ""
-    finish_reason = choice.finish_reason or "unknown"
-    logger.debug("Got response: %d chars, finish_reason=%s", len(text), finish_reason)
+
+def _stream_delta(chunk) -> tuple[Optional[str], Optional[str]]:
+    """Return (text, finish_reason) of a streamed chunk; either may be None."""
+    if not chunk.choices:
+        return None, None
+    choice = chunk.choices[0]
+    return (choice.delta.content if choice.delta else None), choice.finish_reason
+
+
+async def achat_completion(
+    client: openai.AsyncOpenAI,
+    model: str,
+    system: str,
+    user: str,
+    max_tokens: int = 8192,
+    temperature: float = 0.3,
+) -> tuple[str, str]:
+    """Async chat_completion: same arguments, caching, retries and return value.
+
+    At most set_concurrency() requests per endpoint are in flight at once;
+    the rest wait for a slot, so callers can submit hundreds of requests
+    with asyncio.gather. Errors and rising per-token latency lower the
+    limit in effect, and successes raise it back (AIMD). Cache lookups and
+    writes run in a worker thread, outside the limited section, so the
+    event loop never waits on SQLite.
+    """
+    cache, key, cached = await asyncio.to_thread(_cached, model, system, user, max_tokens, temperature)
+    if cached is not None:
+        return cached
+
+    limiter = _limiter(_endpoint(client.base_url))
+    for attempt in itertools.count():
+        async with limiter:
+            logger.debug("Sending chat completion request (model=%s, max_tokens=%d)", model, max_tokens)
+            start = time.perf_counter()
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=_messages(system, user),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            except Exception as e:
+                _record(start)
+                if is_retryable(e):
+                    limiter.on_error(start, e)
+                error = e
+            else:
+                latency = _record(start)
+                usage = getattr(response, "usage", None)
+                limiter.on_success(start, latency, getattr(usage, "completion_tokens", None))
+                break
+        # Back off outside the limiter so waiting retries do not hold slots
+        delay = _retry_delay(error, attempt)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+
+    text, finish_reason = _unpack(response)
+    await asyncio.to_thread(_store, cache, key, text, finish_reason)
+    return text, finish_reason
+
+
+async def astream_chat_completion(
+    client: openai.AsyncOpenAI,
+    model: str,
+    system: str,
+    user: str,
+    max_tokens: int = 8192,
+    temperature: float = 0.3,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> tuple[str, str]:
+    """Async stream_chat_completion: same arguments, caching, retries and return value.
+
+    Shares the endpoint's concurrency limit with achat_completion; a stream
+    holds its slot until the response ends. Like achat_completion, cache
+    I/O runs in a worker thread. A stream that breaks after text has
+    arrived returns that text with finish_reason "error".
+    """
+    cache, key, cached = await asyncio.to_thread(_cached, model, system, user, max_tokens, temperature)
+    if cached is not None:
+        if on_text is not None:
+            on_text(cached[0])
+        return cached
+
+    limiter = _limiter(_endpoint(client.base_url))
+    for attempt in itertools.count():
+        parts: list[str] = []
+        finish_reason = "unknown"
+        completion_tokens = None
+        async with limiter:
+            logger.debug("Streaming chat completion request (model=%s, max_tokens=%d)", model, max_tokens)
+            start = time.perf_counter()
+            try:
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=_messages(system, user),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta, reason = _stream_delta(chunk)
+                    if delta:
+                        if not parts:
+                            logger.debug("First token after %.2fs", time.perf_counter() - start)
+                        parts.append(delta)
+                        if on_text is not None:
+                            on_text(delta)
+                    if reason:
+                        finish_reason = reason
+                    usage = getattr(chunk, "usage", None)  # Sent last, if the server reports it
+                    if usage is not None:
+                        completion_tokens = usage.completion_tokens
+            except Exception as e:
+                _record(start)
+                if is_retryable(e):
+                    limiter.on_error(start, e)
+                error = e
+            else:
+                latency = _record(start)
+                limiter.on_success(start, latency, completion_tokens)
+                break
+        if parts:
+            finish_reason = _partial_response(parts, error)
+            break
+        delay = _retry_delay(error, attempt)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+
+    text = "".join(parts)
+    logger.debug("Got streamed response: %d chars, finish_reason=%s", len(text), finish_reason)
+    await asyncio.to_thread(_store, cache, key, text, finish_reason)
     return text, finish_reason
 
 
+def llm_stats() -> dict:
+    """Return cumulative chat completion stats since import.
+
+    Keys: "calls" and "wait_s" (requests sent to the server and seconds spent
+    waiting on them), "retries", "cache_hits", "cache_misses", and "connections" and
+    "reused" (HTTP connections opened, requests sent over an open one).
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    conn = connection_stats()
+    stats["connections"] = conn["connections"]
+    stats["reused"] = conn["reused"]
+    cache = _cache
+    stats["cache_hits"] = cache.hits if cache is not None else 0
+    stats["cache_misses"] = cache.misses if cache is not None else 0
+    return stats
+
+
 def parse_json_response(text: str) -> dict:
     """Parse JSON from an LLM response, handling markdown code blocks and truncation."""
     # Strip markdown code fences.  Use rfind for the closing fence because the
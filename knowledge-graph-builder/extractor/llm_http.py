@@ -0,0 +1,192 @@
+"""Shared, pooled HTTP clients for the LLM endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT_S = 10.0
+# A long completion sends nothing until it is done (lessons are up to 6k tokens)
+READ_TIMEOUT_S = 600.0
+WRITE_TIMEOUT_S = 30.0
+# Waiting for a free pooled connection while other requests are in flight
+POOL_TIMEOUT_S = 600.0
+# Just under vLLM's default server keep-alive (5s, VLLM_HTTP_TIMEOUT_KEEP_ALIVE),
+# so an idle connection is never reused while the server is closing it
+KEEPALIVE_EXPIRY_S = 4.0
+
+# Cumulative requests sent, TCP connections opened and TLS handshakes made
+_conn_stats = {"requests": 0, "connections": 0, "tls_handshakes": 0}
+_stats_lock = threading.Lock()
+
+# (endpoint, connection limit) -> client
+_clients: dict[tuple[str, int], openai.OpenAI] = {}
+_clients_lock = threading.Lock()
+# Async connections belong to an event loop, so each loop has its own clients
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, int], openai.AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+
+
+def shared_client(base_url: str, max_connections: int) -> openai.OpenAI:
+    """
+    Return the process-wide client of an endpoint, creating it on first use.
+
+    Every phase calling the same endpoint shares the client and so its
+    connection pool: keep-alive connections opened by one request are reused
+    by the next instead of paying TCP/TLS setup again.
+
+    Args:
+        base_url: OpenAI-compatible endpoint
+        max_connections: Pool size (the endpoint's concurrency limit)
+
+    Returns:
+        openai.OpenAI with pooled connections and explicit timeouts
+    """
+    key = (base_url.rstrip("/"), max_connections)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            import openai
+
+            timeout, limits = _pool_settings(max_connections)
+            http_client = openai.DefaultHttpxClient(
+                timeout=timeout, limits=limits, event_hooks={"request": [_on_request]},
+            )
+            client = _clients[key] = openai.OpenAI(
+                base_url=base_url,
+                api_key="unused",
+                timeout=timeout,
+                max_retries=0,  # Retried by llm_client, which also adapts concurrency
+                http_client=http_client,
+            )
+            logger.debug("Created LLM client for %s (%d connections)", key[0], max_connections)
+        return client
+
+
+def shared_async_client(base_url: str, max_connections: int) -> openai.AsyncOpenAI:
+    """
+    Return the running event loop's async client of an endpoint.
+
+    Like shared_client(), but one per event loop; close them with
+    close_async_clients() before the loop ends.
+
+    Args:
+        base_url: OpenAI-compatible endpoint
+        max_connections: Pool size (the endpoint's concurrency limit)
+
+    Returns:
+        openai.AsyncOpenAI with pooled connections and explicit timeouts
+    """
+    key = (base_url.rstrip("/"), max_connections)
+    per_loop = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = per_loop.get(key)
+    if client is None:
+        import openai
+
+        timeout, limits = _pool_settings(max_connections)
+        http_client = openai.DefaultAsyncHttpxClient(
+            timeout=timeout, limits=limits, event_hooks={"request": [_aon_request]},
+        )
+        client = per_loop[key] = openai.AsyncOpenAI(
+            base_url=base_url,
+            api_key="unused",
+            timeout=timeout,
+            max_retries=0,  # Retried by llm_client, which also adapts concurrency
+            http_client=http_client,
+        )
+        logger.debug("Created async LLM client for %s (%d connections)", key[0], max_connections)
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the running event loop's async clients (call before it ends)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+def connection_stats() -> dict:
+    """Return cumulative {"requests", "connections", "tls_handshakes", "reused"}.
+
+    ``reused`` counts requests sent over an already open connection.
+    Connections and handshakes are best-effort (see _attach_trace): they stay
+    0, and so does ``reused``, with a transport that does not report them.
+    """
+    with _stats_lock:
+        stats = dict(_conn_stats)
+    stats["reused"] = max(0, stats["requests"] - stats["connections"]) if stats["connections"] else 0
+    return stats
+
+
+def _pool_settings(max_connections: int):
+    """Return (timeout, limits) for a pool of max_connections.
+
+    Built from the classes openai exports, so they match whichever HTTP
+    library the installed openai is built on.
+    """
+    import openai
+
+    timeout = openai.Timeout(
+        connect=CONNECT_TIMEOUT_S, read=READ_TIMEOUT_S, write=WRITE_TIMEOUT_S, pool=POOL_TIMEOUT_S,
+    )
+    limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY_S,
+    )
+    return timeout, limits
+
+
+def _count(event_name: str) -> None:
+    """Count connection setup events reported by the httpcore trace extension."""
+    if event_name == "connection.connect_tcp.complete":
+        key = "connections"
+    elif event_name == "connection.start_tls.complete":
+        key = "tls_handshakes"
+    else:
+        return
+    with _stats_lock:
+        _conn_stats[key] += 1
+
+
+def _trace(event_name: str, info: dict) -> None:
+    _count(event_name)
+
+
+async def _atrace(event_name: str, info: dict) -> None:
+    _count(event_name)
+
+
+def _attach_trace(request, callback) -> None:
+    """
+    Ask the transport to report connection setup to callback, if it can.
+
+    The "trace" request extension belongs to the transport (httpcore), not
+    to openai's public API; if it is not supported, connections are simply
+    not counted.
+    """
+    try:
+        request.extensions["trace"] = callback
+    except (AttributeError, TypeError):
+        pass
+
+
+def _on_request(request) -> None:
+    with _stats_lock:
+        _conn_stats["requests"] += 1
+    _attach_trace(request, _trace)
+
+
+async def _aon_request(request) -> None:
+    with _stats_lock:
+        _conn_stats["requests"] += 1
+    _attach_trace(request, _atrace)
@@ -0,0 +1,160 @@
+"""Retry policy and adaptive (AIMD) concurrency for LLM requests."""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 4
+BASE_DELAY_S = 1.0
+MAX_DELAY_S = 30.0
+# Longest Retry-After honoured; longer values are clamped to this
+MAX_RETRY_AFTER_S = 120.0
+
+# Status codes worth retrying: timeout, conflict, rate limit, server errors
+_RETRY_STATUS = {408, 409, 429}
+
+# Multiplicative decrease on errors and on latency above the tolerance
+ERROR_BACKOFF = 0.5
+LATENCY_BACKOFF = 0.8
+# Per-token latency above this multiple of the fastest seen means the server is queueing
+LATENCY_TOLERANCE = 3.0
+# Shorter completions are dominated by time-to-first-token; they only count for errors
+MIN_TOKENS_FOR_LATENCY = 64
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for timeouts, connection errors, 408/409/429 and 5xx responses."""
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in _RETRY_STATUS or error.status_code >= 500
+    return False
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return the server's requested wait in seconds (Retry-After), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return when.timestamp() - time.time()
+
+
+def retry_delay(error: BaseException, attempt: int, max_retries: int) -> Optional[float]:
+    """
+    Return how long to wait before retrying a failed request.
+
+    Uses the server's Retry-After when given, otherwise exponential backoff
+    with full jitter (uniform in [0, min(MAX_DELAY_S, BASE_DELAY_S * 2**attempt)]).
+
+    Args:
+        error: Exception raised by the request
+        attempt: Number of retries already made
+        max_retries: Retries allowed per request
+
+    Returns:
+        Seconds to wait, or None if the request must not be retried
+    """
+    if attempt >= max_retries or not is_retryable(error):
+        return None
+    requested = retry_after(error)
+    if requested is not None and requested >= 0:
+        return min(requested, MAX_RETRY_AFTER_S)
+    return random.uniform(0, min(MAX_DELAY_S, BASE_DELAY_S * 2**attempt))
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of one endpoint, adjusted by AIMD.
+
+    Each successful request raises the limit by 1/limit (about +1 per
+    ``limit`` completions), up to ``max_limit``. A retryable error multiplies
+    it by ERROR_BACKOFF, and a completion whose per-token latency exceeds
+    LATENCY_TOLERANCE times the fastest seen multiplies it by LATENCY_BACKOFF.
+    Responses to requests sent before the last decrease do not decrease it
+    again, so one overloaded burst halves the limit once rather than once per
+    request.
+
+    Use as ``async with limit:`` around a request, then report its outcome
+    with on_success() or on_error(). Belongs to one event loop.
+    """
+
+    def __init__(self, max_limit: int, name: str = ""):
+        """
+        Args:
+            max_limit: Upper bound (and starting value) of the limit
+            name: Endpoint, for log messages
+        """
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.name = name
+        self.in_flight = 0
+        self._fastest: Optional[float] = None  # Lowest seconds per token seen
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> AdaptiveLimit:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < max(1, int(self.limit)))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, started: float, latency: float, completion_tokens: Optional[int]) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            started: time.perf_counter() when the request was sent
+            latency: Seconds the request took
+            completion_tokens: Tokens generated (None if the server did not say)
+        """
+        if completion_tokens and completion_tokens >= MIN_TOKENS_FOR_LATENCY:
+            per_token = latency / completion_tokens
+            if self._fastest is None or per_token < self._fastest:
+                self._fastest = per_token
+            elif per_token > self._fastest * LATENCY_TOLERANCE:
+                self._decrease(started, LATENCY_BACKOFF, f"latency {per_token * 1000:.0f} ms/token")
+                return
+        self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def on_error(self, started: float, error: BaseException) -> None:
+        """Record a retryable failure of a request sent at ``started``."""
+        self._decrease(started, ERROR_BACKOFF, type(error).__name__)
+
+    def _decrease(self, started: float, factor: float, reason: str) -> None:
+        if started < self._last_decrease:
+            return
+        self._last_decrease = time.perf_counter()
+        self.limit = max(1.0, self.limit * factor)
+        logger.info("LLM concurrency for %s lowered to %d (%s)", self.name or "endpoint", int(self.limit), reason)
@@ -3,8 +3,9 @@
 
 Two usage modes:
 
-  1. Pass a Phase 1 JSON file (from analyzer/results/):
+  1. Pass a Phase 1 JSON file or sectioned directory (from analyzer/results/):
        python extractor/test_extractor.py --analysis analyzer/results/transformers_20260218_020450.json
+       python extractor/test_extractor.py --analysis analyzer/results/transformers_20260218_020450/
 
   2. Pass a repo path/URL and run Phase 1 → Phase 2 in sequence:
        python extractor/test_extractor.py /path/to/repo
@@ -24,6 +25,7 @@ from git import Repo as GitRepo
 
 from analyzer import RepoAnalyzer
 from analyzer.models import UniversalRepoAnalysis
+from analyzer.serialization import read_analysis
 from extractor import ConceptExtractor
 
 # Setup logging
@@ -37,12 +39,11 @@ logger = logging.getLogger(__name__)
 
 
 def load_analysis(path: str | Path) -> UniversalRepoAnalysis:
-    """Load a Phase 1 analysis from a JSON file."""
+    """Load a Phase 1 analysis from a JSON file or a sectioned directory (read lazily)."""
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Analysis file not found: {path}")
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return UniversalRepoAnalysis.from_dict(data)
+    return read_analysis(path)
 
 
 def run_phase1(repo_path: str) -> tuple[UniversalRepoAnalysis, bool, Path | None]:
@@ -106,7 +107,7 @@ examples:
         "--analysis", "-a",
         default=None,
         metavar="PATH",
-        help="Phase 1 JSON file to use directly (skips Phase 1)",
+        help="Phase 1 JSON file or sectioned directory to use directly (skips Phase 1)",
     )
     parser.add_argument(
         "--output-dir", "-o",
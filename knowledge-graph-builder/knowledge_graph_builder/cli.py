@@ -9,15 +9,8 @@ import sys
 import tempfile
 from pathlib import Path
 
-from git import Repo as GitRepo
-
-from knowledge_graph_builder.concept_extractor import ConceptExtractor
-from knowledge_graph_builder.course_builder import CourseBuilder
-from knowledge_graph_builder.expander import GraphExpander
-from knowledge_graph_builder.graph import KnowledgeGraph
-from knowledge_graph_builder.models import RepoAnalysis
-from knowledge_graph_builder.repo_analyzer import RepoAnalyzer
-from knowledge_graph_builder.scaffold import Scaffolder
+# Each command imports the phases it runs (and git, openai, networkx behind
+# them), so --help and the lighter commands start without loading them all
 
 logger = logging.getLogger("knowledge_graph_builder")
 
@@ -33,26 +26,24 @@ def setup_logging(verbose: bool = False) -> None:
 
 def cmd_pipeline(args: argparse.Namespace) -> None:
     """Run the full pipeline: analyze → extract → expand → build courses → scaffold."""
+    from git import Repo as GitRepo
+
+    from analyzer.clone import clone_repository, is_remote_url
+    from knowledge_graph_builder.concept_extractor import ConceptExtractor
+    from knowledge_graph_builder.course_builder import CourseBuilder
+    from knowledge_graph_builder.expander import GraphExpander
+    from knowledge_graph_builder.repo_analyzer import RepoAnalyzer
+    from knowledge_graph_builder.scaffold import Scaffolder
+
     setup_logging(args.verbose)
 
     repo_path = Path(args.repo)
 
     # If it's a URL, clone it first
-    if args.repo.startswith("http://") or args.repo.startswith("https://"):
+    if is_remote_url(args.repo):
         clone_dir = Path(args.clone_dir) if args.clone_dir else Path(tempfile.mkdtemp(prefix="kg_"))
-        if not (clone_dir / ".git").exists():
-            logger.info("Cloning %s to %s ...", args.repo, clone_dir)
-            GitRepo.clone_from(args.repo, str(clone_dir), depth=1)
-            # For commit history, do a partial unshallow
-            logger.info("Fetching commit history (last %d commits)...", args.max_commits)
-            git_repo = GitRepo(clone_dir)
-            try:
-                git_repo.git.fetch("--deepen", str(args.max_commits))
-            except Exception as e:
-                logger.warning("Could not deepen clone: %s", e)
-        else:
-            logger.info("Using existing clone at %s", clone_dir)
-        repo_path = clone_dir
+        logger.info("Repository URL: %s (clone directory: %s)", args.repo, clone_dir)
+        repo_path = clone_repository(args.repo, clone_dir, max_commits=args.max_commits, blobless=args.blobless)
 
     output_dir = Path(args.output)
 
@@ -105,6 +96,8 @@ def cmd_pipeline(args: argparse.Namespace) -> None:
 
 def cmd_analyze(args: argparse.Namespace) -> None:
     """Run only the repo analysis phase."""
+    from knowledge_graph_builder.repo_analyzer import RepoAnalyzer
+
     setup_logging(args.verbose)
     analyzer = RepoAnalyzer(args.repo)
     analysis = analyzer.analyze()
@@ -120,6 +113,9 @@ def cmd_analyze(args: argparse.Namespace) -> None:
 
 def cmd_extract(args: argparse.Namespace) -> None:
     """Run concept extraction from an existing analysis file."""
+    from knowledge_graph_builder.concept_extractor import ConceptExtractor
+    from knowledge_graph_builder.models import RepoAnalysis
+
     setup_logging(args.verbose)
     analysis_path = Path(args.analysis)
     if not analysis_path.is_absolute():
@@ -140,6 +136,9 @@ def cmd_extract(args: argparse.Namespace) -> None:
 
 def cmd_build(args: argparse.Namespace) -> None:
     """Build courses from an existing graph file."""
+    from knowledge_graph_builder.course_builder import CourseBuilder
+    from knowledge_graph_builder.graph import KnowledgeGraph
+
     setup_logging(args.verbose)
     graph_path = Path(args.graph)
     if not graph_path.is_absolute():
@@ -160,13 +159,16 @@ def cmd_build(args: argparse.Namespace) -> None:
 
 def cmd_scaffold(args: argparse.Namespace) -> None:
     """Generate a course repo from existing graph and courses files."""
+    from knowledge_graph_builder.graph import KnowledgeGraph
+    from knowledge_graph_builder.models import Course
+    from knowledge_graph_builder.scaffold import Scaffolder
+
     setup_logging(args.verbose)
     graph_path = Path(args.graph)
     if not graph_path.is_absolute():
         graph_path = Path(__file__).parent / graph_path
     kg = KnowledgeGraph.load(graph_path)
 
-    from knowledge_graph_builder.models import Course
     courses_path = Path(args.courses)
     if not courses_path.is_absolute():
         courses_path = Path(__file__).parent / courses_path
@@ -195,6 +197,7 @@ def main() -> None:
     p_pipeline.add_argument("--clone-dir", default=None, help="Directory to clone repo into (if URL)")
     p_pipeline.add_argument("--model", default="/data/models/gemma-3-27b-it", help="LLM model name on vLLM server")
     p_pipeline.add_argument("--max-commits", type=int, default=2000, help="Max commits to fetch for analysis")
+    p_pipeline.add_argument("--blobless", action="store_true", help="Clone without file contents, checking out only the analyzed paths")
     p_pipeline.add_argument("--expansion-rounds", type=int, default=2, help="Number of graph expansion rounds")
     p_pipeline.add_argument("--skip-expansion", action="store_true", help="Skip graph expansion phase")
     p_pipeline.add_argument("--skip-lessons", action="store_true", help="Skip lesson generation (faster)")
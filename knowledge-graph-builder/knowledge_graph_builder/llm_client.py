@@ -5,9 +5,10 @@ from __future__ import annotations
 import json
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import openai
+if TYPE_CHECKING:
+    import openai
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,9 @@ def get_client(base_url: Optional[str] = None) -> openai.OpenAI:
             "Set the VLLM_BASE_URL environment variable (e.g. in .env)."
         )
 
+    # Imported here: openai takes longer to import than the rest of the CLI
+    import openai
+
     return openai.OpenAI(base_url=url, api_key="unused")
 
 
@@ -13,18 +13,16 @@ Automatically clones and cleans up temporary repositories.
 
 import argparse
 import logging
-import shutil
 import sys
 import tempfile
 from pathlib import Path
+from typing import Optional
 
-from git import Repo as GitRepo
-
-from analyzer import RepoAnalyzer
-from extractor import ConceptExtractor
-from expander import GraphExpander
-from courseBuilder import CourseBuilder
-from scaffolder import Scaffolder
+# Phase modules (and git, openai, networkx behind them) are imported by the
+# functions that need them, so --help and argument errors return immediately
+from analyzer.mirror import DEFAULT_MAX_BYTES as DEFAULT_MIRROR_MAX_BYTES
+from analyzer.profiling import Profiler
+from extractor.llm_cache import DEFAULT_MAX_BYTES as DEFAULT_LLM_CACHE_MAX_BYTES, DEFAULT_TTL_S
 
 # Setup logging
 logging.basicConfig(
@@ -36,13 +34,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_phase_1_analyze(repo_path: Path, config: dict):
+def run_phase_1_analyze(repo_path: Path, config: dict, profiler: Optional[Profiler] = None):
     """Phase 1: Repository Analysis."""
     logger.info("=" * 70)
     logger.info("Phase 1: Repository Analysis")
     logger.info("=" * 70)
 
+    from analyzer import RepoAnalyzer
+
     analyzer = RepoAnalyzer(repo_path, config=config)
+    if profiler is not None:
+        profiler.instrument(analyzer.analyzer)
     analysis = analyzer.analyze()
 
     logger.info(f"✅ Detected type: {analysis.repo_type.value}")
@@ -60,6 +62,8 @@ def run_phase_2_extract(analysis, model: str):
     logger.info("Phase 2: Concept Extraction")
     logger.info("=" * 70)
 
+    from extractor import ConceptExtractor
+
     extractor = ConceptExtractor(model=model)
     kg = extractor.extract(analysis)
 
@@ -75,6 +79,8 @@ def run_phase_3_expand(kg, model: str, rounds: int):
     logger.info("Phase 3: Graph Expansion")
     logger.info("=" * 70)
 
+    from expander import GraphExpander
+
     expander = GraphExpander(model=model)
     kg = expander.expand(kg, rounds=rounds)
 
@@ -90,6 +96,8 @@ def run_phase_4_build(kg, model: str, skip_lessons: bool):
     logger.info("Phase 4: Course Building")
     logger.info("=" * 70)
 
+    from courseBuilder import CourseBuilder
+
     builder = CourseBuilder(model=model)
     courses = builder.build_courses(kg, generate_lessons=not skip_lessons)
 
@@ -105,6 +113,10 @@ def run_phase_5_scaffold(kg, courses, output_dir: Path, repo_path: Path, enable_
     logger.info("Phase 5: Scaffolding Course Repository")
     logger.info("=" * 70)
 
+    from git import Repo as GitRepo
+
+    from scaffolder import Scaffolder
+
     scaffolder = Scaffolder(kg, courses, enable_blockchain=enable_blockchain)
     course_repo = scaffolder.scaffold(output_dir, repo_path=repo_path)
 
@@ -151,8 +163,12 @@ def verify_pipeline_output(course_repo: Path, enable_blockchain: bool) -> None:
         logger.info(f"\n✅ All required files present")
 
 
-def print_pipeline_summary(analysis, kg, courses, course_repo: Path) -> None:
-    """Print a summary of the pipeline results."""
+def print_pipeline_summary(
+    analysis, kg, courses, course_repo: Path, profiler: Optional[Profiler] = None
+) -> None:
+    """Print a summary of the pipeline results (and the profile, if any)."""
+    from extractor.llm_client import llm_stats
+
     logger.info("")
     logger.info("=" * 70)
     logger.info("Pipeline Summary")
@@ -163,6 +179,16 @@ def print_pipeline_summary(analysis, kg, courses, course_repo: Path) -> None:
     logger.info(f"Concepts Extracted: {len(kg.get_all_concepts())}")
     logger.info(f"Courses Built: {len(courses)}")
     logger.info(f"Course Repository: {course_repo}")
+    stats = llm_stats()
+    logger.info(
+        f"LLM Requests: {stats['calls']} sent ({stats['retries']} retries), "
+        f"{stats['cache_hits']} served from cache ({stats['wait_s']:.1f}s waiting), "
+        f"{stats['connections']} connections opened, {stats['reused']} reused"
+    )
+    if profiler is not None:
+        logger.info("")
+        for line in profiler.summary_table().splitlines():
+            logger.info(line)
     logger.info("=" * 70)
 
 
@@ -191,11 +217,61 @@ def main():
         action="store_true",
         help="Keep the cloned repository after pipeline completion (default: auto-delete temporary clones)"
     )
+    parser.add_argument(
+        "--no-checkout",
+        action="store_true",
+        help="Clone without checking out files; Phase 1 reads sources from git objects"
+    )
+    parser.add_argument(
+        "--blobless",
+        action="store_true",
+        help="Clone without file contents and check out only the paths the detected analyzer reads"
+    )
+    parser.add_argument(
+        "--mirror-cache",
+        action="store_true",
+        help="Clone through a persistent local mirror of the repository, so later runs only fetch new commits"
+    )
+    parser.add_argument(
+        "--mirror-cache-max-gb",
+        type=float,
+        default=DEFAULT_MIRROR_MAX_BYTES / 1024**3,
+        help="Size above which least-recently-used mirrors are evicted (default: %(default)g)"
+    )
     parser.add_argument(
         "--model",
         default="/data/models/gemma-3-27b-it",
         help="LLM model name on vLLM server (default: gemma-3-27b-it)"
     )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=None,
+        help="Maximum concurrent LLM requests to the server (default: 64)"
+    )
+    parser.add_argument(
+        "--llm-max-retries",
+        type=int,
+        default=None,
+        help="Retries per LLM request after a timeout, connection error, 429 or 5xx (default: 4)"
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Send every LLM request to the server instead of reusing cached responses"
+    )
+    parser.add_argument(
+        "--llm-cache-ttl-days",
+        type=float,
+        default=DEFAULT_TTL_S / 86400,
+        help="Days a cached LLM response stays valid, 0 = forever (default: %(default)g)"
+    )
+    parser.add_argument(
+        "--llm-cache-max-gb",
+        type=float,
+        default=DEFAULT_LLM_CACHE_MAX_BYTES / 1024**3,
+        help="Size above which least-recently-used LLM responses are evicted (default: %(default)g)"
+    )
     parser.add_argument(
         "--max-commits",
         type=int,
@@ -207,6 +283,23 @@ def main():
         action="store_true",
         help="Enable fast mode (limited commit scan)"
     )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Worker processes for source parsing in Phase 1 (default: CPU count)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the previous Phase 1 result for this repo path and only re-scan what changed since"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall time, CPU time and peak memory per phase and analyzer scan "
+             "into <output>/profile.json (tracing slows the run down)"
+    )
     parser.add_argument(
         "--expansion-rounds",
         type=int,
@@ -231,6 +324,22 @@ def main():
 
     args = parser.parse_args()
 
+    from analyzer.clone import clone_repository, is_remote_url, remove_clone, repo_name
+    from analyzer.mirror import MirrorCache
+    from extractor.llm_client import configure_cache, llm_stats, set_concurrency, set_max_retries
+
+    configure_cache(
+        enabled=not args.no_llm_cache,
+        max_bytes=int(args.llm_cache_max_gb * 1024**3),
+        ttl_s=args.llm_cache_ttl_days * 86400,
+    )
+    if args.llm_concurrency:
+        set_concurrency(args.llm_concurrency)
+    if args.llm_max_retries is not None:
+        set_max_retries(args.llm_max_retries)
+    profiler = Profiler(counters={"llm": llm_stats}) if args.profile else None
+    phase = profiler.wrap if profiler is not None else (lambda func: func)
+
     # Track clone management
     is_temp_clone = False
     clone_dir = None
@@ -242,38 +351,28 @@ def main():
         logger.info("=" * 70)
 
         # Handle URL cloning
-        if repo_path.startswith("http://") or repo_path.startswith("https://"):
+        if is_remote_url(repo_path):
             # Determine clone directory
             if args.clone_dir:
                 clone_dir = Path(args.clone_dir)
             else:
                 # Create temporary directory
-                repo_name = repo_path.rstrip("/").split("/")[-1].replace(".git", "")
-                clone_dir = Path(tempfile.mkdtemp(prefix=f"pipeline_{repo_name}_"))
+                clone_dir = Path(tempfile.mkdtemp(prefix=f"pipeline_{repo_name(repo_path)}_"))
                 is_temp_clone = True
 
             logger.info(f"Repository URL: {repo_path}")
             logger.info(f"Clone directory: {clone_dir}")
 
-            # Check if already cloned
-            if (clone_dir / ".git").exists():
-                logger.info("♻️  Using existing clone")
-            else:
-                # Clone repository
-                logger.info("Cloning repository (depth=1)...")
-                clone_dir.mkdir(parents=True, exist_ok=True)
-                GitRepo.clone_from(repo_path, str(clone_dir), depth=1)
-                logger.info("✅ Clone completed")
-
-                # Deepen for commit history
-                logger.info(f"Fetching commit history (last {args.max_commits} commits)...")
-                try:
-                    git_repo = GitRepo(clone_dir)
-                    git_repo.git.fetch("--deepen", str(args.max_commits))
-                    logger.info("✅ Commit history fetched")
-                except Exception as e:
-                    logger.warning(f"Could not deepen clone: {e}")
-
+            clone_repository(
+                repo_path,
+                clone_dir,
+                max_commits=args.max_commits,
+                no_checkout=args.no_checkout,
+                blobless=args.blobless,
+                mirrors=MirrorCache.open_default(
+                    max_bytes=int(args.mirror_cache_max_gb * 1024**3)
+                ) if args.mirror_cache else None,
+            )
             repo_path = str(clone_dir)
         else:
             logger.info(f"Local repository: {repo_path}")
@@ -284,24 +383,31 @@ def main():
             config["use_fast_mode"] = True
         if args.max_commits:
             config["max_commit_scan"] = args.max_commits
+        if args.parse_workers:
+            config["parse_workers"] = args.parse_workers
+        if args.incremental:
+            config["incremental"] = True
+            if is_remote_url(args.repo):
+                # Stored analyses outlive the (possibly temporary) clone directory
+                config["source_url"] = args.repo
 
         # Create output directory
         output_dir = Path(args.output)
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Run all 5 phases
-        analysis = run_phase_1_analyze(Path(repo_path), config)
-        kg = run_phase_2_extract(analysis, args.model)
+        analysis = phase(run_phase_1_analyze)(Path(repo_path), config, profiler)
+        kg = phase(run_phase_2_extract)(analysis, args.model)
 
         if not args.skip_expansion:
-            kg = run_phase_3_expand(kg, args.model, args.expansion_rounds)
+            kg = phase(run_phase_3_expand)(kg, args.model, args.expansion_rounds)
         else:
             logger.info("\n" + "=" * 70)
             logger.info("Phase 3: Skipping graph expansion")
             logger.info("=" * 70)
 
-        courses = run_phase_4_build(kg, args.model, args.skip_lessons)
-        course_repo = run_phase_5_scaffold(
+        courses = phase(run_phase_4_build)(kg, args.model, args.skip_lessons)
+        course_repo = phase(run_phase_5_scaffold)(
             kg, courses, output_dir, Path(repo_path), args.enable_blockchain
         )
 
@@ -309,7 +415,7 @@ def main():
         verify_pipeline_output(course_repo, args.enable_blockchain)
 
         # Summary
-        print_pipeline_summary(analysis, kg, courses, course_repo)
+        print_pipeline_summary(analysis, kg, courses, course_repo, profiler)
 
         logger.info("")
         logger.info("✅ Pipeline evaluation completed successfully!")
@@ -322,12 +428,17 @@ def main():
         sys.exit(1)
 
     finally:
+        # Written on failure too, to show where the run got to
+        if profiler is not None:
+            profile_path = profiler.write(Path(args.output).resolve() / "profile.json")
+            logger.info(f"📊 Profile written to {profile_path}")
+
         # Cleanup temporary clone
         if is_temp_clone and not args.keep_clone:
             if clone_dir and clone_dir.exists():
                 logger.info("")
                 logger.info("🗑️  Cleaning up temporary clone...")
-                shutil.rmtree(clone_dir)
+                remove_clone(clone_dir)
                 logger.info("✅ Cleanup completed")
 
 
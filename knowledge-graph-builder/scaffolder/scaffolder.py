@@ -251,14 +251,38 @@ class Scaffolder:
                 code_refs.add(file_part)
 
         copied = 0
+        index = None
+        index_loaded = False
         for ref in code_refs:
             source_file = repo_path / ref
+            dest = src_dir / Path(ref).name
             if source_file.exists() and source_file.is_file():
-                dest = src_dir / Path(ref).name
                 try:
                     shutil.copy2(source_file, dest)
                     copied += 1
                 except Exception as e:
                     logger.debug("Could not copy %s: %s", ref, e)
+                continue
+
+            # No checkout (bare / --no-checkout clone): read from git objects
+            if not index_loaded:
+                index, index_loaded = self._repo_index(repo_path), True
+            if index is not None and index.is_file(ref):
+                try:
+                    dest.write_bytes(index.read_bytes(ref))
+                    copied += 1
+                except Exception as e:
+                    logger.debug("Could not copy %s: %s", ref, e)
 
         logger.info("Copied %d code snippets to src/", copied)
+
+    @staticmethod
+    def _repo_index(repo_path: Path):
+        """Return the analyzer's file index for repo_path, or None if unavailable."""
+        try:
+            from analyzer.file_index import RepoFileIndex
+
+            return RepoFileIndex.for_path(repo_path)
+        except Exception as e:
+            logger.debug("Could not index %s: %s", repo_path, e)
+            return None
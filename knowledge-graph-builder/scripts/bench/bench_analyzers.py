@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Benchmark: Phase 1 analyzer throughput on synthetic git repositories.
+
+Generates repositories locally with ``git fast-import`` in three layouts:
+
+  hf        HuggingFace Transformers shape (src/transformers/models/<model>/...,
+            modeling_utils.py, model docs)
+  generic   a Python package with sub-packages, tests and docs
+  js        a JavaScript-heavy tree (vendored node_modules, a few Python scripts)
+
+Files are added over the first commits; every later commit rewrites one file
+(mostly a root-level changelog) with a blob from a small pool, so even
+1M-commit histories generate in minutes.
+Repositories are kept under --work-dir and reused by later runs with the same
+spec.
+
+Each analyzer runs in a fresh process (one per layout) that times the file
+index, scan_components, scan_commits and scan_structure, each on a new
+analyzer instance with the parse cache off, keeping the best of --repeat runs. Reports files/s (index,
+components, structure), commits/s (commits) and the peak RSS of the process.
+
+Results can be saved as a JSON baseline and compared with a previous one;
+a rate drop or RSS growth beyond --threshold is flagged and makes the script
+exit with status 1.
+
+Usage (run from knowledge-graph-builder/):
+
+  python scripts/bench/bench_analyzers.py
+  python scripts/bench/bench_analyzers.py --size large --layouts hf --save bench.json
+  python scripts/bench/bench_analyzers.py --files 50000 --commits 200000 --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root (knowledge-graph-builder/) is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analyzer.analyzers.generic import COMMIT_KEYWORDS
+from analyzer.analyzers.huggingface import EVOLUTION_KEYWORDS
+from analyzer.parse_cache import default_cache_dir
+
+SIZES = {
+    "small": (1_000, 10_000),
+    "medium": (20_000, 100_000),
+    "large": (200_000, 1_000_000),
+}
+LAYOUTS = ("hf", "generic", "js")
+SCANS = ("index", "scan_components", "scan_commits", "scan_structure")
+
+# Version of the generated repositories; bump when generation changes
+GENERATOR_VERSION = 2
+
+# Share of history commits that modify a random file rather than CHANGELOG.md
+DEEP_CHANGE_RATIO = 0.1
+
+WORDS = (
+    "update model layer config tokenizer docs test bump cleanup typo export "
+    "processor trainer callback pipeline generation vision audio speed memory"
+).split()
+KEYWORDS = list(dict.fromkeys([*EVOLUTION_KEYWORDS, *COMMIT_KEYWORDS]))
+
+
+# Generation
+
+
+def python_source(name: str, classes: int = 3, functions: int = 3) -> str:
+    lines = ['"""Synthetic module."""', "", "import torch", "from torch import nn", ""]
+    for i in range(classes):
+        base = "nn.Module" if i == 0 else f"{name}Block{i - 1}"
+        lines += [
+            "",
+            f"class {name}Block{i}({base}):",
+            f'    """Block {i} of {name}."""',
+            "",
+            "    def __init__(self, config):",
+            "        super().__init__()",
+            "        self.proj = nn.Linear(config.hidden_size, config.hidden_size)",
+            "",
+            "    def forward(self, hidden_states):",
+            "        return self.proj(hidden_states)",
+        ]
+    for i in range(functions):
+        lines += ["", "", f"def {name.lower()}_helper_{i}(x):", "    return x * 2"]
+    return "\n".join(lines) + "\n"
+
+
+def markdown_doc(name: str) -> str:
+    return (
+        f"# {name}\n\n## Overview\n\nThe {name} model was proposed in a synthetic paper. "
+        "It uses attention and rotary embeddings.\n\n## Usage\n\n```python\nimport torch\n```\n"
+    )
+
+
+def js_source(name: str) -> str:
+    return (
+        f"export class {name} {{\n  constructor(props) {{\n    this.props = props;\n  }}\n\n"
+        f"  render() {{\n    return `<div>${{this.props.title}}</div>`;\n  }}\n}}\n\n"
+        f"export function use{name}(state) {{\n  return state.{name.lower()};\n}}\n"
+    )
+
+
+def layout_files(layout: str, count: int, rng: random.Random) -> dict[str, str]:
+    """Return path -> content for about ``count`` files of a layout."""
+    files: dict[str, str] = {}
+    if layout == "hf":
+        files["src/transformers/modeling_utils.py"] = python_source("PreTrained", 4, 10)
+        files["src/transformers/__init__.py"] = ""
+        files["setup.py"] = 'install_requires = ["torch>=2.0", "numpy", "tokenizers"]\n'
+        files["requirements.txt"] = "torch>=2.0\nnumpy\ntokenizers\n"
+        for i in range(max(1, (count - len(files)) // 6)):
+            model = f"model{i}"
+            name = f"Model{i}"
+            base = f"src/transformers/models/{model}"
+            files[f"{base}/__init__.py"] = ""
+            files[f"{base}/configuration_{model}.py"] = python_source(f"{name}Config", 1, 0)
+            files[f"{base}/modeling_{model}.py"] = python_source(name, rng.randint(4, 12), 2)
+            files[f"{base}/tokenization_{model}.py"] = python_source(f"{name}Tokenizer", 1, 2)
+            files[f"docs/source/en/model_doc/{model}.md"] = markdown_doc(name)
+            files[f"tests/models/{model}/test_modeling_{model}.py"] = python_source(f"{name}Test", 1, 4)
+    elif layout == "generic":
+        files["README.md"] = markdown_doc("Package")
+        files["pyproject.toml"] = '[project]\ndependencies = ["numpy", "pandas"]\n'
+        for i in range(max(1, count - len(files))):
+            package = f"pkg/sub{i % 50}"
+            if i % 10 == 9:
+                files[f"docs/guide_{i}.md"] = markdown_doc(f"Guide{i}")
+            elif i % 10 == 8:
+                files[f"tests/sub{i % 50}/test_module_{i}.py"] = python_source(f"Test{i}", 1, 3)
+            else:
+                files[f"{package}/module_{i}.py"] = python_source(f"Module{i}", rng.randint(1, 5), 3)
+    elif layout == "js":
+        files["package.json"] = '{"dependencies": {"react": "^18.0.0", "lodash": "^4.0.0"}}\n'
+        files["README.md"] = markdown_doc("App")
+        for i in range(max(1, count - len(files))):
+            if i % 20 == 19:
+                files[f"scripts/tool_{i}.py"] = python_source(f"Tool{i}", 1, 2)
+            elif i % 5 < 2:
+                files[f"node_modules/dep{i % 300}/lib/file_{i}.js"] = js_source(f"Dep{i}")
+            else:
+                ext = ".tsx" if i % 3 else ".js"
+                files[f"src/components/group{i % 100}/Component{i}{ext}"] = js_source(f"Component{i}")
+    else:
+        raise ValueError(f"Unknown layout: {layout}")
+    return files
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n%s\n" % (len(payload), payload)
+
+
+def generate_repo(path: Path, layout: str, files: int, commits: int, seed: int) -> None:
+    """Create a repository at ``path`` with ``git fast-import``."""
+    rng = random.Random(seed)
+    contents = layout_files(layout, files, rng)
+    paths = list(contents)
+    authors = [f"Author {i} <author{i}@example.com>".encode() for i in range(500)]
+
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet", "--done"], cwd=path, stdin=subprocess.PIPE
+    )
+    write = proc.stdin.write
+
+    # Pool of blobs that later commits rewrite files with
+    pool_marks = []
+    for i in range(64):
+        write(b"blob\nmark :%d\n" % (i + 1))
+        write(_data(python_source(f"Pooled{i}", 2, 1).encode()))
+        pool_marks.append(i + 1)
+
+    add_commits = max(1, min(commits // 10, 1000))
+    chunk = -(-len(paths) // add_commits)
+    timestamp = 1_500_000_000
+    for n in range(commits):
+        timestamp += rng.randint(60, 3600)
+        words = [rng.choice(WORDS) for _ in range(rng.randint(3, 9))]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(KEYWORDS))
+        message = " ".join(words).encode()
+        author = rng.choice(authors)
+        write(b"commit refs/heads/main\n")
+        write(b"author %s %d +0000\ncommitter %s %d +0000\n" % (author, timestamp, author, timestamp))
+        write(_data(message))
+        if n < add_commits:
+            for p in paths[n * chunk:(n + 1) * chunk]:
+                write(b"M 100644 inline %s\n" % p.encode())
+                write(_data(contents[p].encode()))
+        else:
+            # Rewriting a file deep in a wide tree costs fast-import a copy of
+            # every tree on its path, so most commits touch a root-level file
+            if rng.random() < DEEP_CHANGE_RATIO:
+                target = paths[rng.randrange(len(paths))]
+            else:
+                target = "CHANGELOG.md"
+            write(b"M 100644 :%d %s\n" % (rng.choice(pool_marks), target.encode()))
+        write(b"\n")
+    write(b"done\n")
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {path}")
+    subprocess.run(["git", "reset", "-q", "--hard"], cwd=path, check=True)
+
+
+def ensure_repo(work_dir: Path, layout: str, files: int, commits: int, seed: int) -> Path:
+    """Return a generated repository for the spec, generating it if needed."""
+    spec = {"version": GENERATOR_VERSION, "layout": layout, "files": files, "commits": commits, "seed": seed}
+    path = work_dir / f"{layout}-f{files}-c{commits}-s{seed}"
+    stamp = path / ".git" / "bench-spec.json"
+    if stamp.is_file() and json.loads(stamp.read_text()) == spec:
+        return path
+    if path.exists():
+        shutil.rmtree(path)
+    print(f"Generating {path.name} ...", flush=True)
+    start = time.perf_counter()
+    generate_repo(path, layout, files, commits, seed)
+    stamp.write_text(json.dumps(spec))
+    print(f"  generated in {time.perf_counter() - start:.1f}s", flush=True)
+    return path
+
+
+# Measurement (in a child process)
+
+
+def run_child(repo: str, repo_type: str, parse_workers: int, repeat: int) -> dict:
+    """Time each scan of one analyzer on one repository (best of ``repeat`` runs)."""
+    from analyzer import RepoAnalyzer  # noqa: F401  (registers the analyzers)
+    from analyzer.file_index import RepoFileIndex
+    from analyzer.registry import AnalyzerRegistry
+
+    analyzer_class = AnalyzerRegistry.get(repo_type)
+    config = {"use_parse_cache": False, "parse_workers": parse_workers}
+    timings = {}
+
+    def best(run) -> dict:
+        seconds, items = float("inf"), 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = len(run())
+            seconds = min(seconds, time.perf_counter() - start)
+        return {"seconds": seconds, "items": items}
+
+    timings["index"] = best(lambda: RepoFileIndex.build(repo))
+    index = RepoFileIndex.for_path(repo)
+    for scan in SCANS[1:]:
+        # A new analyzer per run, so nothing is reused between scans
+        timings[scan] = best(lambda: getattr(analyzer_class(repo, config=config), scan)())
+    return {"analyzer": analyzer_class.__name__, "files": len(index), "timings": timings}
+
+
+def measure(repo: Path, repo_type: str, parse_workers: int, repeat: int) -> dict:
+    """Run run_child() in a fresh process; add its peak RSS."""
+    proc = subprocess.Popen(
+        [sys.executable, __file__, "--child", str(repo), repo_type, str(parse_workers), str(repeat)],
+        stdout=subprocess.PIPE,
+    )
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark of {repo_type} on {repo} failed")
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    result["peak_rss_mb"] = usage.ru_maxrss * scale / 2**20
+    return result
+
+
+def commit_count(repo: Path) -> int:
+    out = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=repo, capture_output=True, check=True)
+    return int(out.stdout)
+
+
+# Reporting
+
+
+def to_rows(layout: str, spec: dict, measured: dict, commits: int) -> list[dict]:
+    rows = []
+    for scan, timing in measured["timings"].items():
+        unit, count = ("commits/s", commits) if scan == "scan_commits" else ("files/s", measured["files"])
+        rows.append({
+            "layout": layout,
+            "files": spec["files"],
+            "commits": spec["commits"],
+            "analyzer": measured["analyzer"],
+            "scan": scan,
+            "seconds": round(timing["seconds"], 4),
+            "items": timing["items"],
+            "rate": round(count / timing["seconds"], 1) if timing["seconds"] else None,
+            "unit": unit,
+            "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+        })
+    return rows
+
+
+def _key(row: dict) -> tuple:
+    return (row["layout"], row["files"], row["commits"], row["analyzer"], row["scan"])
+
+
+def print_table(rows: list[dict], previous: dict, threshold: float) -> int:
+    """Print results (with changes against previous rows); return the regression count."""
+    header = ["layout", "analyzer", "scan", "seconds", "rate", "peak RSS", "vs baseline"]
+    table = [header]
+    regressions = 0
+    for row in rows:
+        change = ""
+        old = previous.get(_key(row))
+        if old and old.get("rate") and row["rate"]:
+            rate_delta = row["rate"] / old["rate"] - 1
+            rss_delta = row["peak_rss_mb"] / old["peak_rss_mb"] - 1 if old.get("peak_rss_mb") else 0.0
+            change = f"rate {rate_delta:+.0%}, rss {rss_delta:+.0%}"
+            if rate_delta < -threshold or rss_delta > threshold:
+                change += "  REGRESSION"
+                regressions += 1
+        table.append([
+            row["layout"],
+            row["analyzer"],
+            row["scan"],
+            f"{row['seconds']:.3f}",
+            f"{row['rate']:,.0f} {row['unit']}" if row["rate"] else "-",
+            f"{row['peak_rss_mb']:.0f} MiB",
+            change,
+        ])
+    widths = [max(len(r[i]) for r in table) for i in range(len(header))]
+    for r in table:
+        print("  ".join(cell.ljust(w) for cell, w in zip(r, widths)).rstrip())
+    return regressions
+
+
+def git_revision() -> str:
+    out = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    return out.stdout.strip() or "unknown"
+
+
+def main():
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        print(json.dumps(run_child(sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5]))))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark Phase 1 analyzers on synthetic repositories")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Preset repository size")
+    parser.add_argument("--files", type=int, help="Files per repository (overrides --size)")
+    parser.add_argument("--commits", type=int, help="Commits per repository (overrides --size)")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument(
+        "--all-analyzers", action="store_true",
+        help="Run every registered analyzer on every layout (default: the detected one)",
+    )
+    parser.add_argument("--parse-workers", type=int, default=1, help="Parse processes (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scan; the fastest counts (default: 3)")
+    parser.add_argument("--work-dir", type=Path, default=None, help="Where generated repos are kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Relative rate drop or RSS growth reported as a regression (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    from analyzer import RepoAnalyzer  # noqa: F401  (registers the analyzers)
+    from analyzer.registry import AnalyzerRegistry
+
+    files, commits = SIZES[args.size]
+    spec = {"files": args.files or files, "commits": args.commits or commits}
+    work_dir = args.work_dir or default_cache_dir() / "bench_repos"
+
+    previous = {}
+    if args.compare:
+        previous = {_key(r): r for r in json.loads(args.compare.read_text())["results"]}
+
+    rows = []
+    for layout in args.layouts:
+        repo = ensure_repo(work_dir, layout, spec["files"], spec["commits"], args.seed)
+        total_commits = commit_count(repo)
+        if args.all_analyzers:
+            repo_types = [a.get_repo_type().value for a in AnalyzerRegistry.get_all()]
+        else:
+            repo_types = [AnalyzerRegistry.auto_detect(repo).get_repo_type().value]
+        for repo_type in repo_types:
+            rows += to_rows(layout, spec, measure(repo, repo_type, args.parse_workers, args.repeat), total_commits)
+
+    regressions = print_table(rows, previous, args.threshold)
+
+    if args.save:
+        args.save.write_text(json.dumps({
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "parse_workers": args.parse_workers,
+                "repeat": args.repeat,
+                "seed": args.seed,
+            },
+            "results": rows,
+        }, indent=2))
+        print(f"Saved {len(rows)} results to {args.save}")
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
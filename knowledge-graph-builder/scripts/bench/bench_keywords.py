@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: commit keyword classification throughput.
+
+Compares the old per-keyword ``in`` loop with analyzer.keywords.KeywordMatcher
+on synthetic commit messages, for the stock HuggingFace keyword list and for a
+large (few hundred keywords) list. Also checks both return the same tags.
+
+Usage (run from knowledge-graph-builder/):
+
+  python scripts/bench/bench_keywords.py
+  python scripts/bench/bench_keywords.py --messages 100000 --extra-keywords 500
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root (knowledge-graph-builder/) is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analyzer.analyzers.huggingface import EVOLUTION_KEYWORDS
+from analyzer.keywords import KeywordMatcher
+
+WORDS = (
+    "fix add update remove refactor model attention layer config tokenizer "
+    "docs test bump version release cache rotary quantization training "
+    "pipeline generation speed memory support new bug typo cleanup export "
+    "onnx torch flax tf vision audio processor trainer callback"
+).split()
+
+
+def make_messages(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        subject = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30)))
+        messages.append(f"{subject.capitalize()} (#{rng.randint(1, 40000)})\n\n{body}\n")
+    return messages
+
+
+def make_keywords(extra: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    keywords = list(EVOLUTION_KEYWORDS)
+    while len(keywords) < len(EVOLUTION_KEYWORDS) + extra:
+        words = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+            for _ in range(rng.randint(1, 2))
+        ]
+        keywords.append(" ".join(words))
+    return keywords
+
+
+def naive_find_all(keywords: list[str], message: str) -> list[str]:
+    msg_lower = message.lower()
+    return [kw for kw in keywords if kw in msg_lower]
+
+
+def bench(label: str, keywords: list[str], messages: list[str]) -> None:
+    matcher = KeywordMatcher(keywords)
+
+    start = time.perf_counter()
+    naive = [naive_find_all(keywords, m) for m in messages]
+    naive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [matcher.find_all(m) for m in messages]
+    fast_s = time.perf_counter() - start
+
+    assert naive == fast, "KeywordMatcher disagrees with the in-loop"
+    matched = sum(1 for tags in fast if tags)
+    print(f"{label}: {len(keywords)} keywords, {len(messages):,} messages, {matched:,} matched")
+    print(f"  in-loop  {naive_s:7.2f}s  {len(messages) / naive_s:>10,.0f} msg/s")
+    print(f"  matcher  {fast_s:7.2f}s  {len(messages) / fast_s:>10,.0f} msg/s  ({naive_s / fast_s:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark commit keyword matching")
+    parser.add_argument("--messages", type=int, default=500_000, help="Number of synthetic messages")
+    parser.add_argument("--extra-keywords", type=int, default=300, help="Keywords added for the large list")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages, args.seed)
+    bench("stock", list(EVOLUTION_KEYWORDS), messages)
+    bench("large", make_keywords(args.extra_keywords, args.seed), messages)
+
+
+if __name__ == "__main__":
+    main()
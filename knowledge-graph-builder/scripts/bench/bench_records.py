@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: memory held by commit and component records.
+
+Builds synthetic CommitInfo / ComponentInfo records shaped like real analysis
+output (repeated authors, dates, paths and tags; mostly empty metadata) and
+measures, with tracemalloc, the memory retained per 100k records for:
+
+  legacy    plain dataclasses with a dict per instance (the old models)
+  slotted   a list of the analyzer.models records (slotted dataclasses)
+  table     CommitTable / ComponentTable (columnar, interned value pools)
+
+Also times repeated UniversalRepoAnalysis.key_commits access, which used to
+rebuild the list of dicts every time.
+
+Usage (run from knowledge-graph-builder/):
+
+  python scripts/bench/bench_records.py
+  python scripts/bench/bench_records.py --records 500000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Ensure project root (knowledge-graph-builder/) is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from analyzer.models import (
+    CommitInfo,
+    CommitTable,
+    ComponentInfo,
+    ComponentTable,
+    RepoType,
+    UniversalRepoAnalysis,
+)
+
+TAGS = ["fix", "feat", "add", "refactor", "attention", "cache", "speed", "memory"]
+
+
+@dataclass
+class LegacyCommitInfo:
+    sha: str
+    date: str
+    message: str
+    author: str
+    tags: list = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+class LegacyComponentInfo:
+    name: str
+    path: str
+    type: str
+    metadata: dict = field(default_factory=dict)
+
+
+def make_commit_rows(count: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    authors = [f"Author {i}" for i in range(max(count // 200, 1))]
+    dates = [f"20{20 + i // 365:02d}-{1 + i // 31 % 12:02d}-{1 + i % 28:02d}" for i in range(1500)]
+    rows = []
+    for _ in range(count):
+        tags = rng.sample(TAGS, rng.randint(1, 2))
+        message = " ".join(rng.choice(TAGS) for _ in range(rng.randint(4, 12)))
+        rows.append(_encode(
+            f"{rng.getrandbits(32):08x}", rng.choice(dates), message, rng.choice(authors), *tags
+        ))
+    return rows
+
+
+def make_component_rows(count: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    paths = [f"src/pkg/module_{i}.py" for i in range(max(count // 20, 1))]
+    rows = []
+    for i in range(count):
+        kind = rng.choice(("class", "function", "function"))
+        rows.append(_encode(f"Name{i}", rng.choice(paths), kind))
+    return rows
+
+
+def _encode(*fields: str) -> bytes:
+    return "\x1f".join(fields).encode()
+
+
+def decode(row: bytes) -> list[str]:
+    """Fresh str objects for every field, as parsing git/ast output yields."""
+    return row.decode().split("\x1f")
+
+
+def commit_fields(rows: list[bytes]):
+    for row in rows:
+        sha, date, message, author, *tags = decode(row)
+        yield sha, date, message, author, tags
+
+
+def measure(build) -> tuple[object, int]:
+    """Return (result, bytes still allocated by build() once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def report(label: str, count: int, sizes: dict[str, int]) -> None:
+    per_100k = 100_000 / count
+    legacy = sizes["legacy"]
+    print(f"{label}: {count:,} records")
+    for name, size in sizes.items():
+        saved = f"  ({1 - size / legacy:.0%} less)" if name != "legacy" else ""
+        print(f"  {name:8s} {size * per_100k / 2**20:8.1f} MiB per 100k{saved}")
+
+
+def bench_commits(count: int, seed: int) -> CommitTable:
+    rows = make_commit_rows(count, seed)
+    sizes = {}
+    _, sizes["legacy"] = measure(lambda: [
+        LegacyCommitInfo(*fields, {}) for fields in commit_fields(rows)
+    ])
+    _, sizes["slotted"] = measure(lambda: [CommitInfo(*fields) for fields in commit_fields(rows)])
+    table, sizes["table"] = measure(
+        lambda: CommitTable(CommitInfo(*fields) for fields in commit_fields(rows))
+    )
+    report("commits", count, sizes)
+    return table
+
+
+def bench_components(count: int, seed: int) -> ComponentTable:
+    rows = make_component_rows(count, seed)
+    sizes = {}
+    _, sizes["legacy"] = measure(lambda: [
+        LegacyComponentInfo(*decode(row), {}) for row in rows
+    ])
+    _, sizes["slotted"] = measure(lambda: [ComponentInfo(*decode(row)) for row in rows])
+    table, sizes["table"] = measure(
+        lambda: ComponentTable(ComponentInfo(*decode(row)) for row in rows)
+    )
+    report("components", count, sizes)
+    return table
+
+
+def bench_views(commits: CommitTable, repeat: int) -> None:
+    analysis = UniversalRepoAnalysis(repo_type=RepoType.GENERIC, repo_path=".", commits=commits)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        [c.to_dict() for c in analysis.commits]
+    rebuilt_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analysis.key_commits
+    first_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeat - 1):
+        analysis.key_commits
+    cached_s = time.perf_counter() - start
+
+    print(
+        f"key_commits x{repeat}: rebuilt every time {rebuilt_s:.2f}s, "
+        f"cached {first_s + cached_s:.2f}s ({first_s:.2f}s first access)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark record memory use")
+    parser.add_argument("--records", type=int, default=200_000, help="Records per kind")
+    parser.add_argument("--view-repeat", type=int, default=5, help="key_commits accesses to time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    commits = bench_commits(args.records, args.seed)
+    bench_components(args.records, args.seed)
+    bench_views(commits, args.view_repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Startup check: CLI import time and which heavy packages ``--help`` loads.
+
+Runs each entry point's ``--help`` in a fresh interpreter with
+``-X importtime``, reports the wall time and the cumulative import time of
+the slowest top-level modules, and fails if ``git``, ``openai`` or
+``networkx`` were imported (they belong to the phases, not to argument
+parsing) or if the import time exceeds ``--max-ms``.
+
+Usage (run from knowledge-graph-builder/):
+
+  python scripts/bench/bench_startup.py
+  python scripts/bench/bench_startup.py --max-ms 300 --top 5
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ("git", "openai", "networkx")
+
+COMMANDS = {
+    "pipeline.py --help": ["pipeline.py", "--help"],
+    "knowledge_graph_builder --help": ["-m", "knowledge_graph_builder", "--help"],
+    "knowledge_graph_builder analyze --help": ["-m", "knowledge_graph_builder", "analyze", "--help"],
+    "analyze_batch.py --help": ["analyze_batch.py", "--help"],
+}
+
+
+def parse_importtime(stderr: str) -> tuple[set[str], dict[str, int]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        (every module imported, cumulative µs of each top-level import)
+    """
+    modules: set[str] = set()
+    top_level: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, raw_name = line.split("|", 2)
+        if not cumulative.strip().isdigit():  # the header line
+            continue
+        name = raw_name.strip()
+        modules.add(name)
+        # Nested imports are indented by two spaces per level
+        if len(raw_name) - len(raw_name.lstrip()) == 1:
+            top_level[name] = top_level.get(name, 0) + int(cumulative)
+    return modules, top_level
+
+
+def measure(args: list[str]) -> tuple[float, set[str], dict[str, int]]:
+    """Run a command with -X importtime; return wall seconds and parsed imports."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}:\n{proc.stderr[-2000:]}")
+    return (wall, *parse_importtime(proc.stderr))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI startup imports")
+    parser.add_argument("--max-ms", type=float, default=500, help="Fail above this total import time")
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    failures = []
+    for label, command in COMMANDS.items():
+        wall, modules, imports = measure(command)
+        total_ms = sum(imports.values()) / 1000
+        print(f"{label}: {wall * 1000:.0f} ms wall, {total_ms:.0f} ms importing")
+        for name, us in sorted(imports.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"    {name:28s} {us / 1000:7.1f} ms")
+
+        heavy = [m for m in HEAVY_MODULES if m in modules]
+        if heavy:
+            failures.append(f"{label} imports {', '.join(heavy)}")
+        if total_ms > args.max_ms:
+            failures.append(f"{label} spends {total_ms:.0f} ms importing (limit {args.max_ms:.0f} ms)")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK: no heavy imports at startup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Tests for extractor.json_stream.JSONObjectStream."""
+
+import json
+
+import pytest
+
+from extractor.json_stream import JSONObjectStream
+
+DOCUMENT = {
+    "nodes": [
+        {"id": "a", "label": 'quoted "}]" text', "tags": ["x", ["y", "z"]]},
+        {"id": "b\\c", "label": "escaped \\\" quote and \\\\ backslash {"},
+        {"id": "c", "nested": {"items": [{"k": 1}, {"k": [2, 3]}], "empty": []}},
+    ],
+    "edges": [
+        {"source": "a", "target": "b\\c", "weight": 0.5},
+    ],
+    "summary": "not an array",
+}
+TEXT = json.dumps(DOCUMENT)
+
+
+def feed_in_chunks(text, size):
+    stream = JSONObjectStream()
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.extend(stream.feed(text[start:start + size]))
+    return stream, emitted
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16, len(TEXT)])
+def test_chunk_boundaries_anywhere(size):
+    stream, emitted = feed_in_chunks(TEXT, size)
+
+    expected = [("nodes", n) for n in DOCUMENT["nodes"]] + [("edges", e) for e in DOCUMENT["edges"]]
+    assert emitted == expected
+    assert stream.items == {"nodes": DOCUMENT["nodes"], "edges": DOCUMENT["edges"]}
+    assert stream.complete
+
+
+def test_split_inside_escape_sequence():
+    text = '{"nodes": [{"label": "a\\"b"}, {"label": "c\\\\"}]}'
+    cut = text.index("\\") + 1  # between the backslash and the escaped quote
+    stream = JSONObjectStream()
+
+    assert stream.feed(text[:cut]) == []
+    assert stream.feed(text[cut:]) == [("nodes", {"label": 'a"b'}), ("nodes", {"label": "c\\"})]
+
+
+def test_escaped_key():
+    stream = JSONObjectStream()
+
+    assert stream.feed('{"no\\u0064es": [{"id": 1}]}') == [("nodes", {"id": 1})]
+
+
+def test_each_object_emitted_when_it_closes():
+    stream = JSONObjectStream()
+
+    assert stream.feed('{"nodes": [{"id": 1}') == [("nodes", {"id": 1})]
+    assert stream.feed(', {"id": [2, {"deep": 3}]') == []
+    assert stream.feed("}]}") == [("nodes", {"id": [2, {"deep": 3}]})]
+
+
+def test_truncated_response_keeps_completed_objects():
+    cut = TEXT.index('{"id": "c"') + 12
+    stream, emitted = feed_in_chunks(TEXT[:cut], 4)
+
+    assert emitted == [("nodes", DOCUMENT["nodes"][0]), ("nodes", DOCUMENT["nodes"][1])]
+    assert stream.items == {"nodes": DOCUMENT["nodes"][:2]}
+    assert not stream.complete
+
+
+def test_text_around_the_document_is_ignored():
+    stream = JSONObjectStream()
+    text = '```json\n{"nodes": [{"id": 1}]}\n```\n{"nodes": [{"id": 2}]}'
+
+    assert stream.feed(text) == [("nodes", {"id": 1})]
+    assert stream.complete
+    assert stream.feed('{"nodes": [{"id": 3}]}') == []
+
+
+def test_scalars_in_top_level_arrays_are_not_emitted():
+    stream = JSONObjectStream()
+
+    assert stream.feed('{"names": ["a", "b"], "nodes": [1, {"id": 1}, null]}') == [("nodes", {"id": 1})]
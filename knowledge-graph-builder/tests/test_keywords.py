@@ -0,0 +1,80 @@
+"""Tests for analyzer.keywords.KeywordMatcher."""
+
+import random
+
+import pytest
+
+from analyzer.analyzers.generic import COMMIT_KEYWORDS
+from analyzer.analyzers.huggingface import EVOLUTION_KEYWORDS
+from analyzer.keywords import REGEX_MIN_KEYWORDS, KeywordMatcher
+
+# Overlapping keywords: prefixes, suffixes and infixes of each other
+OVERLAPPING = [
+    "fix", "fixes", "prefix", "feat", "feature", "features", "add", "address",
+    "dd", "a", "at", "attention", "tent", "ten", "cache", "cached", "ache",
+    "speed", "speedup", "up", "memory", "mem", "remove", "move", "moved",
+    "refactor", "factor", "act", "actor", "optim", "optimize", "optimization",
+    "tim", "time", "kv", "kv cache", "v c", "flash", "flash attention", "lash",
+    "quant", "quantize", "quantization", "zation", "on", "token", "tokenizer",
+    "k", "izer", "c++", "a.b", "(x)",
+]
+
+
+def expected(keywords, text):
+    """What a plain ``keyword in text`` loop finds."""
+    text = text.lower()
+    return [kw for kw in dict.fromkeys(k.lower() for k in keywords if k) if kw in text]
+
+
+def random_texts(keywords, count, seed=0):
+    rng = random.Random(seed)
+    alphabet = "abcdefiklmnoprstuvxz .()+-_:"
+    pieces = list(keywords) + ["".join(rng.choice(alphabet) for _ in range(6)) for _ in range(50)]
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(pieces) for _ in range(rng.randint(0, 8))]
+        joiners = [rng.choice(["", " ", "-", "X"]) for _ in words]
+        text = "".join(w + j for w, j in zip(words, joiners))
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+    return texts
+
+
+@pytest.mark.parametrize("keywords", [OVERLAPPING, COMMIT_KEYWORDS + OVERLAPPING, EVOLUTION_KEYWORDS + OVERLAPPING])
+def test_regex_mode_matches_plain_in_checks(keywords):
+    matcher = KeywordMatcher(keywords)
+    assert len(matcher.keywords) >= REGEX_MIN_KEYWORDS
+    assert matcher._regex is not None
+
+    for text in random_texts(keywords, 2000):
+        want = expected(keywords, text)
+        assert matcher.find_all(text) == want, text
+        assert matcher.first(text) == (want[0] if want else None), text
+
+
+def test_both_modes_agree():
+    short = KeywordMatcher(OVERLAPPING[:REGEX_MIN_KEYWORDS - 1])
+    long = KeywordMatcher(OVERLAPPING[:REGEX_MIN_KEYWORDS - 1] + [f"zz{i}" for i in range(5)])
+    assert short._regex is None
+    assert long._regex is not None
+
+    for text in random_texts(OVERLAPPING, 500, seed=1):
+        assert long.find_all(text) == short.find_all(text), text
+
+
+def test_overlapping_matches_at_every_position():
+    matcher = KeywordMatcher(OVERLAPPING)
+
+    assert matcher.find_all("Flash Attention KV cache speedup") == expected(
+        OVERLAPPING, "Flash Attention KV cache speedup"
+    )
+    assert "tent" in matcher.find_all("attention")
+    assert matcher.find_all("") == []
+
+
+def test_order_follows_keywords_and_drops_duplicates():
+    keywords = ["b", "a", "B", ""] + [f"kw{i}" for i in range(REGEX_MIN_KEYWORDS)]
+    matcher = KeywordMatcher(keywords)
+
+    assert matcher.keywords[:2] == ["b", "a"]
+    assert matcher.find_all("a b kw1") == ["b", "a", "kw1"]
+    assert matcher.first("a then b") == "b"
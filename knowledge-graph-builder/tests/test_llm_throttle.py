@@ -0,0 +1,60 @@
+"""Tests for extractor.llm_throttle.retry_after."""
+
+import email.utils
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from extractor.llm_throttle import retry_after
+
+
+def error_with_headers(headers):
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+def test_milliseconds():
+    assert retry_after(error_with_headers({"retry-after-ms": "1500"})) == pytest.approx(1.5)
+
+
+def test_milliseconds_take_precedence_over_seconds():
+    headers = {"retry-after-ms": "250", "retry-after": "10"}
+
+    assert retry_after(error_with_headers(headers)) == pytest.approx(0.25)
+
+
+def test_invalid_milliseconds_fall_back_to_seconds():
+    headers = {"retry-after-ms": "soon", "retry-after": "3"}
+
+    assert retry_after(error_with_headers(headers)) == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("value, expected", [("7", 7.0), ("0.5", 0.5), ("0", 0.0)])
+def test_seconds(value, expected):
+    assert retry_after(error_with_headers({"retry-after": value})) == pytest.approx(expected)
+
+
+def test_http_date():
+    when = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert retry_after(error_with_headers({"retry-after": when})) == pytest.approx(30, abs=2)
+
+
+def test_http_date_in_the_past_is_negative():
+    when = email.utils.formatdate(time.time() - 60, usegmt=True)
+
+    assert retry_after(error_with_headers({"retry-after": when})) < 0
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ValueError("no response"),
+        SimpleNamespace(response=None),
+        error_with_headers({}),
+        error_with_headers({"retry-after": ""}),
+        error_with_headers({"retry-after": "not a date"}),
+    ],
+)
+def test_missing_or_unparseable(error):
+    assert retry_after(error) is None